@@ -1,37 +1,170 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
+import argparse
 import datetime
-import time
-import threading
+import itertools
 import os
+import queue
 from pathlib import Path
-import pygame
-from sound_generator import generate_default_alarm_sound, cleanup_temp_sound
+from sound_generator import TONE_PATTERNS
+from scheduler import AlarmScheduler
+from alarm_store import AlarmStore
+from sound_cache import SoundCache
+from audio_worker import AudioWorker
+from metrics import AlarmMetrics
+from render_scheduler import RenderScheduler
+from recurrence import REPEAT_PRESETS
+from alarm_model import (Alarm, alarm_from_spec, alarm_to_dict, alarms_from_specs,
+                         fire_timestamp, next_alarm_time, next_occurrence, parse_alarm_time,
+                         parse_group)
+from timezones import LOCAL_ZONE, get_zone, to_wall, zone_abbreviation, zone_names
+from alarm_io import FORMATS, batched, read_alarm_specs, write_alarms
+from alarm_index import AlarmIndex
+from alarm_groups import AlarmGroups
+from clock import SystemClock
+
+# How long a firing alarm waits for the audio device before falling back
+# to the system bell.
+AUDIO_READY_TIMEOUT = 5.0
+
+# Alarms ramp up from near silence over the wake ramp, and stopping or
+# snoozing one fades its sound out instead of cutting it (both in seconds)
+DEFAULT_RAMP_SECONDS = "30"
+DEFAULT_FADE_SECONDS = "1"
+
+# Longest the alarm check sleeps before re-reading the wall clock, so that
+# system clock changes or suspend/resume are picked up promptly. While the
+# window is hidden nothing is drawn, and the check sleeps for longer.
+MAX_CHECK_INTERVAL_MS = 60 * 1000
+IDLE_MAX_CHECK_INTERVAL_MS = 5 * 60 * 1000
+
+# Imported rows are validated and stored this many at a time, and at most
+# MAX_IMPORT_ERRORS per-row errors are kept for the report
+IMPORT_BATCH_SIZE = 5000
+MAX_IMPORT_ERRORS = 1000
+
+# Time zone choice for alarms that follow the system zone
+LOCAL_ZONE_LABEL = "Local"
+
+# Whole-group operations offered in the alarm list's context menu
+GROUP_ACTIONS = ("Enable", "Disable", "Snooze", "Delete")
+
+# Modifier bits of a Tk event's state that extend a list selection
+SHIFT_MASK = 0x0001
+CONTROL_MASK = 0x0004
 
 class AlarmClock:
-    def __init__(self, root):
+    def __init__(self, root, store=None, sound_cache=None, clock=None):
         self.root = root
         self.root.title("🔔 Python Alarm Clock")
         self.root.geometry("600x500")
         self.root.resizable(False, False)
         
-        # Initialize pygame mixer for audio
-        pygame.mixer.init()
-        
         # Alarm variables
-        self.alarms = []
-        self.current_alarm = None
+        self.alarms = {}  # Alarm ID -> alarm, in insertion order
+        self.current_alarm = None  # Most recent ringing alarm, for Stop/Snooze
+        self.ringing_alarms = {}  # Alarm ID -> alarm, in trigger order
         self.alarm_sound = None
         self.snooze_time = 5  # Default snooze time in minutes
         self.is_alarm_playing = False
-        self.default_sound_path = None
+        
+        # Source of the current time and of time-based timers; a
+        # VirtualClock runs the engine in simulated time
+        self.clock = clock if clock is not None else SystemClock()
+        
+        # Alarm IDs and the deadline-ordered scheduler
+        self._alarm_ids = itertools.count(1)
+        self.scheduler = AlarmScheduler()
+        self._check_after_id = None
+        
+        # Virtualized alarms list: the index holds every row, the Treeview
+        # only the _list_rows rows visible from _list_offset
+        self.alarm_index = AlarmIndex()
+        self._list_offset = 0
+        self._list_rows = 5
+        self.selected_alarm_ids = set()
+        self._replace_selection = False
+        self._scroll_to_alarm = None
+        
+        # Group name -> member IDs, for whole-group operations
+        self.groups = AlarmGroups()
+        
+        # Persistent alarm storage
+        self.store = store if store is not None else AlarmStore()
+        
+        # Decoded custom sounds, preloaded in the background
+        self.sound_cache = sound_cache if sound_cache is not None else SoundCache()
+        
+        # Trigger latency and clock tick jitter
+        self.metrics = AlarmMetrics(clock=self.clock.time)
+        
+        # pygame is imported and the mixer opened by the audio worker once
+        # the first frame is drawn; it then owns every mixer call
+        self.audio = AudioWorker(self.sound_cache, self.metrics, notify=self._notify_audio_result)
+        self.audio_ready = self.audio.ready
+        self.root.bind("<<AudioResult>>", self._on_audio_result)
+        self._last_tick = None
+        
+        # Callables notified with alarm_to_dict(alarm) whenever an alarm fires
+        self.fire_listeners = []
+        
+        # Widgets are redrawn at most once per frame: mutations mark parts
+        # dirty and the render scheduler draws them from after_idle
+        self.render = RenderScheduler(root, on_redraw=self.metrics.record_redraw)
+        self.render.register('alarms', self._draw_alarms, keyed=True)
+        self.render.register('alarm_window', self._render_alarm_list)
+        self.render.register('controls', self._draw_alarm_controls)
+        self.render.register('status', lambda: self.status_var.set(self._status_text))
+        self.render.register('clock', self._draw_clock)
+        self._status_text = "Ready"
+        self._next_tick = None
+        
+        # While the window is iconified or withdrawn the clock is not
+        # drawn, so it stops ticking; only alarm checks wake the Tk thread
+        self.idle = False
+        self._tick_after_id = None
+        self.root.bind("<Map>", self._on_window_map)
+        self.root.bind("<Unmap>", self._on_window_map)
         
         # Create GUI
         self.create_widgets()
         
+        # Restore alarms saved by the previous session
+        self.load_alarms()
+        
         # Start clock update thread
         self.update_clock()
         
+        # Open the audio device after the window has painted
+        self.root.after_idle(self._start_audio)
+        
+    def _start_audio(self):
+        """Start the audio worker, which opens the audio device"""
+        self.audio.start()
+        
+    def close_audio(self):
+        """Stop playback and close the audio device if it was opened"""
+        self.audio.close()
+        
+    def _notify_audio_result(self):
+        """Called on the audio thread; wakes the Tk thread to read results"""
+        try:
+            self.root.event_generate("<<AudioResult>>", when="tail")
+        except (RuntimeError, tk.TclError):
+            # The window is being destroyed
+            pass
+            
+    def _on_audio_result(self, event=None):
+        """Handle finished audio commands on the Tk thread"""
+        while True:
+            try:
+                command, alarm_id, ok = self.audio.results.get_nowait()
+            except queue.Empty:
+                break
+            # Fall back to the system bell if a ringing alarm could not play
+            if command == 'play' and not ok and alarm_id in self.ringing_alarms:
+                self.root.bell()
+        
     def create_widgets(self):
         # Main frame
         main_frame = ttk.Frame(self.root, padding="20")
@@ -66,7 +199,7 @@ class AlarmClock:
         ttk.Label(alarm_frame, text="Sound File:").grid(row=0, column=2, sticky=tk.W, padx=(0, 10))
         self.sound_var = tk.StringVar(value="Default")
         sound_combo = ttk.Combobox(alarm_frame, textvariable=self.sound_var, 
-                                  values=["Default", "Custom File"], width=15)
+                                  values=list(TONE_PATTERNS) + ["Custom File"], width=15)
         sound_combo.grid(row=0, column=3, padx=(0, 10))
         sound_combo.bind("<<ComboboxSelected>>", self.on_sound_selection)
         
@@ -78,36 +211,109 @@ class AlarmClock:
         # Custom sound file path
         self.sound_path = ""
         
+        # Repeat selection
+        ttk.Label(alarm_frame, text="Repeat:").grid(row=1, column=0, sticky=tk.W, padx=(0, 10), pady=(10, 0))
+        self.repeat_var = tk.StringVar(value="Once")
+        repeat_combo = ttk.Combobox(alarm_frame, textvariable=self.repeat_var, 
+                                   values=list(REPEAT_PRESETS), width=10, state="readonly")
+        repeat_combo.grid(row=1, column=1, padx=(0, 20), pady=(10, 0))
+        
+        # Time zone selection
+        ttk.Label(alarm_frame, text="Time Zone:").grid(row=1, column=2, sticky=tk.W, padx=(0, 10), pady=(10, 0))
+        self.timezone_var = tk.StringVar(value=LOCAL_ZONE_LABEL)
+        self._timezone_combo(alarm_frame, self.timezone_var).grid(row=1, column=3, padx=(0, 10), pady=(10, 0))
+        
+        # Group selection; typing a new name starts a new group
+        ttk.Label(alarm_frame, text="Group:").grid(row=2, column=0, sticky=tk.W, padx=(0, 10), pady=(10, 0))
+        self.group_var = tk.StringVar()
+        self._group_combo(alarm_frame, self.group_var).grid(row=2, column=1, columnspan=2,
+                                                            sticky=tk.W, pady=(10, 0))
+        
         # Add alarm button
         add_btn = ttk.Button(alarm_frame, text="Add Alarm", 
                             command=self.add_alarm, style="Accent.TButton")
-        add_btn.grid(row=1, column=0, columnspan=5, pady=(10, 0))
+        add_btn.grid(row=1, column=4, pady=(10, 0))
         
         # Alarms list section
         alarms_frame = ttk.LabelFrame(main_frame, text="Active Alarms", padding="10")
         alarms_frame.grid(row=4, column=0, columnspan=3, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(0, 20))
         
-        # Treeview for alarms
-        columns = ("Time", "Sound", "Status")
-        self.alarms_tree = ttk.Treeview(alarms_frame, columns=columns, show="headings", height=5)
-        
-        for col in columns:
-            self.alarms_tree.heading(col, text=col)
-            self.alarms_tree.column(col, width=150)
-        
-        self.alarms_tree.grid(row=0, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S))
+        # Filter bar, answered from the alarm index
+        filter_frame = ttk.Frame(alarms_frame)
+        filter_frame.grid(row=0, column=0, columnspan=3, pady=(0, 10), sticky=(tk.W, tk.E))
+        
+        ttk.Label(filter_frame, text="From:").grid(row=0, column=0, padx=(0, 5))
+        self.filter_from_var = tk.StringVar()
+        from_entry = ttk.Entry(filter_frame, textvariable=self.filter_from_var, width=6)
+        from_entry.grid(row=0, column=1, padx=(0, 5))
+        from_entry.bind("<Return>", self.apply_alarm_filter)
+        
+        ttk.Label(filter_frame, text="To:").grid(row=0, column=2, padx=(0, 5))
+        self.filter_to_var = tk.StringVar()
+        to_entry = ttk.Entry(filter_frame, textvariable=self.filter_to_var, width=6)
+        to_entry.grid(row=0, column=3, padx=(0, 10))
+        to_entry.bind("<Return>", self.apply_alarm_filter)
+        
+        ttk.Label(filter_frame, text="Sound:").grid(row=0, column=4, padx=(0, 5))
+        self.filter_sound_var = tk.StringVar(value="All")
+        filter_sound_combo = ttk.Combobox(filter_frame, textvariable=self.filter_sound_var,
+                                          state="readonly", width=12)
+        filter_sound_combo.configure(
+            postcommand=lambda: filter_sound_combo.configure(values=["All"] + self.alarm_index.sounds()))
+        filter_sound_combo.grid(row=0, column=5, padx=(0, 10))
+        filter_sound_combo.bind("<<ComboboxSelected>>", self.apply_alarm_filter)
+        
+        ttk.Label(filter_frame, text="Status:").grid(row=0, column=6, padx=(0, 5))
+        self.filter_status_var = tk.StringVar(value="All")
+        filter_status_combo = ttk.Combobox(filter_frame, textvariable=self.filter_status_var,
+                                           values=["All", "Active", "Ringing", "Disabled"], state="readonly", width=8)
+        filter_status_combo.grid(row=0, column=7, padx=(0, 10))
+        filter_status_combo.bind("<<ComboboxSelected>>", self.apply_alarm_filter)
+        
+        ttk.Button(filter_frame, text="Filter", command=self.apply_alarm_filter).grid(row=0, column=8, padx=(0, 5))
+        ttk.Button(filter_frame, text="Clear", command=self.clear_alarm_filter).grid(row=0, column=9, padx=(0, 10))
+        
+        self.list_count_var = tk.StringVar(value="0 alarms")
+        ttk.Label(filter_frame, textvariable=self.list_count_var).grid(row=0, column=10)
+        
+        # Treeview for alarms. It only ever holds the visible rows; the
+        # scrollbar and mouse wheel page rows in from the alarm index.
+        # Shift/Control-click extend the selection, which is kept for rows
+        # scrolled out of view.
+        self.alarms_tree = ttk.Treeview(alarms_frame, columns=AlarmIndex.COLUMNS, show="headings",
+                                        height=self._list_rows, selectmode="extended")
+        
+        for col in AlarmIndex.COLUMNS:
+            self.alarms_tree.heading(col, text=col, command=lambda c=col: self.sort_alarms_by(c))
+            self.alarms_tree.column(col, width=100)
+        self.alarms_tree.heading("Time", text="Time ▲")
+        
+        self.alarms_tree.grid(row=1, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S))
         
         # Bind right-click for context menu
         self.alarms_tree.bind("<Button-3>", self.show_context_menu)
         
+        # Selection, scrolling and resizing of the virtualized list
+        self.alarms_tree.bind("<ButtonPress-1>", self._on_alarm_press)
+        self.alarms_tree.bind("<<TreeviewSelect>>", self._on_alarm_select)
+        self.alarms_tree.bind("<Control-a>", self._select_all_alarms)
+        self.alarms_tree.bind("<MouseWheel>", self._on_alarm_list_wheel)
+        self.alarms_tree.bind("<Button-4>", self._on_alarm_list_wheel)
+        self.alarms_tree.bind("<Button-5>", self._on_alarm_list_wheel)
+        self.alarms_tree.bind("<Configure>", self._on_alarm_list_resize)
+        self.alarms_tree.bind("<Up>", lambda e: self._move_alarm_selection(-1))
+        self.alarms_tree.bind("<Down>", lambda e: self._move_alarm_selection(1))
+        self.alarms_tree.bind("<Prior>", lambda e: self._move_alarm_selection(-self._list_rows))
+        self.alarms_tree.bind("<Next>", lambda e: self._move_alarm_selection(self._list_rows))
+        
         # Scrollbar for alarms list
-        scrollbar = ttk.Scrollbar(alarms_frame, orient=tk.VERTICAL, command=self.alarms_tree.yview)
-        scrollbar.grid(row=0, column=2, sticky=(tk.N, tk.S))
-        self.alarms_tree.configure(yscrollcommand=scrollbar.set)
+        self.alarms_scrollbar = ttk.Scrollbar(alarms_frame, orient=tk.VERTICAL,
+                                              command=self._scroll_alarm_list)
+        self.alarms_scrollbar.grid(row=1, column=2, sticky=(tk.N, tk.S))
         
         # Alarm management buttons
         alarm_buttons_frame = ttk.Frame(alarms_frame)
-        alarm_buttons_frame.grid(row=1, column=0, columnspan=2, pady=(10, 0), sticky=(tk.W, tk.E))
+        alarm_buttons_frame.grid(row=2, column=0, columnspan=2, pady=(10, 0), sticky=(tk.W, tk.E))
         
         remove_btn = ttk.Button(alarm_buttons_frame, text="🗑️ Remove Selected", 
                                command=self.remove_alarm, style="Danger.TButton")
@@ -123,10 +329,22 @@ class AlarmClock:
         
         clear_all_btn = ttk.Button(alarm_buttons_frame, text="🗑️ Clear All", 
                                   command=self.clear_all_alarms, style="Danger.TButton")
-        clear_all_btn.grid(row=0, column=3)
+        clear_all_btn.grid(row=0, column=3, padx=(0, 10))
+        
+        metrics_btn = ttk.Button(alarm_buttons_frame, text="📊 Metrics", 
+                                command=self.show_metrics)
+        metrics_btn.grid(row=0, column=4, padx=(0, 10))
+        
+        import_btn = ttk.Button(alarm_buttons_frame, text="📥 Import", 
+                               command=self.import_alarms_dialog)
+        import_btn.grid(row=0, column=5, padx=(0, 10))
+        
+        export_btn = ttk.Button(alarm_buttons_frame, text="📤 Export", 
+                               command=self.export_alarms_dialog)
+        export_btn.grid(row=0, column=6)
         
         # Snooze settings
-        snooze_frame = ttk.LabelFrame(main_frame, text="Snooze Settings", padding="10")
+        snooze_frame = ttk.LabelFrame(main_frame, text="Snooze and Volume Settings", padding="10")
         snooze_frame.grid(row=5, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(0, 20))
         
         ttk.Label(snooze_frame, text="Snooze Duration (minutes):").grid(row=0, column=0, sticky=tk.W, padx=(0, 10))
@@ -135,6 +353,18 @@ class AlarmClock:
                                    values=["1", "3", "5", "10", "15"], width=10)
         snooze_combo.grid(row=0, column=1, padx=(0, 20))
         
+        ttk.Label(snooze_frame, text="Wake Ramp (seconds):").grid(row=1, column=0, sticky=tk.W, padx=(0, 10))
+        self.ramp_var = tk.StringVar(value=DEFAULT_RAMP_SECONDS)
+        ramp_combo = ttk.Combobox(snooze_frame, textvariable=self.ramp_var,
+                                  values=["0", "15", "30", "60", "120"], width=10)
+        ramp_combo.grid(row=1, column=1, padx=(0, 20), pady=(5, 0))
+        
+        ttk.Label(snooze_frame, text="Fade Out (seconds):").grid(row=1, column=2, sticky=tk.W, padx=(0, 10))
+        self.fade_var = tk.StringVar(value=DEFAULT_FADE_SECONDS)
+        fade_combo = ttk.Combobox(snooze_frame, textvariable=self.fade_var,
+                                  values=["0", "0.5", "1", "3", "5"], width=10)
+        fade_combo.grid(row=1, column=3, pady=(5, 0))
+        
         # Control buttons
         control_frame = ttk.LabelFrame(main_frame, text="Alarm Controls", padding="10")
         control_frame.grid(row=6, column=0, columnspan=3, pady=(0, 20), sticky=(tk.W, tk.E))
@@ -162,7 +392,12 @@ class AlarmClock:
         # Configure grid weights
         main_frame.columnconfigure(0, weight=1)
         alarms_frame.columnconfigure(0, weight=1)
-        alarms_frame.rowconfigure(0, weight=1)
+        alarms_frame.rowconfigure(1, weight=1)
+        
+    def set_status(self, text):
+        """Show text in the status bar on the next frame"""
+        self._status_text = text
+        self.render.mark('status')
         
     def on_sound_selection(self, event=None):
         if self.sound_var.get() == "Custom File":
@@ -183,82 +418,553 @@ class AlarmClock:
         )
         if file_path:
             self.sound_path = file_path
-            self.status_var.set(f"Sound file selected: {os.path.basename(file_path)}")
+            self.set_status(f"Sound file selected: {os.path.basename(file_path)}")
             
+    def _timezone_combo(self, parent, variable):
+        """Combobox choosing the system zone or any IANA zone"""
+        return ttk.Combobox(parent, textvariable=variable, width=15,
+                            values=[LOCAL_ZONE_LABEL] + zone_names())
+        
+    def _timezone_setting(self, variable):
+        """Read a time zone combobox as a zone name (LOCAL_ZONE for Local)"""
+        name = variable.get().strip()
+        return LOCAL_ZONE if name in ("", LOCAL_ZONE_LABEL) else name
+        
+    def _group_combo(self, parent, variable):
+        """Editable combobox offering the existing group names"""
+        combo = ttk.Combobox(parent, textvariable=variable, width=15)
+        combo.configure(postcommand=lambda: combo.configure(values=self.groups.names()))
+        return combo
+        
     def add_alarm(self):
-        time_str = self.time_entry.get().strip()
+        spec = {
+            'time': self.time_entry.get(),
+            'sound': self.sound_var.get(),
+            'sound_path': self.sound_path,
+            'repeat': self.repeat_var.get(),
+            'timezone': self._timezone_setting(self.timezone_var),
+            'group': self.group_var.get()
+        }
         
-        # Validate time format
+        # Validate and create the alarm object
         try:
-            hour, minute = map(int, time_str.split(':'))
-            if not (0 <= hour <= 23 and 0 <= minute <= 59):
-                raise ValueError
-        except ValueError:
-            messagebox.showerror("Invalid Time", "Please enter time in HH:MM format (e.g., 07:30)")
+            alarm = alarm_from_spec(next(self._alarm_ids), spec, self.clock.now())
+        except ValueError as e:
+            messagebox.showerror("Invalid Alarm", str(e))
             return
             
-        # Create alarm time for today
-        now = datetime.datetime.now()
-        alarm_time = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
-        
-        # If alarm time has passed today, set it for tomorrow
-        if alarm_time <= now:
-            alarm_time += datetime.timedelta(days=1)
+        alarm_time = alarm.time
+        self.alarms[alarm.id] = alarm
+        self.groups.add(alarm)
+        self.store.save(alarm)
+        self.schedule_alarm(alarm)
+        self.preload_alarm_sound(alarm)
+        self.update_alarms_display([alarm.id])
+        self._show_alarm(alarm.id)
+        self.set_status(f"Alarm set for {alarm_time.strftime('%H:%M')} on {alarm_time.strftime('%Y-%m-%d')}")
+        
+    def add_alarms(self, specs):
+        """
+        Add alarms from spec dicts (see alarm_model.alarm_from_spec) as one
+        batch: a single store transaction, scheduler update and display
+        refresh. Returns (added alarms, [(spec index, error message)]).
+        """
+        added, errors = alarms_from_specs(enumerate(specs), self._alarm_ids, self.clock.now())
+        self._register_alarms(added)
+        self._schedule_alarm_check()
+        self.update_alarms_display([alarm.id for alarm in added])
+        return added, errors
+        
+    def _register_alarms(self, alarms):
+        """Store and schedule validated alarms without refreshing the display"""
+        for alarm in alarms:
+            self.alarms[alarm.id] = alarm
+            self.groups.add(alarm)
+            self.preload_alarm_sound(alarm)
+        self.store.save_many(alarms)
+        self.scheduler.schedule_many((alarm.id, fire_timestamp(alarm)) for alarm in alarms
+                                     if alarm.status == 'Active')
+        
+    def import_alarms(self, path):
+        """
+        Import alarms from a CSV, JSON Lines or iCalendar file.
+        
+        The file is streamed and validated IMPORT_BATCH_SIZE rows at a time,
+        each batch going to the store in one transaction. The display is
+        refreshed once at the end. Returns (number imported, number of rows
+        rejected, [(row, error message)] for the first rejected rows).
+        """
+        now = self.clock.now()
+        imported = []
+        rejected = 0
+        errors = []
+        try:
+            for records in batched(read_alarm_specs(path), IMPORT_BATCH_SIZE):
+                alarms, batch_errors = alarms_from_specs(records, self._alarm_ids, now)
+                self._register_alarms(alarms)
+                imported.extend(alarm.id for alarm in alarms)
+                rejected += len(batch_errors)
+                errors.extend(batch_errors[:MAX_IMPORT_ERRORS - len(errors)])
+        finally:
+            # Batches committed before a read error stay imported
+            self._schedule_alarm_check()
+            self.update_alarms_display(imported)
+        return len(imported), rejected, errors
+        
+    def export_alarms(self, path):
+        """Export every alarm to a CSV, JSON Lines or iCalendar file"""
+        write_alarms(path, self.alarms.values())
+        return len(self.alarms)
+        
+    def import_alarms_dialog(self):
+        path = filedialog.askopenfilename(
+            title="Import Alarms",
+            filetypes=[("Alarm Files", " ".join("*" + ext for ext in FORMATS)),
+                       ("All Files", "*.*")]
+        )
+        if not path:
+            return
             
-        # Create alarm object
-        alarm = {
-            'time': alarm_time,
-            'sound': self.sound_var.get(),
-            'sound_path': self.sound_path,
-            'status': 'Active'
-        }
-        
-        self.alarms.append(alarm)
+        try:
+            count, rejected, errors = self.import_alarms(path)
+        except (OSError, UnicodeDecodeError, ValueError) as e:
+            messagebox.showerror("Import Failed", f"Could not import {os.path.basename(path)}: {e}")
+            return
+            
+        self.set_status(f"Imported {count} alarms from {os.path.basename(path)}")
+        if rejected:
+            details = "\n".join(f"Row {row}: {error}" for row, error in errors[:10])
+            more = f"\n... and {rejected - 10} more" if rejected > 10 else ""
+            messagebox.showwarning("Import Errors",
+                                   f"Imported {count} alarms, {rejected} rows rejected:\n\n{details}{more}")
+            
+    def export_alarms_dialog(self):
+        path = filedialog.asksaveasfilename(
+            title="Export Alarms",
+            defaultextension=".csv",
+            filetypes=[("CSV Files", "*.csv"), ("JSON Lines Files", "*.jsonl"),
+                       ("iCalendar Files", "*.ics")]
+        )
+        if not path:
+            return
+            
+        try:
+            count = self.export_alarms(path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Export Failed", f"Could not export alarms: {e}")
+            return
+        self.set_status(f"Exported {count} alarms to {os.path.basename(path)}")
+        
+    def remove_alarms(self, alarm_ids):
+        """Remove alarms by ID as one batch. Returns the removed alarms."""
+        removed = []
+        for alarm_id in alarm_ids:
+            alarm = self.alarms.pop(alarm_id, None)
+            if alarm is None:
+                continue
+            if alarm_id in self.ringing_alarms:
+                self._release_ringing_alarm(alarm)
+            self.groups.discard(alarm)
+            removed.append(alarm)
+            
+        removed_ids = [alarm.id for alarm in removed]
+        self.scheduler.cancel_many(removed_ids)
+        self.store.delete_many(removed_ids)
+        self._schedule_alarm_check()
+        self.update_alarms_display(removed_ids)
+        return removed
+        
+    def snooze_alarms(self, alarm_ids, minutes):
+        """
+        Snooze alarms by ID as one batch, silencing any that are ringing.
+        Disabled alarms are skipped. Returns the snoozed alarms.
+        """
+        snooze_at = self.clock.time() + minutes * 60
+        snoozed = []
+        for alarm_id in alarm_ids:
+            alarm = self.alarms.get(alarm_id)
+            if alarm is None or alarm.status == 'Disabled':
+                continue
+            # Converted first, so a failure leaves a ringing alarm ringing
+            snooze_time = to_wall(snooze_at, alarm.timezone)
+            if alarm_id in self.ringing_alarms:
+                self._release_ringing_alarm(alarm)
+            alarm.time = snooze_time
+            alarm.status = 'Active'
+            snoozed.append(alarm)
+            
+        self.store.save_many(snoozed)
+        self.scheduler.schedule_many((alarm.id, fire_timestamp(alarm)) for alarm in snoozed)
+        self._schedule_alarm_check()
+        self.update_alarms_display([alarm.id for alarm in snoozed])
+        return snoozed
+        
+    def enable_alarms(self, alarm_ids):
+        """
+        Enable disabled alarms by ID as one batch. Alarms whose time passed
+        while disabled move on to their next occurrence. Returns the
+        enabled alarms.
+        """
+        timestamp = self.clock.time()
+        enabled = []
+        for alarm_id in alarm_ids:
+            alarm = self.alarms.get(alarm_id)
+            if alarm is None or alarm.status != 'Disabled':
+                continue
+            if fire_timestamp(alarm) <= timestamp:
+                now = to_wall(timestamp, alarm.timezone)
+                rule = alarm.recurrence
+                next_time = next_occurrence(rule, now, alarm.timezone, timestamp) if rule else None
+                alarm.time = next_time or next_alarm_time(alarm.time.hour, alarm.time.minute, now)
+            alarm.status = 'Active'
+            enabled.append(alarm)
+            
+        self.store.save_many(enabled)
+        self.scheduler.schedule_many((alarm.id, fire_timestamp(alarm)) for alarm in enabled)
+        self._schedule_alarm_check()
+        self.update_alarms_display([alarm.id for alarm in enabled])
+        return enabled
+        
+    def disable_alarms(self, alarm_ids):
+        """
+        Disable alarms by ID as one batch, silencing any that are ringing.
+        Disabled alarms stay listed but never ring. Returns the disabled
+        alarms.
+        """
+        disabled = []
+        for alarm_id in alarm_ids:
+            alarm = self.alarms.get(alarm_id)
+            if alarm is None or alarm.status == 'Disabled':
+                continue
+            if alarm_id in self.ringing_alarms:
+                self._release_ringing_alarm(alarm)
+            alarm.status = 'Disabled'
+            disabled.append(alarm)
+            
+        disabled_ids = [alarm.id for alarm in disabled]
+        self.store.save_many(disabled)
+        self.scheduler.cancel_many(disabled_ids)
+        self._schedule_alarm_check()
+        self.update_alarms_display(disabled_ids)
+        return disabled
+        
+    def set_alarm_group(self, alarm_ids, group):
+        """
+        Move alarms by ID into a group ("" for none) as one batch. Raises
+        ValueError for an invalid group name. Returns the moved alarms.
+        """
+        group = parse_group(group)
+        moved = []
+        for alarm_id in alarm_ids:
+            alarm = self.alarms.get(alarm_id)
+            if alarm is None or alarm.group == group:
+                continue
+            self.groups.move(alarm, group)
+            moved.append(alarm)
+            
+        self.store.save_many(moved)
+        self.update_alarms_display([alarm.id for alarm in moved])
+        return moved
+        
+    def list_alarms(self, offset=0, limit=100):
+        """Return (total, one page of alarms as dicts) in insertion order"""
+        page = itertools.islice(self.alarms.values(), offset, offset + limit)
+        return len(self.alarms), [alarm_to_dict(alarm) for alarm in page]
+        
+    def load_alarms(self):
+        """Load stored alarms and schedule the active ones"""
+        for alarm in self.store.load_all():
+            self.alarms[alarm.id] = alarm
+            self.groups.add(alarm)
+            self.preload_alarm_sound(alarm)
+        if self.alarms:
+            self._alarm_ids = itertools.count(max(self.alarms) + 1)
+            
+        self.scheduler.schedule_many(
+            (alarm.id, fire_timestamp(alarm)) for alarm in self.alarms.values()
+            if alarm.status == 'Active')
+        self._schedule_alarm_check()
         self.update_alarms_display()
-        self.status_var.set(f"Alarm set for {alarm_time.strftime('%H:%M')} on {alarm_time.strftime('%Y-%m-%d')}")
         
-    def update_alarms_display(self):
-        # Clear existing items
-        for item in self.alarms_tree.get_children():
-            self.alarms_tree.delete(item)
+    def preload_alarm_sound(self, alarm):
+        """Decode an alarm's custom sound file ahead of time"""
+        if alarm.sound == "Custom File" and alarm.sound_path:
+            self.audio.preload(alarm.sound_path)
             
-        # Add alarms to treeview
-        for i, alarm in enumerate(self.alarms):
-            time_str = alarm['time'].strftime('%H:%M')
-            sound_str = alarm['sound']
-            if alarm['sound'] == "Custom File" and alarm['sound_path']:
-                sound_str = os.path.basename(alarm['sound_path'])
-            status_str = alarm['status']
+    def update_alarms_display(self, alarm_ids=None):
+        """
+        Mark alarms as changed; the list is redrawn on the next frame.
+        Pass the IDs a mutation touched; by default every alarm is compared.
+        """
+        self.render.mark('alarms', alarm_ids)
+        
+    def _draw_alarms(self, alarm_ids=None):
+        """
+        Bring the alarm index in line with self.alarms for the given alarms
+        (every alarm if None), then mark the visible rows for redrawing.
+        """
+        index = self.alarm_index
+        if not self.alarms:
+            index.clear()
+        else:
+            if alarm_ids is None:
+                alarm_ids = list(index.ids() - self.alarms.keys()) + list(self.alarms)
+            rows = []
+            for alarm_id in alarm_ids:
+                alarm = self.alarms.get(alarm_id)
+                if alarm is None:
+                    rows.append((alarm_id, None, None))
+                else:
+                    rows.append((alarm_id, self._alarm_row_values(alarm), alarm.time))
+            if not index.update(rows):
+                return
+        self.selected_alarm_ids.intersection_update(self.alarms.keys())
+        self.render.mark('alarm_window')
+        
+    def _render_alarm_list(self):
+        """Show the window of rows starting at _list_offset"""
+        index = self.alarm_index
+        count = len(index)
+        if self._scroll_to_alarm is not None:
+            position = index.position(self._scroll_to_alarm)
+            self._scroll_to_alarm = None
+            if position is not None and not (self._list_offset <= position < self._list_offset + self._list_rows):
+                self._list_offset = max(0, position - self._list_rows // 2)
+        self._list_offset = max(0, min(self._list_offset, count - self._list_rows))
+        alarm_ids = index.window(self._list_offset, self._list_rows)
+        iids = [str(alarm_id) for alarm_id in alarm_ids]
+        
+        tree = self.alarms_tree
+        if list(tree.get_children()) == iids:
+            for alarm_id, iid in zip(alarm_ids, iids):
+                tree.item(iid, values=index.values(alarm_id))
+        else:
+            tree.delete(*tree.get_children())
+            for alarm_id, iid in zip(alarm_ids, iids):
+                tree.insert('', 'end', iid=iid, values=index.values(alarm_id))
+        tree.selection_set([iid for alarm_id, iid in zip(alarm_ids, iids)
+                            if alarm_id in self.selected_alarm_ids])
+        
+        if count:
+            self.alarms_scrollbar.set(self._list_offset / count,
+                                      (self._list_offset + len(alarm_ids)) / count)
+        else:
+            self.alarms_scrollbar.set(0, 1)
+        if count == index.total:
+            self.list_count_var.set(f"{count} alarms")
+        else:
+            self.list_count_var.set(f"{count} of {index.total} alarms")
             
-            self.alarms_tree.insert('', 'end', values=(time_str, sound_str, status_str), tags=(f'alarm_{i}',))
+    def _scroll_alarm_list(self, action, amount, unit=None):
+        """Scrollbar command: page rows in from the index"""
+        if action == 'moveto':
+            self._list_offset = int(float(amount) * len(self.alarm_index))
+        elif action == 'scroll':
+            step = self._list_rows if unit == 'pages' else 1
+            self._list_offset += int(amount) * step
+        self.render.mark('alarm_window')
+        
+    def _on_alarm_list_wheel(self, event):
+        if event.num == 4 or event.delta > 0:
+            self._scroll_alarm_list('scroll', -3)
+        else:
+            self._scroll_alarm_list('scroll', 3)
+        return "break"
+        
+    def _on_alarm_list_resize(self, event):
+        """Fit the number of rows shown to the list's height"""
+        row_height = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+        # Leave one row's height for the headings
+        rows = max(1, event.height // row_height - 1)
+        if rows != self._list_rows:
+            self._list_rows = rows
+            self.render.mark('alarm_window')
             
+    def _on_alarm_press(self, event):
+        # A plain click on a row starts a new selection; Shift and Control
+        # extend it, as do selection changes made by redraws
+        self._replace_selection = (self.alarms_tree.identify_region(event.x, event.y) == "cell"
+                                   and not event.state & (SHIFT_MASK | CONTROL_MASK))
+        
+    def _on_alarm_select(self, event=None):
+        selected = {int(iid) for iid in self.alarms_tree.selection()}
+        if self._replace_selection:
+            self._replace_selection = False
+            if selected:
+                self.selected_alarm_ids = selected
+            return
+        # Rows scrolled out of view keep their selection
+        visible = {int(iid) for iid in self.alarms_tree.get_children()}
+        self.selected_alarm_ids = (self.selected_alarm_ids - visible) | selected
+        
+    def _select_all_alarms(self, event=None):
+        """Select every alarm passing the filter"""
+        index = self.alarm_index
+        self.selected_alarm_ids = set(index.window(0, len(index)))
+        self.render.mark('alarm_window')
+        return "break"
+        
+    def _move_alarm_selection(self, step):
+        """Move the selection by step rows, scrolling at the window edges"""
+        index = self.alarm_index
+        if not len(index):
+            return "break"
+        alarm = self._selected_alarm()
+        position = index.position(alarm.id) if alarm else None
+        position = 0 if position is None else max(0, min(len(index) - 1, position + step))
+        self.selected_alarm_ids = set(index.window(position, 1))
+        if position < self._list_offset:
+            self._list_offset = position
+        elif position >= self._list_offset + self._list_rows:
+            self._list_offset = position - self._list_rows + 1
+        self.render.mark('alarm_window')
+        return "break"
+        
+    def _show_alarm(self, alarm_id):
+        """
+        Select an alarm and, on the next redraw (once the index has caught
+        up), scroll it into view if it passes the filter
+        """
+        self.selected_alarm_ids = {alarm_id}
+        self._scroll_to_alarm = alarm_id
+        self.render.mark('alarm_window')
+        
+    def sort_alarms_by(self, column):
+        """Sort the list by column; clicking the same heading again reverses it"""
+        self.alarm_index.set_sort(column)
+        arrow = " ▼" if self.alarm_index.descending else " ▲"
+        for col in AlarmIndex.COLUMNS:
+            self.alarms_tree.heading(col, text=col + arrow if col == column else col)
+        self._list_offset = 0
+        self.render.mark('alarm_window')
+        
+    def apply_alarm_filter(self, event=None):
+        """Filter the list by time of day, sound and status"""
+        start = self.filter_from_var.get().strip()
+        end = self.filter_to_var.get().strip()
+        time_range = None
+        if start or end:
+            try:
+                time_range = (parse_alarm_time(start or "00:00"), parse_alarm_time(end or "23:59"))
+            except ValueError as e:
+                messagebox.showerror("Invalid Filter", str(e))
+                return
+                
+        sound = self.filter_sound_var.get()
+        status = self.filter_status_var.get()
+        self.alarm_index.set_filter(time_range,
+                                    None if sound == "All" else sound,
+                                    None if status == "All" else status)
+        self._list_offset = 0
+        self.render.mark('alarm_window')
+        
+    def clear_alarm_filter(self):
+        self.filter_from_var.set("")
+        self.filter_to_var.set("")
+        self.filter_sound_var.set("All")
+        self.filter_status_var.set("All")
+        self.apply_alarm_filter()
+        
+    def _alarm_row_values(self, alarm):
+        """Return the (Time, Sound, Repeat, Status, Group) values shown for an alarm"""
+        time_str = alarm.time.strftime('%H:%M')
+        if alarm.timezone != LOCAL_ZONE:
+            time_str += " " + zone_abbreviation(alarm.time, alarm.timezone)
+        sound_str = alarm.sound
+        if alarm.sound == "Custom File" and alarm.sound_path:
+            sound_str = os.path.basename(alarm.sound_path)
+        rule = alarm.recurrence
+        repeat_str = rule.describe() if rule else "Once"
+        return (time_str, sound_str, repeat_str, alarm.status, alarm.group)
+        
+    def _selected_alarm(self):
+        """Return the selected alarm, even if scrolled out of view, or None"""
+        for alarm_id in self.selected_alarm_ids:
+            return self.alarms.get(alarm_id)
+        return None
+        
+    def _selected_alarms(self):
+        """Return every selected alarm, including those scrolled out of view"""
+        return [self.alarms[alarm_id] for alarm_id in sorted(self.selected_alarm_ids)
+                if alarm_id in self.alarms]
+        
+
     def remove_alarm(self):
-        selected = self.alarms_tree.selection()
-        if not selected:
+        """Remove the selected alarms, asking first if there are several"""
+        alarms = self._selected_alarms()
+        if not alarms:
             messagebox.showwarning("No Selection", "Please select an alarm to remove")
             return
+        if len(alarms) > 1 and not messagebox.askyesno(
+                "Remove Alarms", f"Are you sure you want to remove the {len(alarms)} selected alarms?"):
+            return
             
-        # Get the index of selected alarm
-        item = self.alarms_tree.item(selected[0])
-        index = int(item['tags'][0].split('_')[1])
-        
-        # Check if this is the currently ringing alarm
-        removed_alarm = self.alarms[index]
-        if self.current_alarm and removed_alarm == self.current_alarm:
-            # Stop the audio if this is the ringing alarm
-            self.stop_alarm_audio()
-            self.current_alarm = None
-            self.is_alarm_playing = False
-            
-            # Disable control buttons
-            self.stop_btn.config(state="disabled")
-            self.snooze_btn.config(state="disabled")
-            self.alarm_status_label.config(text="No alarm ringing", foreground="black")
-        
-        # Remove alarm
-        self.alarms.pop(index)
-        self.update_alarms_display()
-        self.status_var.set(f"Removed alarm set for {removed_alarm['time'].strftime('%H:%M')}")
+        # Remove the alarms, stopping the audio of any that are ringing
+        self.remove_alarms([alarm.id for alarm in alarms])
+        if len(alarms) == 1:
+            self.set_status(f"Removed alarm set for {alarms[0].time.strftime('%H:%M')}")
+        else:
+            self.set_status(f"Removed {len(alarms)} alarms")
+            
+    def set_selected_alarms_enabled(self, enabled):
+        """Enable or disable the selected alarms"""
+        alarm_ids = [alarm.id for alarm in self._selected_alarms()]
+        if not alarm_ids:
+            messagebox.showwarning("No Selection", "Please select an alarm first")
+            return
+        if enabled:
+            self.set_status(f"Enabled {len(self.enable_alarms(alarm_ids))} alarms")
+        else:
+            self.set_status(f"Disabled {len(self.disable_alarms(alarm_ids))} alarms")
+            
+    def set_selected_alarms_group(self):
+        """Ask for a group name and move the selected alarms into it"""
+        alarms = self._selected_alarms()
+        if not alarms:
+            messagebox.showwarning("No Selection", "Please select an alarm first")
+            return
+            
+        group_window = tk.Toplevel(self.root)
+        group_window.title("Set Group")
+        group_window.transient(self.root)
+        group_window.grab_set()
+        group_window.geometry("+%d+%d" % (self.root.winfo_rootx() + 50, self.root.winfo_rooty() + 50))
+        
+        ttk.Label(group_window, text=f"Group for {len(alarms)} alarms (blank for none):").pack(padx=20, pady=10)
+        groups = {alarm.group for alarm in alarms}
+        group_var = tk.StringVar(value=groups.pop() if len(groups) == 1 else "")
+        self._group_combo(group_window, group_var).pack(padx=20)
+        
+        def save_group():
+            try:
+                moved = self.set_alarm_group([alarm.id for alarm in alarms], group_var.get())
+            except ValueError as e:
+                messagebox.showerror("Invalid Group", str(e), parent=group_window)
+                return
+            self.set_status(f"Moved {len(moved)} alarms to group '{parse_group(group_var.get())}'")
+            group_window.destroy()
+            
+        ttk.Button(group_window, text="Save", command=save_group).pack(pady=10)
+        
+    def run_group_action(self, group, action):
+        """
+        Enable, disable, snooze or delete every alarm in a group (one of
+        GROUP_ACTIONS) as a single batch
+        """
+        alarm_ids = self.groups.members(group)
+        if action == "Enable":
+            changed = self.enable_alarms(alarm_ids)
+        elif action == "Disable":
+            changed = self.disable_alarms(alarm_ids)
+        elif action == "Snooze":
+            changed = self.snooze_alarms(alarm_ids, int(self.snooze_var.get()))
+        else:
+            if not messagebox.askyesno("Delete Group",
+                                       f"Are you sure you want to remove all {len(alarm_ids)} "
+                                       f"alarms in group '{group}'?"):
+                return
+            changed = self.remove_alarms(alarm_ids)
+        self.set_status(f"{action}d {len(changed)} alarms in group '{group}'")
         
     def clear_all_alarms(self):
         """Remove all alarms"""
@@ -270,19 +976,20 @@ class AlarmClock:
                                    f"Are you sure you want to remove all {len(self.alarms)} alarms?")
         if result:
             # Stop audio if any alarm is ringing
-            if self.is_alarm_playing:
+            if self.ringing_alarms:
                 self.stop_alarm_audio()
-                self.is_alarm_playing = False
+                self.ringing_alarms.clear()
                 self.current_alarm = None
-                
-                # Disable control buttons
-                self.stop_btn.config(state="disabled")
-                self.snooze_btn.config(state="disabled")
-                self.alarm_status_label.config(text="No alarm ringing", foreground="black")
+                self.is_alarm_playing = False
+                self.update_alarm_controls()
             
             self.alarms.clear()
+            self.groups.clear()
+            self.store.clear()
+            self.scheduler.clear()
+            self._schedule_alarm_check()
             self.update_alarms_display()
-            self.status_var.set("All alarms cleared")
+            self.set_status("All alarms cleared")
             
     def test_alarm(self):
         """Test the alarm functionality"""
@@ -291,17 +998,15 @@ class AlarmClock:
             return
             
         # Create a test alarm for 5 seconds from now
-        test_time = datetime.datetime.now() + datetime.timedelta(seconds=5)
-        test_alarm = {
-            'time': test_time,
-            'sound': self.sound_var.get(),
-            'sound_path': self.sound_path,
-            'status': 'Active'
-        }
+        test_time = self.clock.now() + datetime.timedelta(seconds=5)
+        test_alarm = Alarm(next(self._alarm_ids), test_time, self.sound_var.get(), self.sound_path)
         
-        self.alarms.append(test_alarm)
-        self.update_alarms_display()
-        self.status_var.set(f"Test alarm set for {test_time.strftime('%H:%M:%S')} (5 seconds from now)")
+        self.alarms[test_alarm.id] = test_alarm
+        self.store.save(test_alarm)
+        self.schedule_alarm(test_alarm)
+        self.preload_alarm_sound(test_alarm)
+        self.update_alarms_display([test_alarm.id])
+        self.set_status(f"Test alarm set for {test_time.strftime('%H:%M:%S')} (5 seconds from now)")
         
         # Show instructions
         messagebox.showinfo("Test Alarm", 
@@ -313,8 +1018,7 @@ class AlarmClock:
         
     def show_context_menu(self, event):
         """Show context menu for alarm management"""
-        selected = self.alarms_tree.selection()
-        if not selected:
+        if self._selected_alarm() is None:
             return
             
         # Create context menu
@@ -322,6 +1026,18 @@ class AlarmClock:
         context_menu.add_command(label="🗑️ Remove Alarm", command=self.remove_alarm)
         context_menu.add_command(label="📝 Edit Alarm", command=self.edit_alarm)
         context_menu.add_command(label="⏰ Snooze Alarm", command=self.snooze_selected_alarm)
+        context_menu.add_command(label="▶️ Enable", command=lambda: self.set_selected_alarms_enabled(True))
+        context_menu.add_command(label="⏸️ Disable", command=lambda: self.set_selected_alarms_enabled(False))
+        context_menu.add_separator()
+        context_menu.add_command(label="🏷️ Set Group...", command=self.set_selected_alarms_group)
+        
+        # Whole-group actions for the groups of the selected alarms
+        for group in sorted({alarm.group for alarm in self._selected_alarms() if alarm.group}):
+            group_menu = tk.Menu(context_menu, tearoff=0)
+            for action in GROUP_ACTIONS:
+                group_menu.add_command(label=f"{action} All ({self.groups.count(group)})",
+                                       command=lambda g=group, a=action: self.run_group_action(g, a))
+            context_menu.add_cascade(label=f"Group '{group}'", menu=group_menu)
         context_menu.add_separator()
         context_menu.add_command(label="🔔 Test This Alarm", command=self.test_selected_alarm)
         
@@ -330,20 +1046,15 @@ class AlarmClock:
         
     def edit_alarm(self):
         """Edit the selected alarm"""
-        selected = self.alarms_tree.selection()
-        if not selected:
+        alarm = self._selected_alarm()
+        if alarm is None:
             messagebox.showwarning("No Selection", "Please select an alarm to edit")
             return
-            
-        # Get the index of selected alarm
-        item = self.alarms_tree.item(selected[0])
-        index = int(item['tags'][0].split('_')[1])
-        alarm = self.alarms[index]
         
         # Create a simple edit dialog
         edit_window = tk.Toplevel(self.root)
         edit_window.title("Edit Alarm")
-        edit_window.geometry("300x200")
+        edit_window.geometry("300x320")
         edit_window.transient(self.root)
         edit_window.grab_set()
         
@@ -354,231 +1065,403 @@ class AlarmClock:
         ttk.Label(edit_window, text="New Time (HH:MM):").pack(pady=10)
         time_entry = ttk.Entry(edit_window, width=10)
         time_entry.pack()
-        time_entry.insert(0, alarm['time'].strftime('%H:%M'))
+        time_entry.insert(0, alarm.time.strftime('%H:%M'))
+        
+        # Time zone input
+        ttk.Label(edit_window, text="Time Zone:").pack(pady=(10, 0))
+        timezone_var = tk.StringVar(value=alarm.timezone or LOCAL_ZONE_LABEL)
+        self._timezone_combo(edit_window, timezone_var).pack()
+        
+        # Group input
+        ttk.Label(edit_window, text="Group:").pack(pady=(10, 0))
+        group_var = tk.StringVar(value=alarm.group)
+        self._group_combo(edit_window, group_var).pack()
         
         def save_changes():
             try:
-                time_str = time_entry.get().strip()
-                hour, minute = map(int, time_str.split(':'))
-                if not (0 <= hour <= 23 and 0 <= minute <= 59):
-                    raise ValueError
-                    
-                # Update alarm time
-                now = datetime.datetime.now()
-                new_time = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
-                if new_time <= now:
-                    new_time += datetime.timedelta(days=1)
+                hour, minute = parse_alarm_time(time_entry.get())
+                timezone = self._timezone_setting(timezone_var)
+                if timezone != LOCAL_ZONE:
+                    get_zone(timezone)
+                group = parse_group(group_var.get())
+                
+                # Update alarm time, on the wall clock of its zone
+                timestamp = self.clock.time()
+                now = to_wall(timestamp, timezone)
+                new_time = next_alarm_time(hour, minute, now)
+                
+                # Move a repeating alarm's rule to the new time of day
+                rule = alarm.recurrence
+                if rule:
+                    alarm.recurrence = rule.with_time(hour, minute)
+                    new_time = (next_occurrence(alarm.recurrence, now, timezone, timestamp)
+                                or new_time)
                     
-                alarm['time'] = new_time
-                self.update_alarms_display()
-                self.status_var.set(f"Alarm updated to {new_time.strftime('%H:%M')}")
+                alarm.time = new_time
+                alarm.timezone = timezone
+                self.groups.move(alarm, group)
+                self.store.save(alarm)
+                self.preload_alarm_sound(alarm)
+                if alarm.status == 'Active':
+                    self.schedule_alarm(alarm)
+                self.update_alarms_display([alarm.id])
+                self.set_status(f"Alarm updated to {new_time.strftime('%H:%M')}")
                 edit_window.destroy()
                 
-            except ValueError:
-                messagebox.showerror("Invalid Time", "Please enter time in HH:MM format")
+            except ValueError as e:
+                messagebox.showerror("Invalid Time", str(e))
         
         # Save button
         ttk.Button(edit_window, text="Save Changes", command=save_changes).pack(pady=20)
         
     def test_selected_alarm(self):
         """Test the selected alarm by setting it to go off in 5 seconds"""
-        selected = self.alarms_tree.selection()
-        if not selected:
+        alarm = self._selected_alarm()
+        if alarm is None:
             messagebox.showwarning("No Selection", "Please select an alarm to test")
             return
-            
-        # Get the index of selected alarm
-        item = self.alarms_tree.item(selected[0])
-        index = int(item['tags'][0].split('_')[1])
-        alarm = self.alarms[index]
         
         # Set alarm to go off in 5 seconds
-        alarm['time'] = datetime.datetime.now() + datetime.timedelta(seconds=5)
-        alarm['status'] = 'Active'
+        alarm.time = to_wall(self.clock.time() + 5, alarm.timezone)
+        alarm.status = 'Active'
+        self.store.save(alarm)
+        self.schedule_alarm(alarm)
         
-        self.update_alarms_display()
-        self.status_var.set(f"Test alarm set for {alarm['time'].strftime('%H:%M:%S')} (5 seconds from now)")
+        self.update_alarms_display([alarm.id])
+        self.set_status(f"Test alarm set for {alarm.time.strftime('%H:%M:%S')} (5 seconds from now)")
         
         messagebox.showinfo("Test Alarm", 
-                          f"Alarm '{alarm['time'].strftime('%H:%M')}' will go off in 5 seconds.\n\n"
+                          f"Alarm '{alarm.time.strftime('%H:%M')}' will go off in 5 seconds.\n\n"
                           "You can test the Stop and Snooze functionality.")
         
     def snooze_selected_alarm(self):
-        """Snooze the selected alarm by setting it to go off after the snooze duration"""
-        selected = self.alarms_tree.selection()
-        if not selected:
+        """Snooze the selected alarms by setting them to go off after the snooze duration"""
+        alarms = self._selected_alarms()
+        if not alarms:
             messagebox.showwarning("No Selection", "Please select an alarm to snooze")
             return
-            
-        # Get the index of selected alarm
-        item = self.alarms_tree.item(selected[0])
-        index = int(item['tags'][0].split('_')[1])
-        alarm = self.alarms[index]
+        snooze_minutes = int(self.snooze_var.get())
         
-        # Check if this is the currently ringing alarm
-        if self.current_alarm and alarm == self.current_alarm and self.is_alarm_playing:
-            # If it's currently ringing, use the existing snooze method
-            self.snooze_alarm()
+        # Several alarms are snoozed together, without a dialog
+        if len(alarms) > 1:
+            snoozed = self.snooze_alarms([alarm.id for alarm in alarms], snooze_minutes)
+            self.set_status(f"Snoozed {len(snoozed)} alarms for {snooze_minutes} minutes")
             return
+        alarm = alarms[0]
         
-        # Calculate snooze time
-        snooze_minutes = int(self.snooze_var.get())
-        snooze_time = datetime.datetime.now() + datetime.timedelta(minutes=snooze_minutes)
+        # Check if this alarm is currently ringing
+        if alarm.id in self.ringing_alarms:
+            # If it's currently ringing, use the existing snooze method
+            self.snooze_alarm(alarm)
+            return
+        if alarm.status == 'Disabled':
+            messagebox.showwarning("Alarm Disabled", "Enable the alarm before snoozing it")
+            return
         
-        # Update alarm time
-        alarm['time'] = snooze_time
-        alarm['status'] = 'Active'
+        # Move the alarm to the end of the snooze duration
+        self.snooze_alarms([alarm.id], snooze_minutes)
+        snooze_time = alarm.time
         
-        # Update display
-        self.update_alarms_display()
-        self.status_var.set(f"Alarm snoozed for {snooze_minutes} minutes (will ring at {snooze_time.strftime('%H:%M:%S')})")
+        self.set_status(f"Alarm snoozed for {snooze_minutes} minutes (will ring at {snooze_time.strftime('%H:%M:%S')})")
         
         messagebox.showinfo("Alarm Snoozed", 
                           f"Alarm has been snoozed for {snooze_minutes} minutes.\n\n"
                           f"It will ring again at {snooze_time.strftime('%H:%M:%S')}")
         
-    def update_clock(self):
-        """Update the clock display every second"""
-        now = datetime.datetime.now()
-        time_str = now.strftime("%H:%M:%S")
-        date_str = now.strftime("%A, %B %d, %Y")
+    def show_metrics(self):
+        """Show trigger latency, tick jitter and redraw percentiles"""
+        metrics_window = tk.Toplevel(self.root)
+        metrics_window.title("Alarm Metrics")
+        metrics_window.transient(self.root)
+        metrics_window.geometry("+%d+%d" % (self.root.winfo_rootx() + 50, self.root.winfo_rooty() + 50))
         
-        self.time_label.config(text=time_str)
-        self.date_label.config(text=date_str)
+        columns = ("Metric", "Count", "p50 (ms)", "p99 (ms)", "Max (ms)")
+        tree = ttk.Treeview(metrics_window, columns=columns, show="headings",
+                            height=len(AlarmMetrics.HISTOGRAMS))
+        for col in columns:
+            tree.heading(col, text=col)
+            tree.column(col, width=170 if col == "Metric" else 80)
+        tree.pack(padx=10, pady=10)
         
-        # Check for alarms
-        self.check_alarms()
+        def fmt(value):
+            return "-" if value is None else f"{value:.1f}"
+            
+        render_label = ttk.Label(metrics_window)
+        render_label.pack(padx=10, anchor=tk.W)
+        
+        def refresh():
+            tree.delete(*tree.get_children())
+            for stats in self.metrics.summary().values():
+                tree.insert('', 'end', values=(stats['label'], stats['count'], fmt(stats['p50']),
+                                               fmt(stats['p99']), fmt(stats['max'])))
+            render = self.render.stats()
+            render_label.config(text=f"Redraws: {render['redraws']} total, "
+                                     f"{render['redraws_per_sec']}/s now, "
+                                     f"{render['peak_redraws_per_sec']}/s peak   "
+                                     f"Wakeups: {self.metrics.wakeups_per_hour():.0f}/h")
+                
+        def export(extension, writer):
+            path = filedialog.asksaveasfilename(parent=metrics_window, defaultextension=extension,
+                                                filetypes=[(extension.upper()[1:] + " Files", "*" + extension)])
+            if path:
+                writer(path)
+                self.set_status(f"Metrics exported to {os.path.basename(path)}")
+                
+        buttons = ttk.Frame(metrics_window)
+        buttons.pack(pady=(0, 10))
+        ttk.Button(buttons, text="Refresh", command=refresh).grid(row=0, column=0, padx=5)
+        ttk.Button(buttons, text="Export CSV",
+                   command=lambda: export(".csv", self.metrics.export_csv)).grid(row=0, column=1, padx=5)
+        ttk.Button(buttons, text="Export JSON",
+                   command=lambda: export(".json", self.metrics.export_json)).grid(row=0, column=2, padx=5)
+        refresh()
         
-        # Schedule next update
-        self.root.after(1000, self.update_clock)
+    def update_clock(self):
+        """
+        Tick once per second to redraw the clock, unless idle. Alarms are
+        evaluated separately, by check_alarms at their deadlines.
+        """
+        self._tick_after_id = None
+        if self.idle:
+            return
+        self.metrics.record_wakeup()
+        
+        # Record how late this tick ran
+        tick = self.clock.monotonic()
+        if self._next_tick is not None:
+            self.metrics.record_tick((tick - self._next_tick) * 1000)
+            
+        self.render.mark('clock')
+        
+        # Schedule the next tick just after the next second boundary, so the
+        # displayed seconds never skip or stall
+        delay_ms = 1000 - self.clock.now().microsecond // 1000
+        self._next_tick = tick + delay_ms / 1000
+        self._tick_after_id = self.clock.after(self.root, delay_ms, self.update_clock)
+        
+    def set_idle(self, idle):
+        """
+        Stop the clock tick while idle, and let the alarm check sleep up to
+        IDLE_MAX_CHECK_INTERVAL_MS. Leaving idle redraws the clock at once
+        and resumes ticking on the second boundaries.
+        """
+        if idle == self.idle:
+            return
+        self.idle = idle
+        if self._tick_after_id is not None:
+            self.clock.after_cancel(self.root, self._tick_after_id)
+            self._tick_after_id = None
+        self._next_tick = None
+        self._schedule_alarm_check()
+        if not idle:
+            self.update_clock()
+            
+    def _on_window_map(self, event):
+        """Go idle when the main window is unmapped, wake when it is mapped"""
+        # Every widget's Map/Unmap reaches the root's bindings
+        if event.widget is self.root:
+            self.set_idle(event.type == tk.EventType.Unmap)
+        
+    def _draw_clock(self):
+        now = self.clock.now()
+        self.time_label.config(text=now.strftime("%H:%M:%S"))
+        self.date_label.config(text=now.strftime("%A, %B %d, %Y"))
+        
+    def schedule_alarm(self, alarm):
+        """(Re)schedule an alarm at its fire time and re-arm the wakeup"""
+        self.scheduler.schedule(alarm.id, fire_timestamp(alarm))
+        self._schedule_alarm_check()
+        
+    def unschedule_alarm(self, alarm):
+        """Remove an alarm from the scheduler and re-arm the wakeup"""
+        self.scheduler.cancel(alarm.id)
+        self._schedule_alarm_check()
+        
+    def _schedule_alarm_check(self):
+        """Arrange for check_alarms to run at the next alarm deadline"""
+        if self._check_after_id is not None:
+            self.clock.after_cancel(self.root, self._check_after_id)
+            self._check_after_id = None
+            
+        deadline = self.scheduler.next_deadline()
+        if deadline is None:
+            return
+            
+        delay = deadline - self.clock.time()
+        max_delay_ms = IDLE_MAX_CHECK_INTERVAL_MS if self.idle else MAX_CHECK_INTERVAL_MS
+        delay_ms = min(max(0, int(delay * 1000) + 1), max_delay_ms)
+        self._check_after_id = self.clock.after(self.root, delay_ms, self.check_alarms)
         
     def check_alarms(self):
-        """Check if any alarms should go off"""
-        now = datetime.datetime.now()
-        
-        for alarm in self.alarms:
-            if (alarm['status'] == 'Active' and 
-                alarm['time'].hour == now.hour and 
-                alarm['time'].minute == now.minute and 
-                now.second == 0):
-                
-                self.trigger_alarm(alarm)
+        """Fire every alarm whose deadline has passed"""
+        self._check_after_id = None
+        self.metrics.record_wakeup()
+        detected = self.clock.time()
+        
+        due = [self.alarms.get(alarm_id) for alarm_id in self.scheduler.pop_due(detected)]
+        due = [alarm for alarm in due if alarm and alarm.status == 'Active']
+        for alarm in due:
+            self.metrics.alarm_detected(alarm.id, fire_timestamp(alarm), detected)
+        for alarm in due:
+            self.trigger_alarm(alarm)
                 
+        self._schedule_alarm_check()
+        
     def trigger_alarm(self, alarm):
         """Trigger the alarm"""
+        self.metrics.alarm_triggered(alarm.id)
         self.current_alarm = alarm
-        alarm['status'] = 'Ringing'
+        self.ringing_alarms[alarm.id] = alarm
+        alarm.status = 'Ringing'
+        self.store.save(alarm)
         self.is_alarm_playing = True
         
         # Update display
-        self.update_alarms_display()
-        
-        # Show alarm dialog
-        self.show_alarm_dialog()
-        
-        # Play sound in separate thread
-        threading.Thread(target=self.play_alarm_sound, daemon=True).start()
+        self.update_alarms_display([alarm.id])
         
-    def play_alarm_sound(self):
-        """Play the alarm sound"""
-        try:
-            if self.current_alarm['sound'] == "Custom File" and self.current_alarm['sound_path']:
-                sound_file = self.current_alarm['sound_path']
-            else:
-                # Use a simple beep sound (you can replace this with a default sound file)
-                sound_file = self.create_default_sound()
-                
-            if sound_file and os.path.exists(sound_file):
-                pygame.mixer.music.load(sound_file)
-                pygame.mixer.music.play(-1)  # Loop indefinitely
-            else:
-                # Fallback to system beep if no sound file
-                self.root.bell()
+        # Notify fire event listeners (e.g. the control server)
+        if self.fire_listeners:
+            event = alarm_to_dict(alarm)
+            for listener in self.fire_listeners:
+                listener(event)
                 
-        except Exception as e:
-            print(f"Error playing sound: {e}")
-            # Fallback to system beep
+        # Queue the sound for the audio worker, before the modal dialog blocks
+        self.audio.play(alarm, self._setting_ms(self.ramp_var))
+        if not self.audio_ready.is_set():
+            self.root.after(int(AUDIO_READY_TIMEOUT * 1000), self._check_audio_started, alarm)
+        
+        # Show the alarm dialog once the window has been redrawn, so alarms
+        # firing together are all drawn as ringing in a single frame
+        self.root.after_idle(self.show_alarm_dialog, alarm)
+        
+    def _check_audio_started(self, alarm):
+        """Ring the system bell if the audio device is still not open"""
+        if not self.audio_ready.is_set() and alarm.id in self.ringing_alarms:
             self.root.bell()
             
-    def create_default_sound(self):
-        """Create a simple default sound file"""
-        if not self.default_sound_path:
-            self.default_sound_path = generate_default_alarm_sound()
-        return self.default_sound_path
-        
-    def show_alarm_dialog(self):
+    def show_alarm_dialog(self, alarm):
         """Show alarm dialog"""
-        # Enable control buttons
-        self.stop_btn.config(state="normal")
-        self.snooze_btn.config(state="normal")
-        
-        # Update status label
-        self.alarm_status_label.config(text="🔔 ALARM RINGING!", foreground="red")
+        # Enable control buttons and update status label
+        self.update_alarm_controls()
         
         # Show notification
-        messagebox.showinfo("Alarm!", f"Time to wake up!\nAlarm set for {self.current_alarm['time'].strftime('%H:%M')}")
+        messagebox.showinfo("Alarm!", f"Time to wake up!\nAlarm set for {alarm.time.strftime('%H:%M')}")
         
-    def stop_alarm_audio(self):
-        """Stop the alarm audio playback"""
-        try:
-            pygame.mixer.music.stop()
-            pygame.mixer.music.unload()
-        except Exception as e:
-            print(f"Error stopping audio: {e}")
-        
-    def stop_alarm(self):
-        """Stop the current alarm"""
-        # Stop the audio
-        self.stop_alarm_audio()
-        self.is_alarm_playing = False
-            
-        if self.current_alarm:
-            # Remove the alarm
-            if self.current_alarm in self.alarms:
-                self.alarms.remove(self.current_alarm)
-            self.current_alarm = None
-            
-        # Disable control buttons
-        self.stop_btn.config(state="disabled")
-        self.snooze_btn.config(state="disabled")
+    def update_alarm_controls(self):
+        """Redraw the Stop/Snooze controls on the next frame"""
+        self.render.mark('controls')
         
-        # Update status label
-        self.alarm_status_label.config(text="No alarm ringing", foreground="black")
+    def _draw_alarm_controls(self):
+        """Enable Stop/Snooze and show how many alarms ring, if any"""
+        count = len(self.ringing_alarms)
+        state = "normal" if count else "disabled"
+        self.stop_btn.config(state=state)
+        self.snooze_btn.config(state=state)
         
-        # Update display
-        self.update_alarms_display()
-        self.status_var.set("Alarm stopped")
-        
-    def snooze_alarm(self):
-        """Snooze the current alarm"""
-        if self.current_alarm and self.is_alarm_playing:
-            # Stop current alarm audio
-            self.stop_alarm_audio()
-            self.is_alarm_playing = False
-            
-            # Calculate snooze time
-            snooze_minutes = int(self.snooze_var.get())
-            snooze_time = datetime.datetime.now() + datetime.timedelta(minutes=snooze_minutes)
+        if count == 0:
+            self.alarm_status_label.config(text="No alarm ringing", foreground="black")
+        elif count == 1:
+            self.alarm_status_label.config(text="🔔 ALARM RINGING!", foreground="red")
+        else:
+            self.alarm_status_label.config(text=f"🔔 {count} ALARMS RINGING!", foreground="red")
             
-            # Update alarm time
-            self.current_alarm['time'] = snooze_time
-            self.current_alarm['status'] = 'Active'
+    def stop_alarm_audio(self, alarm=None, fade_ms=0):
+        """Stop playback for one alarm, or for every alarm if none is given"""
+        if alarm is None:
+            self.audio.stop_all()
+        elif fade_ms:
+            self.audio.fade(alarm.id, fade_ms)
+        else:
+            self.audio.stop(alarm.id)
             
-            # Disable control buttons
-            self.stop_btn.config(state="disabled")
-            self.snooze_btn.config(state="disabled")
+    def _setting_ms(self, var):
+        """Read a seconds setting as milliseconds; blank or invalid means 0"""
+        try:
+            return max(0, int(float(var.get()) * 1000))
+        except ValueError:
+            return 0
             
-            # Update status label
-            self.alarm_status_label.config(text="No alarm ringing", foreground="black")
+    def _release_ringing_alarm(self, alarm):
+        """Silence a ringing alarm and hand the controls to the next one"""
+        self.stop_alarm_audio(alarm, self._setting_ms(self.fade_var))
+        self.ringing_alarms.pop(alarm.id, None)
+        if self.current_alarm and self.current_alarm.id == alarm.id:
+            self.current_alarm = next(reversed(self.ringing_alarms.values()), None)
+        self.is_alarm_playing = bool(self.ringing_alarms)
+        self.update_alarm_controls()
+        
+    def stop_alarm(self, alarm=None):
+        """Stop a ringing alarm, the current one by default"""
+        alarm = alarm or self.current_alarm
+        if alarm is None or alarm.id not in self.ringing_alarms:
+            return
             
-            # Update display
-            self.update_alarms_display()
-            self.status_var.set(f"Alarm snoozed for {snooze_minutes} minutes")
+        # Stop the audio for this alarm only
+        self._release_ringing_alarm(alarm)
+        
+        # Repeating alarms move on to their next occurrence
+        rule = alarm.recurrence
+        timestamp = self.clock.time()
+        now = to_wall(timestamp, alarm.timezone)
+        next_time = (next_occurrence(rule, max(now, alarm.time), alarm.timezone, timestamp)
+                     if rule else None)
+        if next_time:
+            alarm.time = next_time
+            alarm.status = 'Active'
+            self.store.save(alarm)
+            self.schedule_alarm(alarm)
+            self.update_alarms_display([alarm.id])
+            self.set_status(f"Alarm stopped, next at {next_time.strftime('%a %H:%M')}")
+            return
             
-            self.current_alarm = None
+        # Remove the alarm
+        self.alarms.pop(alarm.id, None)
+        self.groups.discard(alarm)
+        self.store.delete(alarm.id)
+        self.unschedule_alarm(alarm)
+        
+        # Update display
+        self.update_alarms_display([alarm.id])
+        self.set_status("Alarm stopped")
+        
+    def snooze_alarm(self, alarm=None):
+        """Snooze a ringing alarm, the current one by default"""
+        alarm = alarm or self.current_alarm
+        if alarm and alarm.id in self.ringing_alarms:
+            # Stops this alarm's audio and reschedules it
+            snooze_minutes = int(self.snooze_var.get())
+            self.snooze_alarms([alarm.id], snooze_minutes)
+            self.set_status(f"Alarm snoozed for {snooze_minutes} minutes")
 
 def main():
+    parser = argparse.ArgumentParser(description="Python Alarm Clock")
+    parser.add_argument("--control-port", type=int,
+                        help="serve the local control API on 127.0.0.1:PORT")
+    parser.add_argument("--control-socket",
+                        help="serve the local control API on this Unix socket path")
+    parser.add_argument("--profile", nargs="?", const="timing",
+                        choices=("timing", "cprofile", "tracemalloc"),
+                        help="time every Tk callback and report the slowest on exit or F12; "
+                             "cprofile or tracemalloc also profile the first --profile-seconds")
+    parser.add_argument("--profile-seconds", type=float, default=60,
+                        help="how long cprofile or tracemalloc collect for (default 60)")
+    parser.add_argument("--profile-output",
+                        help="write the profile report to this file instead of stdout")
+    args = parser.parse_args()
+    
+    # Profiling hooks must be in place before any callback is registered;
+    # without --profile none of them are installed
+    profiler = None
+    if args.profile:
+        from profiler import TkProfiler
+        profiler = TkProfiler(args.profile, args.profile_seconds)
+        profiler.install()
+        profiler.watch(AlarmClock)
+        
     root = tk.Tk()
+    if profiler:
+        profiler.start(root)
+        root.bind_all("<F12>", lambda event: profiler.write_report(args.profile_output))
     
     # Configure style
     style = ttk.Style()
@@ -590,6 +1473,13 @@ def main():
     
     app = AlarmClock(root)
     
+    # Local control API for bulk alarm management
+    control_server = None
+    if args.control_port or args.control_socket:
+        from control_server import ControlServer
+        control_server = ControlServer(app, port=args.control_port, unix_path=args.control_socket)
+        control_server.start()
+        
     # Center the window
     root.update_idletasks()
     x = (root.winfo_screenwidth() // 2) - (root.winfo_width() // 2)
@@ -598,11 +1488,14 @@ def main():
     
     # Handle window close
     def on_closing():
-        if app.is_alarm_playing:
-            app.stop_alarm_audio()
-        if app.default_sound_path:
-            cleanup_temp_sound(app.default_sound_path)
-        pygame.mixer.quit()
+        if control_server:
+            control_server.stop()
+        app.close_audio()
+        app.store.close()
+        app.sound_cache.shutdown()
+        if profiler:
+            profiler.write_report(args.profile_output)
+            profiler.uninstall()
         root.destroy()
         
     root.protocol("WM_DELETE_WINDOW", on_closing)
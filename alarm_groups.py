@@ -0,0 +1,52 @@
+import sys
+from collections import defaultdict
+
+class AlarmGroups:
+    """
+    Group name -> IDs of the alarms in it.
+
+    Kept in step with the alarms' group fields by the app, so a group's
+    members are found without scanning every alarm, and bulk operations
+    on a group touch its members only. Alarms outside any group ("") are
+    not indexed, and a group exists for as long as it has members.
+    """
+
+    def __init__(self):
+        self._members = defaultdict(set)
+
+    def __contains__(self, name):
+        return name in self._members
+
+    def __len__(self):
+        return len(self._members)
+
+    def names(self):
+        """Names of the groups with members, sorted."""
+        return sorted(self._members)
+
+    def members(self, name):
+        """Return the IDs of the alarms in a group, as a new list."""
+        return list(self._members.get(name, ()))
+
+    def count(self, name):
+        return len(self._members.get(name, ()))
+
+    def add(self, alarm):
+        if alarm.group:
+            self._members[alarm.group].add(alarm.id)
+
+    def discard(self, alarm):
+        ids = self._members.get(alarm.group)
+        if ids is not None:
+            ids.discard(alarm.id)
+            if not ids:
+                del self._members[alarm.group]
+
+    def move(self, alarm, group):
+        """Change an alarm's group, keeping the index in step."""
+        self.discard(alarm)
+        alarm.group = sys.intern(group)
+        self.add(alarm)
+
+    def clear(self):
+        self._members.clear()
@@ -0,0 +1,193 @@
+import bisect
+from collections import defaultdict
+
+# Updates touching more than this share of the listed rows re-sort the list
+# once instead of moving rows one by one
+BULK_UPDATE_FRACTION = 8
+
+class AlarmIndex:
+    """
+    In-memory model behind the virtualized alarms list.
+
+    Keeps each alarm's displayed (Time, Sound, Repeat, Status, Group)
+    values and secondary indexes by minute of the day, sound and status,
+    so filters are answered from the matching index buckets rather than
+    by scanning every alarm. The alarms passing the current filter are
+    held as a list of (sort key, alarm ID) in ascending order; descending
+    order reads the same list from the end, and single-row updates are
+    bisected into place, so neither sorting nor mutations touch the other
+    rows.
+    """
+
+    COLUMNS = ("Time", "Sound", "Repeat", "Status", "Group")
+
+    def __init__(self):
+        self._rows = {}  # alarm ID -> (values, fire time)
+        self._by_minute = [set() for _ in range(24 * 60)]
+        self._by_sound = defaultdict(set)
+        self._by_status = defaultdict(set)
+        self._order = []
+        self.sort_column = "Time"
+        self.descending = False
+        self.time_range = None
+        self.sound = None
+        self.status = None
+
+    def __len__(self):
+        """Number of alarms passing the filter."""
+        return len(self._order)
+
+    def __contains__(self, alarm_id):
+        return alarm_id in self._rows
+
+    @property
+    def total(self):
+        return len(self._rows)
+
+    def ids(self):
+        """IDs of every indexed alarm, filtered or not."""
+        return self._rows.keys()
+
+    def values(self, alarm_id):
+        return self._rows[alarm_id][0]
+
+    def sounds(self):
+        """Sound labels currently in use, for the filter choices."""
+        return sorted(sound for sound, ids in self._by_sound.items() if ids)
+
+    def window(self, start, count):
+        """Return the IDs of up to count filtered alarms from position start."""
+        if not self.descending:
+            return [alarm_id for _, alarm_id in self._order[start:start + count]]
+        end = len(self._order) - start
+        return [alarm_id for _, alarm_id in reversed(self._order[max(0, end - count):max(0, end)])]
+
+    def position(self, alarm_id):
+        """Return the list position of a filtered alarm, or None."""
+        if alarm_id not in self._rows:
+            return None
+        entry = (self._key(alarm_id), alarm_id)
+        index = bisect.bisect_left(self._order, entry)
+        if index == len(self._order) or self._order[index] != entry:
+            return None
+        return len(self._order) - 1 - index if self.descending else index
+
+    def update(self, rows):
+        """
+        Apply (alarm ID, values, fire time) rows, where values of None
+        removes the alarm. Returns True if anything changed.
+        """
+        bulk = len(rows) * BULK_UPDATE_FRACTION > len(self._order)
+        changed = False
+        for alarm_id, values, fire_time in rows:
+            old = self._rows.get(alarm_id)
+            if old is None and values is None:
+                continue
+            if old is not None:
+                if values is not None and old == (values, fire_time):
+                    continue
+                if not bulk:
+                    self._unlist(alarm_id)
+                self._unindex(alarm_id, *old)
+                del self._rows[alarm_id]
+            if values is not None:
+                self._rows[alarm_id] = (values, fire_time)
+                self._index(alarm_id, values, fire_time)
+                if not bulk and self._matches(alarm_id):
+                    bisect.insort(self._order, (self._key(alarm_id), alarm_id))
+            changed = True
+        if bulk and changed:
+            self._rebuild()
+        return changed
+
+    def clear(self):
+        self._rows.clear()
+        for bucket in self._by_minute:
+            bucket.clear()
+        self._by_sound.clear()
+        self._by_status.clear()
+        self._order = []
+
+    def set_sort(self, column):
+        """
+        Sort by column; choosing the current column again flips the
+        direction without re-sorting.
+        """
+        if column == self.sort_column:
+            self.descending = not self.descending
+            return
+        self.sort_column = column
+        self.descending = False
+        self._order = sorted((self._key(alarm_id), alarm_id) for _, alarm_id in self._order)
+
+    def set_filter(self, time_range=None, sound=None, status=None):
+        """
+        Filter by time of day, sound label and status; None matches
+        anything. time_range is ((hour, minute), (hour, minute)), inclusive,
+        and wraps past midnight when the start is after the end.
+        """
+        self.time_range = time_range
+        self.sound = sound
+        self.status = status
+        self._rebuild()
+
+    def _key(self, alarm_id):
+        values, fire_time = self._rows[alarm_id]
+        if self.sort_column == "Time":
+            return fire_time
+        return values[self.COLUMNS.index(self.sort_column)].casefold()
+
+    def _minute_bounds(self):
+        (start_hour, start_minute), (end_hour, end_minute) = self.time_range
+        return start_hour * 60 + start_minute, end_hour * 60 + end_minute
+
+    def _minutes(self):
+        """Minutes of the day covered by the time range filter."""
+        start, end = self._minute_bounds()
+        if start <= end:
+            return range(start, end + 1)
+        return list(range(start, 24 * 60)) + list(range(0, end + 1))
+
+    def _matches(self, alarm_id):
+        values, fire_time = self._rows[alarm_id]
+        if self.sound is not None and values[1] != self.sound:
+            return False
+        if self.status is not None and values[3] != self.status:
+            return False
+        if self.time_range is not None:
+            start, end = self._minute_bounds()
+            minute = fire_time.hour * 60 + fire_time.minute
+            return start <= minute <= end if start <= end else (minute >= start or minute <= end)
+        return True
+
+    def _rebuild(self):
+        candidates = []
+        if self.sound is not None:
+            candidates.append(self._by_sound.get(self.sound, set()))
+        if self.status is not None:
+            candidates.append(self._by_status.get(self.status, set()))
+        if self.time_range is not None:
+            candidates.append(set().union(*(self._by_minute[m] for m in self._minutes())))
+        if candidates:
+            # Intersect starting from the smallest bucket
+            candidates.sort(key=len)
+            ids = candidates[0].intersection(*candidates[1:])
+        else:
+            ids = self._rows
+        self._order = sorted((self._key(alarm_id), alarm_id) for alarm_id in ids)
+
+    def _index(self, alarm_id, values, fire_time):
+        self._by_minute[fire_time.hour * 60 + fire_time.minute].add(alarm_id)
+        self._by_sound[values[1]].add(alarm_id)
+        self._by_status[values[3]].add(alarm_id)
+
+    def _unindex(self, alarm_id, values, fire_time):
+        self._by_minute[fire_time.hour * 60 + fire_time.minute].discard(alarm_id)
+        self._by_sound[values[1]].discard(alarm_id)
+        self._by_status[values[3]].discard(alarm_id)
+
+    def _unlist(self, alarm_id):
+        entry = (self._key(alarm_id), alarm_id)
+        index = bisect.bisect_left(self._order, entry)
+        if index < len(self._order) and self._order[index] == entry:
+            del self._order[index]
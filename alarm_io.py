@@ -0,0 +1,315 @@
+import csv
+import datetime
+import itertools
+import json
+import os
+import re
+
+from alarm_model import alarm_to_spec
+from timezones import LOCAL_ZONE
+
+CSV_FIELDS = ['time', 'date', 'sound', 'sound_path', 'repeat', 'timezone', 'group', 'status']
+
+ICAL_DAYS = ['MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU']
+ICAL_DURATION = re.compile(r'^([+-])?P(?:(\d+)W)?(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$')
+ICAL_LINE_LENGTH = 75
+
+# Readers yield (row number, spec) pairs one record at a time, so files of
+# any size are parsed in constant memory. Specs are the dicts accepted by
+# alarm_model.alarm_from_spec. A record that cannot be parsed at all yields a
+# ValueError in place of its spec, so it is reported as that row's error
+# instead of aborting the import.
+
+def read_csv(f):
+    """Read specs from CSV with a header row naming CSV_FIELDS columns."""
+    reader = csv.DictReader(f)
+    if reader.fieldnames is None:
+        return
+    if 'time' not in reader.fieldnames:
+        yield 1, ValueError("CSV header must include a 'time' column")
+        return
+    for record in reader:
+        repeat = (record.get('repeat') or "").strip()
+        if repeat.startswith('{'):
+            try:
+                repeat = json.loads(repeat)
+            except ValueError as e:
+                yield reader.line_num, ValueError(f"Invalid repeat rule: {e}")
+                continue
+        yield reader.line_num, {
+            'time': record.get('time'),
+            'date': record.get('date'),
+            'sound': record.get('sound'),
+            'sound_path': record.get('sound_path'),
+            'repeat': repeat,
+            'timezone': record.get('timezone'),
+            'group': record.get('group'),
+            'status': record.get('status'),
+        }
+
+def write_csv(f, alarms):
+    writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+    writer.writeheader()
+    for alarm in alarms:
+        spec = alarm_to_spec(alarm)
+        if isinstance(spec['repeat'], dict):
+            spec['repeat'] = json.dumps(spec['repeat'])
+        writer.writerow(spec)
+
+def read_jsonl(f):
+    """Read specs from JSON Lines, one spec object per line."""
+    for row, line in enumerate(f, 1):
+        if not line.strip():
+            continue
+        try:
+            yield row, json.loads(line)
+        except ValueError as e:
+            yield row, ValueError(f"Invalid JSON: {e}")
+
+def write_jsonl(f, alarms):
+    for alarm in alarms:
+        f.write(json.dumps(alarm_to_spec(alarm)) + "\n")
+
+def _unfolded_lines(f):
+    """Yield (line number, content line) with iCalendar line folding undone."""
+    current = None
+    start = 0
+    for number, line in enumerate(f, 1):
+        line = line.rstrip('\r\n')
+        if line[:1] in (' ', '\t') and current is not None:
+            current += line[1:]
+            continue
+        if current is not None:
+            yield start, current
+        current, start = line, number
+    if current is not None:
+        yield start, current
+
+def _parse_property(line):
+    head, _, value = line.partition(':')
+    if ';' not in head:
+        return head.upper(), {}, value
+    name, *params = head.split(';')
+    params = dict(param.partition('=')[::2] for param in params)
+    return name.upper(), {key.upper(): value for key, value in params.items()}, value
+
+def _parse_datetime(value, params):
+    """
+    Parse a DATE-TIME value as naive time in its TZID zone, or local time
+    without one. UTC values are converted to local time.
+    """
+    if params.get('VALUE') == 'DATE' or len(value) == 8:
+        raise ValueError("All-day events have no alarm time")
+    try:
+        # Sliced by hand because strptime dominates parsing large calendars
+        if len(value.rstrip('Z')) != 15 or value[8] != 'T':
+            raise ValueError
+        moment = datetime.datetime(int(value[:4]), int(value[4:6]), int(value[6:8]),
+                                   int(value[9:11]), int(value[11:13]), int(value[13:15]))
+    except ValueError:
+        raise ValueError(f"Invalid date-time: {value}") from None
+    if value.endswith('Z'):
+        moment = moment.replace(tzinfo=datetime.timezone.utc).astimezone().replace(tzinfo=None)
+    return moment
+
+def _parse_dates(values):
+    """Return the dates in a list of (possibly comma-separated) DATE values."""
+    dates = []
+    for value in values:
+        for item in value.split(','):
+            try:
+                dates.append(datetime.date(int(item[:4]), int(item[4:6]), int(item[6:8])))
+            except ValueError:
+                raise ValueError(f"Invalid date: {item}") from None
+    return dates
+
+def _trigger_time(params, value, start):
+    """Return when a VALARM TRIGGER fires for an event starting at start."""
+    if params.get('VALUE') == 'DATE-TIME':
+        return _parse_datetime(value, {})
+    if params.get('RELATED', 'START') != 'START':
+        raise ValueError("TRIGGER relative to the event end is not supported")
+    match = ICAL_DURATION.match(value)
+    if not match:
+        raise ValueError(f"Invalid TRIGGER: {value}")
+    sign, weeks, days, hours, minutes, seconds = match.groups()
+    offset = datetime.timedelta(weeks=int(weeks or 0), days=int(days or 0), hours=int(hours or 0),
+                                minutes=int(minutes or 0), seconds=int(seconds or 0))
+    return start - offset if sign == '-' else start + offset
+
+def _rrule_weekdays(value, start):
+    """Return the weekdays of a daily or weekly RRULE, or None for every day."""
+    parts = dict(part.partition('=')[::2] for part in value.upper().split(';'))
+    freq = parts.pop('FREQ', None)
+    parts.pop('WKST', None)
+    if parts.pop('INTERVAL', '1') != '1' or freq not in ('DAILY', 'WEEKLY') or set(parts) - {'BYDAY'}:
+        raise ValueError(f"Unsupported RRULE: {value}")
+    if 'BYDAY' in parts:
+        days = parts['BYDAY'].split(',')
+        if not set(days) <= set(ICAL_DAYS):
+            raise ValueError(f"Unsupported RRULE: {value}")
+        return [ICAL_DAYS.index(day) for day in days]
+    return [start.weekday()] if freq == 'WEEKLY' else None
+
+def _event_spec(event):
+    """Build a spec from the properties of one VEVENT."""
+    props = event['props']
+    if 'DTSTART' not in props:
+        raise ValueError("VEVENT has no DTSTART")
+    start = _parse_datetime(props['DTSTART'][1], props['DTSTART'][0])
+
+    # The alarm rings when the event's first VALARM triggers. Times with a
+    # TZID are wall-clock times in that zone; UTC ones are now local time.
+    alarm_time = _trigger_time(*event['triggers'][0], start) if event['triggers'] else start
+    timezone = props['DTSTART'][0].get('TZID')
+    if props['DTSTART'][1].endswith('Z') or (event['triggers'] and
+                                            event['triggers'][0][0].get('VALUE') == 'DATE-TIME'):
+        timezone = None
+    shift = datetime.timedelta(days=(alarm_time.date() - start.date()).days)
+    exceptions = [(day + shift).isoformat() for day in _parse_dates(event['EXDATE'])]
+
+    if 'X-ALARM-CLOCK-REPEAT' in props:
+        try:
+            repeat = json.loads(props['X-ALARM-CLOCK-REPEAT'][1])
+        except ValueError as e:
+            raise ValueError(f"Invalid repeat rule: {e}") from None
+    elif 'RRULE' in props:
+        weekdays = _rrule_weekdays(props['RRULE'][1], start)
+        if weekdays is not None:
+            weekdays = [(day + shift.days) % 7 for day in weekdays]
+        repeat = {'kind': 'daily', 'weekdays': weekdays, 'exceptions': exceptions}
+    elif event['RDATE']:
+        dates = [start.date()] + _parse_dates(event['RDATE'])
+        repeat = {'kind': 'dates', 'dates': [(day + shift).isoformat() for day in dates],
+                  'exceptions': exceptions}
+    else:
+        repeat = "Once"
+
+    return {
+        'time': alarm_time.strftime('%H:%M'),
+        'date': alarm_time.date().isoformat(),
+        'sound': props.get('X-ALARM-CLOCK-SOUND', (None, None))[1],
+        'sound_path': props.get('X-ALARM-CLOCK-SOUND-PATH', (None, None))[1],
+        'repeat': repeat,
+        'timezone': timezone,
+        'group': props.get('CATEGORIES', (None, None))[1],
+        'status': props.get('X-ALARM-CLOCK-STATUS', (None, None))[1],
+    }
+
+def read_ical(f):
+    """
+    Read specs from the VEVENTs of an iCalendar file, one per event. The
+    alarm time is the trigger of the event's first VALARM, or its start.
+    Daily and weekly RRULEs, RDATE and EXDATE are supported. A TZID must be
+    an IANA zone name; VTIMEZONE definitions are not read.
+    """
+    event = None
+    in_alarm = False
+    for row, line in _unfolded_lines(f):
+        if not line:
+            continue
+        name, params, value = _parse_property(line)
+        value_upper = value.upper()
+        if name == 'BEGIN' and value_upper == 'VEVENT':
+            event = {'row': row, 'props': {}, 'triggers': [], 'EXDATE': [], 'RDATE': []}
+        elif event is None:
+            continue
+        elif name == 'END' and value_upper == 'VEVENT':
+            try:
+                yield event['row'], _event_spec(event)
+            except ValueError as e:
+                yield event['row'], e
+            event = None
+        elif name in ('BEGIN', 'END') and value_upper == 'VALARM':
+            in_alarm = name == 'BEGIN'
+        elif in_alarm:
+            if name == 'TRIGGER':
+                event['triggers'].append((params, value))
+        elif name in ('EXDATE', 'RDATE'):
+            event[name].append(value)
+        else:
+            event['props'][name] = (params, value)
+
+def _fold(line):
+    """Fold a content line to the iCalendar line length limit."""
+    chunks = [line[:ICAL_LINE_LENGTH]]
+    for start in range(ICAL_LINE_LENGTH, len(line), ICAL_LINE_LENGTH - 1):
+        chunks.append(" " + line[start:start + ICAL_LINE_LENGTH - 1])
+    return "\r\n".join(chunks) + "\r\n"
+
+def _tzid(timezone):
+    return "" if timezone == LOCAL_ZONE else f";TZID={timezone}"
+
+def write_ical(f, alarms):
+    stamp = datetime.datetime.now(datetime.timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    f.write("BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//Python Alarm Clock//EN\r\n")
+    for alarm in alarms:
+        spec = alarm_to_spec(alarm)
+        rule = alarm.recurrence
+        lines = [
+            "BEGIN:VEVENT",
+            f"UID:alarm-{alarm.id}@alarm-clock",
+            f"DTSTAMP:{stamp}",
+            f"DTSTART{_tzid(alarm.timezone)}:{spec['date'].replace('-', '')}T{spec['time'].replace(':', '')}00",
+            "SUMMARY:Alarm",
+            f"X-ALARM-CLOCK-SOUND:{alarm.sound}",
+        ]
+        if alarm.sound_path:
+            lines.append(f"X-ALARM-CLOCK-SOUND-PATH:{alarm.sound_path}")
+        if alarm.group:
+            lines.append(f"CATEGORIES:{alarm.group}")
+        if spec['status'] != 'Active':
+            lines.append(f"X-ALARM-CLOCK-STATUS:{spec['status']}")
+        if rule is not None and rule.kind == 'daily':
+            if rule.weekdays is None:
+                lines.append("RRULE:FREQ=DAILY")
+            else:
+                lines.append("RRULE:FREQ=WEEKLY;BYDAY=" +
+                             ",".join(ICAL_DAYS[day] for day in sorted(rule.weekdays)))
+        elif rule is not None and rule.kind == 'dates':
+            next_date = alarm.time.date()
+            rdates = [day.strftime('%Y%m%d') for day in rule.dates if day > next_date]
+            if rdates:
+                lines.append("RDATE;VALUE=DATE:" + ",".join(rdates))
+        elif rule is not None:
+            # Windowed interval rules have no RRULE equivalent
+            lines.append("X-ALARM-CLOCK-REPEAT:" + json.dumps(rule.to_dict()))
+        if rule is not None and rule.exceptions:
+            lines.append("EXDATE;VALUE=DATE:" +
+                         ",".join(day.strftime('%Y%m%d') for day in sorted(rule.exceptions)))
+        lines += ["BEGIN:VALARM", "ACTION:AUDIO", "TRIGGER:PT0S", "END:VALARM", "END:VEVENT"]
+        f.write("".join(_fold(line) for line in lines))
+    f.write("END:VCALENDAR\r\n")
+
+FORMATS = {
+    '.csv': (read_csv, write_csv),
+    '.jsonl': (read_jsonl, write_jsonl),
+    '.ics': (read_ical, write_ical),
+}
+
+def _format(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in FORMATS:
+        raise ValueError(f"Unsupported file type {extension!r}, expected one of {', '.join(FORMATS)}")
+    return FORMATS[extension]
+
+def read_alarm_specs(path):
+    """Yield (row number, spec) from an alarm file, chosen by extension."""
+    reader, _ = _format(path)
+    with open(path, newline='', encoding='utf-8') as f:
+        yield from reader(f)
+
+def write_alarms(path, alarms):
+    """Write alarms to a file in the format chosen by its extension."""
+    _, writer = _format(path)
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer(f, alarms)
+
+def batched(records, size):
+    """Yield lists of up to size items from an iterable."""
+    iterator = iter(records)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
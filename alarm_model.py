@@ -0,0 +1,228 @@
+import datetime
+import sys
+
+from recurrence import REPEAT_PRESETS, RecurrenceRule, preset_rule
+from sound_generator import TONE_PATTERNS
+from timezones import LOCAL_ZONE, get_zone, to_timestamp, to_wall
+
+TIME_FORMAT_ERROR = "Please enter time in HH:MM format (e.g., 07:30)"
+
+# Longest alarm group name
+MAX_GROUP_LENGTH = 64
+
+class Alarm:
+    """
+    One alarm, identified by its unique ID.
+
+    Slotted rather than a dict, so a million alarms fit in a fraction of
+    the memory. Sound names, paths, statuses and zones are interned, so
+    alarms sharing a sound share one string. Alarms compare by identity:
+    two alarms with the same fields are still different alarms.
+
+    time is naive wall-clock time in the alarm's timezone, an IANA zone
+    name, or LOCAL_ZONE to follow the system zone. status is 'Active',
+    'Ringing' or 'Disabled'; group names the alarm group it belongs to,
+    "" for none.
+    """
+
+    __slots__ = ('id', 'time', 'sound', 'sound_path', 'status', 'recurrence', 'timezone',
+                 'group')
+
+    def __init__(self, alarm_id, time, sound="Default", sound_path="", status='Active',
+                 recurrence=None, timezone=LOCAL_ZONE, group=""):
+        self.id = alarm_id
+        self.time = time
+        self.sound = sys.intern(sound)
+        self.sound_path = sys.intern(sound_path or "")
+        self.status = sys.intern(status)
+        self.recurrence = recurrence
+        self.timezone = sys.intern(timezone or LOCAL_ZONE)
+        self.group = sys.intern(group or "")
+
+    def __repr__(self):
+        return (f"Alarm({self.id!r}, {self.time!r}, {self.sound!r}, {self.sound_path!r}, "
+                f"{self.status!r}, {self.recurrence!r}, {self.timezone!r}, {self.group!r})")
+
+def fire_timestamp(alarm):
+    """Return the UTC timestamp at which an alarm rings."""
+    return to_timestamp(alarm.time, alarm.timezone)
+
+def next_occurrence(rule, after, timezone, timestamp):
+    """
+    Return the first occurrence of rule after the wall time after, in
+    timezone, that is also later than the UTC timestamp, or None. When
+    clocks fall back an hour of wall time repeats, so an occurrence later
+    on the wall clock can still be an instant that has already passed.
+    """
+    next_time = rule.next_after(after)
+    while next_time is not None and to_timestamp(next_time, timezone) <= timestamp:
+        next_time = rule.next_after(next_time)
+    return next_time
+
+def parse_alarm_time(time_str):
+    """
+    Parse an HH:MM alarm time. Returns (hour, minute) or raises ValueError
+    with the message shown to the user.
+    """
+    try:
+        hour, minute = map(int, time_str.strip().split(':'))
+        if not (0 <= hour <= 23 and 0 <= minute <= 59):
+            raise ValueError
+    except (ValueError, AttributeError):
+        raise ValueError(TIME_FORMAT_ERROR) from None
+    return hour, minute
+
+def next_alarm_time(hour, minute, now):
+    """Return the next hour:minute after now, today or tomorrow."""
+    alarm_time = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if alarm_time <= now:
+        alarm_time += datetime.timedelta(days=1)
+    return alarm_time
+
+def parse_group(name):
+    """Return a group name with surrounding space removed. Raises ValueError."""
+    if name is None:
+        return ""
+    if not isinstance(name, str):
+        raise ValueError("Group must be a string")
+    name = name.strip()
+    if len(name) > MAX_GROUP_LENGTH:
+        raise ValueError(f"Group name longer than {MAX_GROUP_LENGTH} characters")
+    return name
+
+def _spec_str(spec, key):
+    """Return spec[key], which must be a string if present. Raises ValueError."""
+    value = spec.get(key)
+    if value is not None and not isinstance(value, str):
+        raise ValueError(f"'{key}' must be a string")
+    return value
+
+def alarm_from_spec(alarm_id, spec, now):
+    """
+    Build an Alarm from a spec dict, validated with the same rules as
+    the Add Alarm form. Used for batch adds and imports.
+
+    spec keys: 'time' (HH:MM), optional 'sound' (a tone pattern name or
+    "Custom File"), 'sound_path', 'repeat' (a repeat preset name such as
+    "Daily", or a RecurrenceRule.to_dict() dict), 'date' (YYYY-MM-DD,
+    the first day the alarm may ring), 'timezone' (an IANA zone name
+    the time and date are in; system time by default), 'group' (the
+    alarm group to join, none by default) and 'status' ('Active', the
+    default, or 'Disabled'). now is naive system time. Raises ValueError,
+    also for fields of the wrong type.
+    """
+    if not isinstance(spec, dict):
+        raise ValueError("Alarm spec must be an object")
+    hour, minute = parse_alarm_time(_spec_str(spec, 'time'))
+
+    timezone = _spec_str(spec, 'timezone') or LOCAL_ZONE
+    if timezone != LOCAL_ZONE:
+        get_zone(timezone)
+        now = to_wall(to_timestamp(now), timezone)
+
+    group = parse_group(spec.get('group'))
+    status = _spec_str(spec, 'status') or 'Active'
+    if status not in ('Active', 'Disabled'):
+        raise ValueError(f"Unknown status: {status} (expected Active or Disabled)")
+    sound = _spec_str(spec, 'sound') or "Default"
+    sound_path = _spec_str(spec, 'sound_path') or ""
+    if sound not in TONE_PATTERNS and sound != "Custom File":
+        raise ValueError(f"Unknown sound: {sound}")
+    if sound == "Custom File" and not sound_path:
+        raise ValueError("Custom File alarms need a sound_path")
+
+    repeat = spec.get('repeat') or "Once"
+    if not isinstance(repeat, (str, dict)):
+        raise ValueError("'repeat' must be a preset name or a rule object")
+    if isinstance(repeat, dict):
+        rule = RecurrenceRule.from_dict(dict(repeat, hour=hour, minute=minute))
+    elif repeat in REPEAT_PRESETS:
+        rule = preset_rule(repeat, hour, minute)
+    else:
+        raise ValueError(f"Unknown repeat: {repeat}")
+
+    date = _spec_str(spec, 'date')
+    if date:
+        try:
+            start = datetime.datetime.combine(datetime.date.fromisoformat(date),
+                                              datetime.time(hour, minute))
+        except ValueError:
+            raise ValueError(f"Invalid date: {date} (expected YYYY-MM-DD)") from None
+        if rule:
+            # next_after is exclusive, so start from just before that day
+            day_start = start.replace(hour=0, minute=0) - datetime.timedelta(seconds=1)
+            alarm_time = next_occurrence(rule, max(now, day_start), timezone,
+                                         to_timestamp(now, timezone))
+        elif start <= now:
+            raise ValueError(f"Alarm time {start:%Y-%m-%d %H:%M} is in the past")
+        else:
+            alarm_time = start
+    else:
+        alarm_time = (next_occurrence(rule, now, timezone, to_timestamp(now, timezone)) if rule
+                      else next_alarm_time(hour, minute, now))
+    if alarm_time is None:
+        raise ValueError("Repeat rule has no upcoming occurrence")
+
+    return Alarm(alarm_id, alarm_time, sound, sound_path, status, rule, timezone, group)
+
+def alarms_from_specs(records, alarm_ids, now):
+    """
+    Validate a batch of (row, spec) records. IDs are drawn from the
+    alarm_ids iterator for valid specs only. A spec may be a ValueError
+    raised while parsing its row. Returns (alarms, [(row, error message)]).
+    """
+    alarms = []
+    errors = []
+    for row, spec in records:
+        try:
+            if isinstance(spec, ValueError):
+                raise spec
+            alarm = alarm_from_spec(None, spec, now)
+        except ValueError as e:
+            errors.append((row, str(e)))
+            continue
+        alarm.id = next(alarm_ids)
+        alarms.append(alarm)
+    return alarms, errors
+
+def repeat_name(rule):
+    """Return the repeat preset name matching rule, or None if there is none."""
+    if rule is None:
+        return "Once"
+    for name in REPEAT_PRESETS:
+        if name != "Once" and preset_rule(name, rule.hour, rule.minute) == rule:
+            return name
+    return None
+
+def alarm_to_spec(alarm):
+    """
+    Return the spec that alarm_from_spec turns back into this alarm, for
+    export. 'date' is the day of the next occurrence; a ringing alarm is
+    exported as Active.
+    """
+    rule = alarm.recurrence
+    time_of_day = (rule.hour, rule.minute) if rule else (alarm.time.hour, alarm.time.minute)
+    return {
+        'time': "%02d:%02d" % time_of_day,
+        'date': alarm.time.date().isoformat(),
+        'sound': alarm.sound,
+        'sound_path': alarm.sound_path,
+        'repeat': repeat_name(rule) or rule.to_dict(),
+        'timezone': alarm.timezone,
+        'group': alarm.group,
+        'status': 'Disabled' if alarm.status == 'Disabled' else 'Active',
+    }
+
+def alarm_to_dict(alarm):
+    """Return a JSON-serializable view of an alarm."""
+    rule = alarm.recurrence
+    return {
+        'id': alarm.id,
+        'time': alarm.time.isoformat(timespec='seconds'),
+        'sound': alarm.sound,
+        'sound_path': alarm.sound_path,
+        'status': alarm.status,
+        'repeat': rule.to_dict() if rule else None,
+        'timezone': alarm.timezone,
+        'group': alarm.group,
+    }
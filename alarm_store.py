@@ -0,0 +1,130 @@
+import json
+import os
+import sqlite3
+
+from alarm_model import Alarm, fire_timestamp
+from recurrence import RecurrenceRule
+from timezones import to_wall
+
+DEFAULT_STORE_PATH = os.path.join(os.path.expanduser("~"), ".alarm_clock", "alarms.db")
+
+class AlarmStore:
+    """
+    Durable alarm storage backed by SQLite in write-ahead-log mode.
+
+    Every mutation writes a single row, so adding, editing, snoozing or
+    stopping an alarm never rewrites the whole set. SQLite folds the WAL back
+    into the database file at checkpoints, and close() truncates it.
+    Fire times are stored as UTC timestamps, alongside the alarm's zone.
+    """
+
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # Autocommit mode: each statement is its own transaction
+        self._conn = sqlite3.connect(path, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS alarms ("
+            " id INTEGER PRIMARY KEY,"
+            " fire_at REAL NOT NULL,"
+            " sound TEXT NOT NULL,"
+            " sound_path TEXT NOT NULL,"
+            " status TEXT NOT NULL,"
+            " recurrence TEXT,"
+            " timezone TEXT NOT NULL DEFAULT '',"
+            " group_name TEXT NOT NULL DEFAULT '')"
+        )
+        # Databases created before recurring, zoned or grouped alarms lack the columns
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(alarms)")}
+        if 'recurrence' not in columns:
+            self._conn.execute("ALTER TABLE alarms ADD COLUMN recurrence TEXT")
+        if 'timezone' not in columns:
+            self._conn.execute("ALTER TABLE alarms ADD COLUMN timezone TEXT NOT NULL DEFAULT ''")
+        if 'group_name' not in columns:
+            self._conn.execute("ALTER TABLE alarms ADD COLUMN group_name TEXT NOT NULL DEFAULT ''")
+
+    @staticmethod
+    def _row(alarm):
+        rule = alarm.recurrence
+        return (alarm.id, fire_timestamp(alarm), alarm.sound,
+                alarm.sound_path, alarm.status,
+                json.dumps(rule.to_dict()) if rule else None, alarm.timezone, alarm.group)
+
+    def save(self, alarm):
+        """Insert or update a single alarm."""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO alarms VALUES (?, ?, ?, ?, ?, ?, ?, ?)", self._row(alarm))
+
+    def save_many(self, alarms):
+        """Insert or update several alarms in one transaction."""
+        with self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO alarms VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                map(self._row, alarms))
+
+    def delete(self, alarm_id):
+        """Delete a single alarm by ID."""
+        self._conn.execute("DELETE FROM alarms WHERE id = ?", (alarm_id,))
+
+    def delete_many(self, alarm_ids):
+        """Delete several alarms by ID in one transaction."""
+        with self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.executemany("DELETE FROM alarms WHERE id = ?",
+                                   ((alarm_id,) for alarm_id in alarm_ids))
+
+    def clear(self):
+        """Delete every alarm."""
+        self._conn.execute("DELETE FROM alarms")
+
+    def load_all(self):
+        """
+        Return every stored Alarm, ordered by ID.
+        Alarms that were ringing when the app last exited come back as
+        Active so the scheduler fires them (late) on startup.
+        """
+        rules = {}  # Stored JSON -> rule, shared by alarms with the same rule
+
+        def load_rule(rule):
+            if rule not in rules:
+                try:
+                    rules[rule] = RecurrenceRule.from_dict(json.loads(rule))
+                except ValueError as e:
+                    # The alarm is kept, as a one-shot, rather than failing the load
+                    print(f"Error loading repeat rule {rule}: {e}")
+                    rules[rule] = None
+            return rules[rule]
+
+        # Fire time -> wall time, converted once per zone for alarms that ring
+        # together (most ring on the minute) and shared, like the rules
+        walls = {}
+
+        def load_wall(fire_at, timezone):
+            zone_walls = walls.get(timezone)
+            if zone_walls is None:
+                zone_walls = walls[timezone] = {}
+            wall = zone_walls.get(fire_at)
+            if wall is None:
+                wall = zone_walls[fire_at] = to_wall(fire_at, timezone)
+            return wall
+
+        rows = self._conn.execute(
+            "SELECT id, fire_at, sound, sound_path, status, recurrence, timezone, group_name"
+            " FROM alarms ORDER BY id")
+        return [
+            Alarm(alarm_id, load_wall(fire_at, timezone), sound, sound_path,
+                  'Active' if status == 'Ringing' else status,
+                  load_rule(rule) if rule else None, timezone, group)
+            for alarm_id, fire_at, sound, sound_path, status, rule, timezone, group in rows
+        ]
+
+    def close(self):
+        """Checkpoint the write-ahead log and close the database."""
+        try:
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        finally:
+            self._conn.close()
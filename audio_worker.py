@@ -0,0 +1,254 @@
+import functools
+import itertools
+import os
+import queue
+import threading
+import time
+
+from playback import PlaybackManager
+from sound_generator import TONE_PATTERNS, load_pattern_sound
+
+# Commands are served in priority order, FIFO within a priority, so a play
+# or stop is never stuck behind a backlog of preloads from a bulk import
+URGENT = 0
+BACKGROUND = 1
+
+# How long close() waits for the worker to stop the mixer
+CLOSE_TIMEOUT = 2.0
+
+# Wake-up ramps rise evenly in dB from RAMP_FLOOR_DB to full volume, in
+# steps of RAMP_STEP_MS (about 0.2 dB per step over 60 s, below what the ear
+# can pick out)
+RAMP_STEP_MS = 250
+RAMP_FLOOR_DB = -40.0
+
+@functools.lru_cache(maxsize=32)
+def ramp_envelope(ramp_ms):
+    """Channel volume for each step of a ramp_ms wake-up ramp, ending at 1.0."""
+    steps = max(1, round(ramp_ms / RAMP_STEP_MS))
+    return tuple(10 ** (RAMP_FLOOR_DB * (1 - step / steps) / 20) for step in range(steps + 1))
+
+class AudioWorker:
+    """
+    Single long-lived thread that owns the pygame mixer.
+
+    Every mixer call (opening the device, play, stop, fade, preload and
+    closing) is a command on a priority queue, served one at a time by the
+    worker, so triggering an alarm no longer starts a thread and nothing
+    else touches the mixer. The thread opens the device and renders the
+    tone patterns before serving any command; ready is set once that
+    succeeds. A custom sound that is not decoded yet streams from its file
+    rather than holding up the queue while it decodes.
+
+    Play, stop and fade results are put on a results queue and announced by
+    calling notify() from the worker thread, which should wake the Tk thread
+    (see AlarmClock._on_audio_result). The time from queueing to completion
+    of those commands is recorded in the metrics' audio_command histogram.
+
+    A play may ramp up from near silence. The worker steps the alarm's
+    channel volume along a precomputed envelope itself, waking only at each
+    step while waiting for commands, so a ramp costs the Tk thread nothing.
+    """
+
+    def __init__(self, sound_cache, metrics, notify=None, playback=None):
+        self.sound_cache = sound_cache
+        self.metrics = metrics
+        self.notify = notify
+        self.playback = playback if playback is not None else PlaybackManager()
+        self.ready = threading.Event()
+        self.failed = False  # The device could not be opened
+        self.results = queue.Queue()  # (command, alarm ID, ok)
+
+        self._commands = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._tone_sounds = {}  # Pattern name -> rendered pygame Sound
+        self._ramps = {}  # alarm ID -> (start time, envelope, index of the step applied)
+        self.ramp_wakeups = 0  # Times the worker woke only to step a ramp
+        self._thread = None
+
+    def start(self):
+        """Start the worker, which opens the audio device first."""
+        self._thread = threading.Thread(target=self._run, name="audio", daemon=True)
+        self._thread.start()
+
+    def play(self, alarm, ramp_ms=0):
+        """Start an alarm's sound on its own channel, ramping up over ramp_ms."""
+        self._put(URGENT, 'play', alarm.id, alarm.sound, alarm.sound_path, ramp_ms)
+
+    def stop(self, alarm_id):
+        self._put(URGENT, 'stop', alarm_id)
+
+    def stop_all(self):
+        self._put(URGENT, 'stop_all', None)
+
+    def fade(self, alarm_id, fade_ms):
+        """Fade an alarm's sound out over fade_ms, then release its voice."""
+        self._put(URGENT, 'fade', alarm_id, fade_ms)
+
+    def preload(self, path):
+        """Decode a custom sound file once the device is open."""
+        self._put(BACKGROUND, 'preload', None, path)
+
+    def close(self):
+        """Stop all playback, close the device and wait for the worker."""
+        # The Tk thread is blocked in join() below, so stop waking it
+        self.notify = None
+        self._put(URGENT, 'close', None)
+        if self._thread is not None:
+            self._thread.join(timeout=CLOSE_TIMEOUT)
+
+    def pending(self):
+        """Number of commands waiting for the worker."""
+        return self._commands.qsize()
+
+    def _put(self, priority, command, alarm_id, *args):
+        self._commands.put((priority, next(self._sequence), command, alarm_id, args,
+                            time.perf_counter()))
+
+    def _run(self):
+        self._open()
+        while True:
+            try:
+                item = self._commands.get(timeout=self._next_ramp_step())
+            except queue.Empty:
+                self.ramp_wakeups += 1
+                self._step_ramps()
+                continue
+            priority, _, command, alarm_id, args, queued = item
+            if command == 'close':
+                self._close()
+                return
+            if self.failed:
+                ok = False
+            else:
+                try:
+                    ok = getattr(self, '_' + command)(alarm_id, *args)
+                except Exception as e:
+                    print(f"Error running audio command {command}: {e}")
+                    ok = False
+            if priority == URGENT:
+                self.metrics.record_audio_command((time.perf_counter() - queued) * 1000)
+                self._report(command, alarm_id, ok)
+            self._step_ramps()
+
+    def _next_ramp_step(self):
+        """Seconds until the next ramp step is due, or None with no ramps."""
+        if not self._ramps:
+            return None
+        now = time.monotonic()
+        return max(0, min(start + (index + 1) * RAMP_STEP_MS / 1000
+                          for start, _, index in self._ramps.values()) - now)
+
+    def _step_ramps(self):
+        """Apply the current envelope step of every ramp that has moved on."""
+        now = time.monotonic()
+        for alarm_id, (start, envelope, index) in list(self._ramps.items()):
+            step = min(len(envelope) - 1, int((now - start) * 1000 / RAMP_STEP_MS))
+            if step == index:
+                continue
+            # A stolen voice or a finished stream ends the ramp as well
+            if step == len(envelope) - 1 or not self.playback.set_volume(alarm_id, envelope[step]):
+                self.playback.set_volume(alarm_id, envelope[-1])
+                del self._ramps[alarm_id]
+            else:
+                self._ramps[alarm_id] = (start, envelope, step)
+
+    def _report(self, command, alarm_id, ok):
+        self.results.put((command, alarm_id, ok))
+        notify = self.notify
+        if notify:
+            notify()
+
+    def _open(self):
+        """Import pygame, open the mixer and render the tone patterns"""
+        try:
+            import pygame
+            pygame.mixer.init()
+        except Exception as e:
+            print(f"Error opening audio device: {e}")
+            self.failed = True
+            return
+
+        # Render the tone patterns up front so triggering them does no I/O
+        for name in TONE_PATTERNS:
+            self._tone_sound(name)
+        self.ready.set()
+
+    def _close(self):
+        if self.ready.is_set():
+            import pygame
+            try:
+                self.playback.stop_all()
+                pygame.mixer.quit()
+            except Exception as e:
+                print(f"Error closing audio device: {e}")
+
+    def _tone_sound(self, name):
+        """Return a tone pattern as an in-memory pygame Sound"""
+        if name not in TONE_PATTERNS:
+            name = "Default"
+        sound = self._tone_sounds.get(name)
+        if sound is None:
+            sound = load_pattern_sound(name)
+            if sound is not None:
+                self._tone_sounds[name] = sound
+        return sound
+
+    def _play(self, alarm_id, sound_name, sound_path, ramp_ms):
+        self._ramps.pop(alarm_id, None)
+        envelope = ramp_envelope(ramp_ms) if ramp_ms > 0 else (1.0,)
+        if sound_name == "Custom File" and sound_path:
+            # Usually decoded already by the preload pool. A miss never waits
+            # for the decode: the file streams now and the decoded Sound is
+            # used from the next trigger on.
+            sound = self.sound_cache.get(sound_path, wait=False)
+            if sound is None and self._play_stream(alarm_id, sound_path, envelope):
+                return True
+            if sound is None:
+                sound = self._tone_sound("Default")
+        else:
+            # Tone patterns are already rendered in memory
+            sound = self._tone_sound(sound_name)
+
+        if sound and self.playback.play(alarm_id, sound, volume=envelope[0]):
+            self._start_ramp(alarm_id, envelope)
+            self.metrics.audio_started(alarm_id)
+            return True
+        return False
+
+    def _play_stream(self, alarm_id, path, envelope):
+        """Stream path for alarm_id. Returns False if it cannot be streamed."""
+        import pygame
+        if not os.path.exists(path):
+            return False
+        try:
+            self.playback.play_stream(alarm_id, path, volume=envelope[0])
+        except pygame.error as e:
+            print(f"Error streaming sound {path}: {e}")
+            return False
+        self._start_ramp(alarm_id, envelope)
+        self.metrics.audio_started(alarm_id)
+        return True
+
+    def _start_ramp(self, alarm_id, envelope):
+        if len(envelope) > 1:
+            self._ramps[alarm_id] = (time.monotonic(), envelope, 0)
+
+    def _stop(self, alarm_id):
+        self._ramps.pop(alarm_id, None)
+        self.playback.stop(alarm_id)
+        return True
+
+    def _stop_all(self, alarm_id):
+        self._ramps.clear()
+        self.playback.stop_all()
+        return True
+
+    def _fade(self, alarm_id, fade_ms):
+        self._ramps.pop(alarm_id, None)
+        self.playback.fadeout(alarm_id, fade_ms)
+        return True
+
+    def _preload(self, alarm_id, path):
+        self.sound_cache.preload(path)
+        return True
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Benchmark for idle power use.
+Runs the app for --seconds (60 by default) with its window shown, then as
+long again withdrawn, with --alarms alarms set (none due meanwhile), and
+reports the Tk thread's timer wakeups per hour and the process CPU time in
+each state. Needs a display (use xvfb-run on headless machines); set
+SDL_AUDIODRIVER=dummy to run without a sound card.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tkinter as tk
+
+from alarm_clock import AlarmClock
+from alarm_store import AlarmStore
+
+def measure(root, app, seconds):
+    """Run the event loop for seconds; returns (wakeups per hour, CPU seconds)."""
+    wakeups = app.metrics.wakeups
+    cpu = time.process_time()
+    root.after(int(seconds * 1000), root.quit)
+    root.mainloop()
+    return (app.metrics.wakeups - wakeups) * 3600 / seconds, time.process_time() - cpu
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=60)
+    parser.add_argument("--alarms", type=int, default=100)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = tk.Tk()
+        app = AlarmClock(root, store=AlarmStore(os.path.join(tmp, "alarms.db")))
+        # Alarms spread over the day, none in the next few hours
+        hour = (time.localtime().tm_hour + 4) % 24
+        app.add_alarms([{'time': f"{(hour + i % 16) % 24:02d}:{i % 60:02d}", 'repeat': "Daily"}
+                        for i in range(args.alarms)])
+        root.update()
+
+        for name, hide in [("shown", False), ("withdrawn", True)]:
+            if hide:
+                root.withdraw()
+            # Settle into the state before measuring
+            measure(root, app, 1)
+            wakeups, cpu = measure(root, app, args.seconds)
+            print(f"{name:<10} {wakeups:7.0f} wakeups/h   CPU {cpu * 1000:7.1f} ms "
+                  f"({cpu / args.seconds * 100:.2f}%)   idle={app.idle}")
+
+        app.close_audio()
+        app.store.close()
+        app.sound_cache.shutdown()
+        root.destroy()
+
+if __name__ == "__main__":
+    main()
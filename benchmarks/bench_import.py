@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark for bulk alarm import.
+Writes 500k alarms in each supported format, then runs the same streaming
+pipeline as AlarmClock.import_alarms (parse, validate in batches, store,
+schedule) and reports rows per second. A separate parse-and-validate pass
+under tracemalloc checks that parsing runs in constant memory.
+"""
+
+import datetime
+import itertools
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from alarm_clock import IMPORT_BATCH_SIZE
+from alarm_io import FORMATS, batched, read_alarm_specs, write_alarms
+from alarm_model import alarm_from_spec, alarms_from_specs, fire_timestamp
+from alarm_store import AlarmStore
+from scheduler import AlarmScheduler
+
+ROWS = 500_000
+REPEATS = ["Once", "Daily", "Weekdays", "Weekends"]
+
+def make_alarms(now):
+    for alarm_id in range(1, ROWS + 1):
+        spec = {
+            'time': "%02d:%02d" % divmod(alarm_id % 1440, 60),
+            'sound': "Default",
+            'repeat': REPEATS[alarm_id % len(REPEATS)]
+        }
+        yield alarm_from_spec(alarm_id, spec, now)
+
+def bench_import(path, store_path, now):
+    store = AlarmStore(store_path)
+    scheduler = AlarmScheduler()
+    alarm_ids = itertools.count(1)
+    imported = 0
+    start = time.perf_counter()
+    for records in batched(read_alarm_specs(path), IMPORT_BATCH_SIZE):
+        alarms, errors = alarms_from_specs(records, alarm_ids, now)
+        assert not errors, errors[:3]
+        store.save_many(alarms)
+        scheduler.schedule_many((alarm.id, fire_timestamp(alarm)) for alarm in alarms)
+        imported += len(alarms)
+    elapsed = time.perf_counter() - start
+    store.close()
+    assert imported == ROWS
+    return elapsed
+
+def parse_peak_memory(path, now):
+    """Peak traced memory while parsing and validating, discarding alarms."""
+    tracemalloc.start()
+    for records in batched(read_alarm_specs(path), IMPORT_BATCH_SIZE):
+        alarms_from_specs(records, itertools.count(1), now)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+def main():
+    now = datetime.datetime.now()
+    print(f"Importing {ROWS} alarms, batches of {IMPORT_BATCH_SIZE}:")
+    with tempfile.TemporaryDirectory() as tmp:
+        for extension in FORMATS:
+            path = os.path.join(tmp, "alarms" + extension)
+            write_alarms(path, make_alarms(now))
+            size_mb = os.path.getsize(path) / 2**20
+
+            elapsed = bench_import(path, os.path.join(tmp, extension[1:] + ".db"), now)
+            peak_mb = parse_peak_memory(path, now) / 2**20
+            print(f"{extension:<7} {size_mb:6.1f} MB file   {elapsed:6.2f} s   "
+                  f"{ROWS / elapsed:8.0f} rows/s   parse peak {peak_mb:5.1f} MB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark for the alarm model.
+Builds 1M alarms from JSON specs, as an import does, and reports the memory
+they retain as slotted Alarm records (interned strings, shared preset
+rules) against the same alarms as the dicts used before.
+"""
+
+import datetime
+import gc
+import itertools
+import json
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from alarm_model import alarms_from_specs
+from recurrence import REPEAT_PRESETS
+
+ALARMS = 1_000_000
+SOUNDS = [("Default", ""), ("Chirp", ""), ("Custom File", "/home/user/Music/wake-up.ogg")]
+REPEATS = list(REPEAT_PRESETS)
+
+def spec_lines(count):
+    """JSON specs, decoded one at a time so every string is a fresh object."""
+    for i in range(count):
+        sound, sound_path = SOUNDS[i % len(SOUNDS)]
+        yield i, json.loads(json.dumps({
+            'time': "%02d:%02d" % divmod(i % 1440, 60),
+            'sound': sound,
+            'sound_path': sound_path,
+            'repeat': REPEATS[i % len(REPEATS)],
+        }))
+
+def dict_alarms(count, now):
+    """The alarms as the dicts alarm_from_spec returned before Alarm."""
+    alarms = []
+    for alarm in alarms_from_specs(spec_lines(count), itertools.count(1), now)[0]:
+        rule = alarm.recurrence
+        alarms.append({
+            'id': alarm.id,
+            'time': alarm.time,
+            # Fresh copies, as decoded from each spec
+            'sound': "".join(list(alarm.sound)),
+            'sound_path': "".join(list(alarm.sound_path)),
+            'status': "".join(list(alarm.status)),
+            'recurrence': rule.with_time(rule.hour, rule.minute) if rule else None,
+        })
+    return alarms
+
+def retained(build):
+    """Bytes still allocated by the result of build() once it returns."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, len(result)
+
+def main():
+    now = datetime.datetime.now()
+    print(f"Retained memory for {ALARMS} alarms:")
+    for name, build in [
+        ("Alarm", lambda: alarms_from_specs(spec_lines(ALARMS), itertools.count(1), now)[0]),
+        ("dict", lambda: dict_alarms(ALARMS, now)),
+    ]:
+        size, count = retained(build)
+        assert count == ALARMS
+        print(f"{name:<6} {size / 2**20:8.1f} MB   {size / count:6.0f} bytes/alarm")
+
+if __name__ == "__main__":
+    main()
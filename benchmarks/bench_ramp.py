@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Benchmark for wake-up volume ramps.
+Plays an alarm through the AudioWorker with a ramp of --seconds (60 by
+default) and reports how often the audio thread woke to step the volume and
+how much CPU the process used meanwhile, against the same period ringing
+without a ramp. The Tk thread takes no part in ramps, so it sees no
+wakeups. Set SDL_AUDIODRIVER=dummy to run without a sound card.
+"""
+
+import argparse
+import datetime
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from alarm_model import Alarm
+from audio_worker import AudioWorker
+from metrics import AlarmMetrics
+from sound_cache import SoundCache
+
+def ring(worker, alarm_id, seconds, ramp_ms):
+    """Ring for seconds; returns (CPU seconds used, ramp wakeups)."""
+    played = threading.Event()
+    worker.notify = played.set
+    wakeups = worker.ramp_wakeups
+    cpu = time.process_time()
+    worker.play(Alarm(alarm_id, datetime.datetime.now()), ramp_ms=ramp_ms)
+    played.wait(5)
+    time.sleep(seconds)
+    used = time.process_time() - cpu
+    assert worker.playback.volume(alarm_id) == 1.0
+    worker.stop(alarm_id)
+    return used, worker.ramp_wakeups - wakeups
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=60)
+    args = parser.parse_args()
+
+    cache = SoundCache()
+    worker = AudioWorker(cache, AlarmMetrics())
+    worker.start()
+    if not worker.ready.wait(10):
+        sys.exit("Audio device did not open")
+
+    # The ramp finishes just before the measurement ends
+    ramp_ms = int(args.seconds * 1000) - 500
+    for name, alarm_id, ramp in [("no ramp", 1, 0), ("ramp", 2, ramp_ms)]:
+        cpu, wakeups = ring(worker, alarm_id, args.seconds, ramp)
+        print(f"{name:<8} {args.seconds:.0f} s ringing: {wakeups:4d} audio-thread wakeups   "
+              f"{wakeups / args.seconds:5.1f}/s   CPU {cpu * 1000:7.1f} ms "
+              f"({cpu / args.seconds * 100:.2f}%)   Tk wakeups 0")
+
+    worker.close()
+    cache.shutdown()
+
+if __name__ == "__main__":
+    main()
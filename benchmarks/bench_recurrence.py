@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Benchmark for recurring alarms.
+Computes the next fire time for 100k mixed recurrence rules, the work done
+when every recurring alarm is rescheduled (e.g. after a cold load).
+"""
+
+import datetime
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from recurrence import RecurrenceRule
+
+RULES = 100_000
+
+def make_rules(count, seed=1):
+    rng = random.Random(seed)
+    today = datetime.date.today()
+    rules = []
+    for i in range(count):
+        hour, minute = rng.randrange(24), rng.randrange(60)
+        exceptions = [today + datetime.timedelta(days=rng.randrange(14)) for _ in range(rng.randrange(3))]
+        kind = i % 4
+        if kind == 0:
+            rules.append(RecurrenceRule.daily(hour, minute, exceptions=exceptions))
+        elif kind == 1:
+            rules.append(RecurrenceRule.daily(hour, minute, weekdays=rng.sample(range(7), 2),
+                                              exceptions=exceptions))
+        elif kind == 2:
+            dates = [today + datetime.timedelta(days=rng.randrange(365)) for _ in range(10)]
+            rules.append(RecurrenceRule.on_dates(hour, minute, dates, exceptions=exceptions))
+        else:
+            rules.append(RecurrenceRule.every(rng.choice([5, 15, 30]), (min(hour, 20), 0), (22, 0),
+                                              weekdays=range(5), exceptions=exceptions))
+    return rules
+
+def main():
+    rules = make_rules(RULES)
+    now = datetime.datetime.now()
+    
+    start = time.perf_counter()
+    next_times = [rule.next_after(now) for rule in rules]
+    elapsed = time.perf_counter() - start
+    
+    assert all(t is None or t > now for t in next_times)
+    print(f"Next fire time for {RULES} rules: {elapsed * 1000:.1f} ms "
+          f"({elapsed / RULES * 1e6:.2f} us per rule)")
+
+if __name__ == "__main__":
+    main()
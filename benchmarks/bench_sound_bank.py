@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the memory-mapped sound bank.
+Writes a --seconds (180 by default) WAV, then starts fresh interpreters that
+each load it through a SoundCache together with every built-in tone: first
+against an empty bank, then --instances times concurrently against the
+filled one. Reports load time and, on Linux, each instance's private memory
+and the memory shared through the bank mapping. Set SDL_AUDIODRIVER=dummy to
+run without a sound card.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import wave
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+def write_wav(path, seconds, sample_rate=44100):
+    import numpy as np
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    samples = (np.sin(2 * np.pi * 440 * t) * 0.3 * 32767).astype(np.int16)
+    with wave.open(path, 'w') as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(samples.tobytes())
+
+def memory_kb():
+    """(private, shared) resident kB of this process, or None off Linux."""
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            fields = dict(line.split(":", 1) for line in f if ":" in line and "kB" in line)
+    except OSError:
+        return None
+    kb = lambda name: int(fields[name].split()[0])
+    return (kb("Private_Clean") + kb("Private_Dirty"), kb("Shared_Clean") + kb("Shared_Dirty"))
+
+def child(path, cache_dir, start_at):
+    """Load the sounds in this process and print 'ms private_kb shared_kb'."""
+    import pygame
+    from sound_cache import SoundCache
+    from sound_generator import TONE_PATTERNS, load_pattern_sound
+    pygame.mixer.init()
+    cache = SoundCache(cache_dir=cache_dir)
+    before = memory_kb()
+    time.sleep(max(0, start_at - time.time()))
+    start = time.perf_counter()
+    assert cache.get(path) is not None
+    for name in TONE_PATTERNS:
+        load_pattern_sound(name)
+    elapsed = time.perf_counter() - start
+    after = memory_kb()
+    if before and after:
+        print(elapsed * 1000, after[0] - before[0], after[1] - before[1])
+    else:
+        print(elapsed * 1000, 0, 0)
+    # Stay alive until every instance has measured, so they overlap
+    time.sleep(max(0, start_at + 5 - time.time()))
+    cache.shutdown()
+
+def run_instances(count, path, cache_dir):
+    start_at = time.time() + 2
+    processes = [subprocess.Popen([sys.executable, __file__, "--child", path, cache_dir,
+                                   str(start_at)], stdout=subprocess.PIPE, text=True)
+                 for _ in range(count)]
+    results = []
+    for process in processes:
+        out, _ = process.communicate()
+        results.append([float(value) for value in out.split()[-3:]])
+    return results
+
+def report(name, results):
+    for i, (ms, private_kb, shared_kb) in enumerate(results):
+        print(f"{name:<6} instance {i + 1}: load {ms:7.1f} ms   private +{private_kb / 1024:6.1f} MB   "
+              f"shared +{shared_kb / 1024:6.1f} MB")
+
+def main():
+    if len(sys.argv) == 5 and sys.argv[1] == "--child":
+        child(sys.argv[2], sys.argv[3], float(sys.argv[4]))
+        return
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=180)
+    parser.add_argument("--instances", type=int, default=3)
+    args = parser.parse_args()
+
+    # Tones go to the default bank; point it at the scratch directory too
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["XDG_CACHE_HOME"] = tmp
+        cache_dir = os.path.join(tmp, "alarm_clock", "sounds")
+        path = os.path.join(tmp, "sound.wav")
+        write_wav(path, args.seconds)
+        report("empty", run_instances(1, path, cache_dir))
+        report("warm", run_instances(args.instances, path, cache_dir))
+
+if __name__ == "__main__":
+    main()
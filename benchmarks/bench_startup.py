@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for the alarm clock.
+
+Launches the app in fresh interpreters and records, from process launch:
+  - time to first paint: the window has been created and drawn once
+  - time to audio ready: pygame is imported and the mixer is open
+It also checks that pygame and NumPy were not imported before first paint.
+
+Results are appended to benchmarks/results/startup.jsonl along with the
+current git commit, and --max-first-paint-ms / --max-audio-ready-ms make
+the run fail when a threshold is exceeded, so regressions get caught.
+Needs a display (use xvfb-run on headless machines); set
+SDL_AUDIODRIVER=dummy to run without a sound card.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_FILE = os.path.join(REPO_DIR, "benchmarks", "results", "startup.jsonl")
+
+CHILD = r'''
+import json, os, sys, tempfile, time
+sys.path.insert(0, sys.argv[1])
+import tkinter as tk
+from alarm_clock import AlarmClock
+from alarm_store import AlarmStore
+
+with tempfile.TemporaryDirectory() as tmp:
+    root = tk.Tk()
+    app = AlarmClock(root, store=AlarmStore(os.path.join(tmp, "alarms.db")))
+    root.update()
+    first_paint = time.time()
+    lazy = not ({'pygame', 'numpy'} & set(sys.modules))
+    
+    deadline = time.time() + 30
+    while not app.audio_ready.is_set() and time.time() < deadline:
+        root.update()
+        time.sleep(0.001)
+    audio_ready = time.time() if app.audio_ready.is_set() else None
+    
+    app.close_audio()
+    app.store.close()
+    app.sound_cache.shutdown()
+    root.destroy()
+    
+print(json.dumps({'first_paint': first_paint, 'audio_ready': audio_ready, 'lazy': lazy}))
+'''
+
+def run_once():
+    start = time.time()
+    output = subprocess.run([sys.executable, "-c", CHILD, REPO_DIR],
+                            check=True, capture_output=True, text=True).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    audio_ready = result['audio_ready']
+    return {
+        'first_paint_ms': (result['first_paint'] - start) * 1000,
+        'audio_ready_ms': (audio_ready - start) * 1000 if audio_ready else None,
+        'lazy_imports': result['lazy'],
+    }
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR,
+                              check=True, capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-first-paint-ms", type=float)
+    parser.add_argument("--max-audio-ready-ms", type=float)
+    args = parser.parse_args()
+    
+    runs = [run_once() for _ in range(args.runs)]
+    paint = statistics.median(r['first_paint_ms'] for r in runs)
+    ready_runs = [r['audio_ready_ms'] for r in runs if r['audio_ready_ms'] is not None]
+    audio = statistics.median(ready_runs) if ready_runs else None
+    lazy = all(r['lazy_imports'] for r in runs)
+    
+    print(f"Time to first paint:  {paint:8.1f} ms (median of {args.runs})")
+    print(f"Time to audio ready:  {audio:8.1f} ms" if audio is not None else
+          "Time to audio ready:  audio device did not open")
+    print(f"Heavy imports deferred past first paint: {'yes' if lazy else 'NO'}")
+    
+    os.makedirs(os.path.dirname(RESULTS_FILE), exist_ok=True)
+    with open(RESULTS_FILE, 'a') as f:
+        f.write(json.dumps({
+            'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+            'commit': git_commit(),
+            'first_paint_ms': round(paint, 1),
+            'audio_ready_ms': round(audio, 1) if audio is not None else None,
+            'lazy_imports': lazy,
+        }) + "\n")
+    
+    failed = not lazy
+    if args.max_first_paint_ms is not None and paint > args.max_first_paint_ms:
+        print(f"FAIL: first paint exceeds {args.max_first_paint_ms} ms")
+        failed = True
+    if args.max_audio_ready_ms is not None and (audio is None or audio > args.max_audio_ready_ms):
+        print(f"FAIL: audio ready exceeds {args.max_audio_ready_ms} ms")
+        failed = True
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
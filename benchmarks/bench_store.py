@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the SQLite alarm store.
+Measures write latency per mutation and cold-load time for a large alarm set.
+"""
+
+import datetime
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from alarm_model import Alarm
+from alarm_store import AlarmStore
+
+MUTATIONS = 2000
+COLD_LOAD_ALARMS = 100_000
+
+def make_alarm(alarm_id, base):
+    return Alarm(alarm_id, base + datetime.timedelta(minutes=alarm_id % 1440))
+
+def report(name, samples):
+    samples = sorted(samples)
+    p50 = statistics.median(samples) * 1e6
+    p99 = samples[int(len(samples) * 0.99) - 1] * 1e6
+    print(f"{name:<10} p50 {p50:8.1f} us   p99 {p99:8.1f} us   max {samples[-1] * 1e6:8.1f} us")
+
+def bench_mutations(path):
+    store = AlarmStore(path)
+    base = datetime.datetime.now()
+    inserts, updates, deletes = [], [], []
+    
+    for alarm_id in range(1, MUTATIONS + 1):
+        alarm = make_alarm(alarm_id, base)
+        start = time.perf_counter()
+        store.save(alarm)
+        inserts.append(time.perf_counter() - start)
+        
+    for alarm_id in range(1, MUTATIONS + 1):
+        alarm = make_alarm(alarm_id, base + datetime.timedelta(minutes=5))
+        alarm.status = 'Ringing'
+        start = time.perf_counter()
+        store.save(alarm)
+        updates.append(time.perf_counter() - start)
+        
+    for alarm_id in range(1, MUTATIONS + 1):
+        start = time.perf_counter()
+        store.delete(alarm_id)
+        deletes.append(time.perf_counter() - start)
+        
+    store.close()
+    print(f"Write latency per mutation ({MUTATIONS} each):")
+    report("insert", inserts)
+    report("update", updates)
+    report("delete", deletes)
+
+def bench_cold_load(path):
+    store = AlarmStore(path)
+    base = datetime.datetime.now()
+    store.save_many(make_alarm(alarm_id, base) for alarm_id in range(1, COLD_LOAD_ALARMS + 1))
+    store.close()
+    
+    start = time.perf_counter()
+    store = AlarmStore(path)
+    alarms = store.load_all()
+    elapsed = time.perf_counter() - start
+    store.close()
+    
+    assert len(alarms) == COLD_LOAD_ALARMS
+    print(f"\nCold load of {COLD_LOAD_ALARMS} alarms: {elapsed * 1000:.1f} ms")
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        bench_mutations(os.path.join(tmp, "mutations.db"))
+        bench_cold_load(os.path.join(tmp, "cold_load.db"))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for tone-pattern synthesis.
+Renders each built-in pattern to a 30-second buffer and reports the best
+and median time over several runs.
+"""
+
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sound_generator import TONE_PATTERNS, render_pattern
+
+SAMPLE_RATE = 44100
+DURATION = 30.0
+RUNS = 20
+
+def main():
+    print(f"Rendering {DURATION:.0f} s patterns at {SAMPLE_RATE} Hz ({RUNS} runs each):")
+    for name, pattern in TONE_PATTERNS.items():
+        timings = []
+        for _ in range(RUNS):
+            start = time.perf_counter()
+            samples = render_pattern(pattern, SAMPLE_RATE, duration=DURATION)
+            timings.append(time.perf_counter() - start)
+        assert len(samples) == int(SAMPLE_RATE * DURATION)
+        print(f"{name:<10} best {min(timings) * 1000:6.2f} ms   "
+              f"median {statistics.median(timings) * 1000:6.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Benchmark for custom sound decoding.
+Writes a 60-second WAV, then times decoding it through a fresh SoundCache
+twice: the first decode transcodes and normalizes it in a worker process,
+the second reads the cached PCM back. Set SDL_AUDIODRIVER=dummy to run
+without a sound card.
+"""
+
+import os
+import sys
+import tempfile
+import time
+import wave
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sound_cache import SoundCache
+
+SECONDS = 60
+
+def write_wav(path, sample_rate):
+    import numpy as np
+    t = np.arange(SECONDS * sample_rate) / sample_rate
+    samples = (np.sin(2 * np.pi * 440 * t) * 0.3 * 32767).astype(np.int16)
+    with wave.open(path, 'w') as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(samples.tobytes())
+
+def timed_decode(path, cache_dir):
+    cache = SoundCache(cache_dir=cache_dir)
+    start = time.perf_counter()
+    sound = cache.get(path)
+    elapsed = time.perf_counter() - start
+    cache.shutdown()
+    assert sound is not None
+    return elapsed
+
+def main():
+    import pygame
+    pygame.mixer.init()
+    sample_rate = pygame.mixer.get_init()[0]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "sound.wav")
+        write_wav(path, sample_rate)
+        cache_dir = os.path.join(tmp, "cache")
+        first = timed_decode(path, cache_dir)
+        cached = timed_decode(path, cache_dir)
+        print(f"{SECONDS} s WAV: first decode {first * 1000:7.1f} ms   "
+              f"cached {cached * 1000:7.1f} ms")
+    pygame.mixer.quit()
+
+if __name__ == "__main__":
+    main()
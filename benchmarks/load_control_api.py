@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Load test for the local control API.
+Start the app with --control-port (or --control-socket) first, then run this
+against it. Each connection repeatedly adds a batch of alarms, lists a page
+and deletes the batch again, so the app's alarm list ends up unchanged.
+Reports request throughput and latency, and the app's clock tick jitter
+while under load.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from metrics import LatencyHistogram
+
+async def request(reader, writer, method, path, payload=None):
+    body = json.dumps(payload).encode() if payload is not None else b''
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n"
+                 f"Content-Type: application/json\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode().partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    response = json.loads(await reader.readexactly(length))
+    if status != 200:
+        raise RuntimeError(f"{method} {path} failed with {status}: {response.get('error')}")
+    return response
+
+async def connect(args):
+    if args.socket:
+        return await asyncio.open_unix_connection(args.socket)
+    return await asyncio.open_connection(args.host, args.port)
+
+async def worker(args, worker_id, histograms):
+    reader, writer = await connect(args)
+    specs = [{'time': f"{(worker_id + i) % 24:02d}:{i % 60:02d}", 'sound': "Default"}
+             for i in range(args.batch)]
+    try:
+        for _ in range(args.rounds):
+            start = time.perf_counter()
+            added = (await request(reader, writer, 'POST', '/alarms', {'alarms': specs}))['added']
+            histograms['add'].record((time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            await request(reader, writer, 'GET', '/alarms?offset=0&limit=100')
+            histograms['list'].record((time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            await request(reader, writer, 'POST', '/alarms/delete', {'ids': added})
+            histograms['delete'].record((time.perf_counter() - start) * 1000)
+    finally:
+        writer.close()
+
+async def tick_jitter(args):
+    reader, writer = await connect(args)
+    try:
+        return (await request(reader, writer, 'GET', '/metrics'))['metrics']['tick_jitter']
+    finally:
+        writer.close()
+
+def report(name, stats):
+    print(f"{name:<12} n {stats['count']:6d}   p50 {stats['p50']:8.1f} ms   "
+          f"p99 {stats['p99']:8.1f} ms   max {stats['max']:8.1f} ms")
+
+async def run(args):
+    before = await tick_jitter(args)
+    histograms = {name: LatencyHistogram() for name in ('add', 'list', 'delete')}
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(args, i, histograms) for i in range(args.connections)))
+    elapsed = time.perf_counter() - start
+    after = await tick_jitter(args)
+
+    requests = sum(h.count for h in histograms.values())
+    alarms = histograms['add'].count * args.batch
+    print(f"{args.connections} connections x {args.rounds} rounds, batches of {args.batch}")
+    print(f"{requests} requests in {elapsed:.2f} s: {requests / elapsed:.0f} req/s, "
+          f"{alarms / elapsed:.0f} alarms added+deleted/s\n")
+    for name, histogram in histograms.items():
+        report(name, histogram.summary())
+    # The app's histogram also holds ticks from before the run
+    print(f"\nTick jitter: {after['count'] - before['count']} ticks during the run")
+    report("tick jitter", after)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--socket", help="connect to this Unix socket instead of TCP")
+    parser.add_argument("--connections", type=int, default=16)
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--batch", type=int, default=100)
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+pytest-benchmark suite for the alarm clock.
+
+Covers scheduling, zoned fire time conversion, refreshing the alarms list
+at 10, 1k and 100k alarms, tone synthesis and startup, headless (SDL dummy audio, withdrawn Tk root;
+the Tk cases need a display, so use xvfb-run on servers). Run and store the
+results, named after the current commit, with:
+
+    python -m pytest benchmarks --benchmark-autosave --benchmark-storage=benchmarks/results
+
+and compare against the last stored run, failing on regressions, with:
+
+    python -m pytest benchmarks --benchmark-storage=benchmarks/results \\
+        --benchmark-compare --benchmark-compare-fail=mean:20%
+"""
+
+import datetime
+import time
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from alarm_model import Alarm, fire_timestamp
+from scheduler import AlarmScheduler
+from sound_generator import TONE_PATTERNS, render_pattern
+from timezones import zone_names
+
+SAMPLE_RATE = 44100
+
+def offsets(count):
+    """(key, seconds from now) pairs spread over the next day."""
+    return [(key, (key * 7919) % 86400) for key in range(count)]
+
+def deadlines(count):
+    """(key, UTC fire timestamp) pairs, as the app schedules them."""
+    now = time.time()
+    return [(key, now + offset) for key, offset in offsets(count)]
+
+@pytest.mark.parametrize("count", [1000, 100_000])
+def test_schedule_many(benchmark, count):
+    items = deadlines(count)
+    benchmark(lambda: AlarmScheduler().schedule_many(items))
+
+def test_schedule_one_into_large_heap(benchmark):
+    scheduler = AlarmScheduler()
+    scheduler.schedule_many(deadlines(100_000))
+    benchmark(scheduler.schedule, 1, time.time() + 3600)
+
+def test_pop_due(benchmark):
+    items = deadlines(100_000)
+    now = time.time() + 3600
+
+    def setup():
+        scheduler = AlarmScheduler()
+        scheduler.schedule_many(items)
+        return (scheduler, now), {}
+    due = benchmark.pedantic(AlarmScheduler.pop_due, setup=setup, rounds=5)
+    assert due
+
+def test_fire_timestamps_across_zones(benchmark):
+    """UTC fire times of 100k alarms spread over every zone, as on load."""
+    zones = zone_names()
+    now = datetime.datetime.now()
+    alarms = [Alarm(key, now + datetime.timedelta(seconds=offset), timezone=zones[key % len(zones)])
+              for key, offset in offsets(100_000)]
+    fire_timestamps = benchmark(lambda: [fire_timestamp(alarm) for alarm in alarms])
+    assert len(fire_timestamps) == len(alarms)
+
+@pytest.mark.parametrize("count", [10, 1000, 100_000])
+def test_update_alarms_display(benchmark, app, count):
+    """Refresh the list after every alarm's time changed."""
+    app.add_alarms([{'time': "%02d:%02d" % divmod(i % 1440, 60)} for i in range(count)])
+    app.render.flush()
+
+    def shift_every_alarm():
+        for alarm in app.alarms.values():
+            alarm.time += datetime.timedelta(minutes=1)
+
+    def redraw():
+        app.update_alarms_display()
+        app.render.flush()
+    benchmark.pedantic(redraw, setup=shift_every_alarm, rounds=5 if count > 1000 else 50)
+
+@pytest.mark.parametrize("name", list(TONE_PATTERNS))
+def test_render_tone_pattern(benchmark, name):
+    samples = benchmark(render_pattern, TONE_PATTERNS[name], SAMPLE_RATE, duration=30.0)
+    assert len(samples) == SAMPLE_RATE * 30
+
+def test_startup_first_paint(benchmark, tmp_path):
+    """Build the window and draw the first frame (cold starts: bench_startup.py)."""
+    import tkinter as tk
+    from alarm_clock import AlarmClock
+    from alarm_store import AlarmStore
+
+    apps = []
+
+    def setup():
+        try:
+            root = tk.Tk()
+        except tk.TclError as e:
+            pytest.skip(f"Tk needs a display, run under xvfb-run: {e}")
+        root.withdraw()
+        store = AlarmStore(str(tmp_path / f"alarms{len(apps)}.db"))
+        return (root, store), {}
+
+    def start(root, store):
+        apps.append(AlarmClock(root, store=store))
+        root.update_idletasks()
+
+    def teardown(root, store):
+        app = apps[-1]
+        app.close_audio()
+        app.store.close()
+        app.sound_cache.shutdown()
+        root.destroy()
+    benchmark.pedantic(start, setup=setup, teardown=teardown, rounds=10)
@@ -0,0 +1,98 @@
+import datetime
+import heapq
+import itertools
+import time
+
+# Every time the alarm engine reads, and every timer it sets that depends on
+# the time (the alarm check and the clock tick), goes through a clock
+# object. SystemClock is real time on the Tk event loop; VirtualClock only
+# moves when advanced, so tests and the soak simulation can replay days of
+# alarms in seconds.
+
+class SystemClock:
+    """Real time, with timers on the Tk event loop."""
+
+    def time(self):
+        """Current UTC timestamp."""
+        return time.time()
+
+    def monotonic(self):
+        """Seconds from an arbitrary start, never going backwards."""
+        return time.monotonic()
+
+    def now(self):
+        """Current naive wall-clock time in the system zone."""
+        return datetime.datetime.now()
+
+    def after(self, root, ms, func, *args):
+        """Run func(*args) after ms milliseconds; returns an ID for after_cancel."""
+        return root.after(ms, func, *args)
+
+    def after_cancel(self, root, after_id):
+        root.after_cancel(after_id)
+
+class VirtualClock:
+    """
+    Simulated time that stands still until advance() or advance_to() moves
+    it. Timers set with after() run during an advance, in deadline order,
+    with the clock set to each timer's deadline; timers they set in turn
+    run in the same advance if they fall due before it ends. The root
+    arguments are accepted for SystemClock compatibility and ignored.
+    """
+
+    def __init__(self, start=None):
+        self._time = time.time() if start is None else start
+        self._monotonic = 0.0
+        self._timers = []  # Heap of (deadline, ID)
+        self._pending = {}  # Timer ID -> (func, args), until run or cancelled
+        self._ids = itertools.count(1)
+        self.timers_run = 0
+
+    def time(self):
+        return self._time
+
+    def monotonic(self):
+        return self._monotonic
+
+    def now(self):
+        return datetime.datetime.fromtimestamp(self._time)
+
+    def after(self, root, ms, func, *args):
+        after_id = next(self._ids)
+        self._pending[after_id] = (func, args)
+        heapq.heappush(self._timers, (self._time + ms / 1000, after_id))
+        return after_id
+
+    def after_cancel(self, root, after_id):
+        self._pending.pop(after_id, None)
+
+    def next_deadline(self):
+        """Timestamp of the earliest pending timer, or None."""
+        while self._timers and self._timers[0][1] not in self._pending:
+            heapq.heappop(self._timers)
+        return self._timers[0][0] if self._timers else None
+
+    def _set(self, timestamp):
+        if timestamp > self._time:
+            self._monotonic += timestamp - self._time
+            self._time = timestamp
+
+    def advance_to(self, timestamp):
+        """Move time forward to timestamp, running due timers on the way. Returns how many ran."""
+        ran = 0
+        while True:
+            deadline = self.next_deadline()
+            if deadline is None or deadline > timestamp:
+                break
+            _, after_id = heapq.heappop(self._timers)
+            func, args = self._pending.pop(after_id)
+            self._set(deadline)
+            func(*args)
+            ran += 1
+        self._set(timestamp)
+        self.timers_run += ran
+        return ran
+
+    def advance(self, seconds):
+        """Move time forward by seconds; see advance_to."""
+        return self.advance_to(self._time + seconds)
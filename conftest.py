@@ -0,0 +1,113 @@
+import atexit
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+# Run headless: the SDL dummy driver needs no sound card. This has to be set
+# before pygame is first imported.
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# Keep the sound bank and other caches out of the user's ~/.cache; every
+# cache path is derived from XDG_CACHE_HOME when its module is imported
+os.environ["XDG_CACHE_HOME"] = tempfile.mkdtemp(prefix="alarm_clock_tests_")
+atexit.register(shutil.rmtree, os.environ["XDG_CACHE_HOME"], ignore_errors=True)
+
+import pytest
+
+@pytest.fixture(scope="session")
+def display():
+    """
+    The X display Tk opens. On X11 systems without one, a virtual Xvfb
+    display is started for the session if Xvfb is installed.
+    """
+    if os.environ.get("DISPLAY") or sys.platform in ("win32", "darwin") \
+            or shutil.which("Xvfb") is None:
+        yield os.environ.get("DISPLAY")
+        return
+    # Xvfb picks a free display number and writes it to the pipe when ready
+    read_fd, write_fd = os.pipe()
+    server = subprocess.Popen(["Xvfb", "-displayfd", str(write_fd), "-screen", "0", "1280x1024x24",
+                               "-nolisten", "tcp"], pass_fds=(write_fd,),
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    os.close(write_fd)
+    with os.fdopen(read_fd) as ready:
+        number = ready.readline().strip()
+    if not number:
+        server.kill()
+        server.wait()
+        yield None
+        return
+    os.environ["DISPLAY"] = f":{number}"
+    try:
+        yield os.environ["DISPLAY"]
+    finally:
+        del os.environ["DISPLAY"]
+        server.terminate()
+        server.wait()
+
+@pytest.fixture
+def tk_root(display):
+    """
+    A withdrawn Tk root. Without a display the test is skipped, except on
+    CI (the CI environment variable is set), where it fails.
+    """
+    import tkinter as tk
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        message = f"Tk needs a display; install Xvfb or run under xvfb-run: {e}"
+        if os.environ.get("CI"):
+            pytest.fail(message)
+        pytest.skip(message)
+    root.withdraw()
+    yield root
+    root.destroy()
+
+@pytest.fixture
+def app(tk_root, tmp_path, monkeypatch):
+    """An AlarmClock on a withdrawn root with its own store in tmp_path."""
+    from tkinter import messagebox
+    from alarm_clock import AlarmClock
+    from alarm_store import AlarmStore
+
+    # Modal dialogs would block the test; record them instead
+    dialogs = []
+    for name in ("showinfo", "showwarning", "showerror"):
+        monkeypatch.setattr(messagebox, name,
+                            lambda title, message, name=name, **kw: dialogs.append((name, title)))
+    app = AlarmClock(tk_root, store=AlarmStore(str(tmp_path / "alarms.db")))
+    app.dialogs = dialogs
+    yield app
+    app.close_audio()
+    app.store.close()
+    app.sound_cache.shutdown()
+
+@pytest.fixture
+def virtual_app(tk_root, tmp_path, monkeypatch):
+    """An AlarmClock like app's, running on a VirtualClock (app.clock)."""
+    from tkinter import messagebox
+    from alarm_clock import AlarmClock
+    from alarm_store import AlarmStore
+    from clock import VirtualClock
+
+    monkeypatch.setattr(messagebox, "showinfo", lambda title, message, **kw: None)
+    app = AlarmClock(tk_root, store=AlarmStore(str(tmp_path / "alarms.db")), clock=VirtualClock())
+    yield app
+    app.close_audio()
+    app.store.close()
+    app.sound_cache.shutdown()
+
+@pytest.fixture
+def pump(tk_root):
+    """Run the Tk event loop until condition() is true or timeout passes."""
+    def pump(condition=lambda: False, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while True:
+            tk_root.update()
+            if condition() or time.monotonic() > deadline:
+                return condition()
+            time.sleep(0.005)
+    return pump
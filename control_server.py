@@ -0,0 +1,344 @@
+import asyncio
+import json
+import math
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from urllib.parse import parse_qs, urlsplit
+
+from alarm_model import parse_group
+
+# How often the Tk thread drains queued API calls, and how long it may spend
+# doing so per poll before handing control back to the clock tick
+DEFAULT_POLL_MS = 25
+CALL_BUDGET = 0.010
+
+# Large batches are split so no single Tk-thread call runs for long; group
+# actions are not, so they act on the whole group at once
+BATCH_CHUNK = 500
+MAX_PAGE_SIZE = 1000
+MAX_BODY_BYTES = 64 * 1024 * 1024
+MAX_SNOOZE_MINUTES = 24 * 60
+
+# Fire events buffered per /events subscriber before they are dropped
+EVENT_QUEUE_SIZE = 1000
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error"}
+
+class ControlServer:
+    """
+    Local HTTP/1.1 control API for bulk alarm management.
+
+    Connections are served by an asyncio loop on a background thread, over
+    TCP on localhost or a Unix socket. Tk is not thread-safe, so every call
+    into the AlarmClock is queued and run on the Tk thread by a root.after
+    poll, which stops draining the queue once CALL_BUDGET is spent and
+    leaves the rest for the next poll. Endpoints (JSON bodies):
+
+      GET  /alarms?offset=0&limit=100     one page of alarms
+      POST /alarms         {"alarms": [spec, ...]}     see alarm_from_spec
+      POST /alarms/delete  {"ids": [...]}
+      POST /alarms/snooze  {"ids": [...], "minutes": 5}
+      POST /alarms/enable  {"ids": [...]}
+      POST /alarms/disable {"ids": [...]}
+      POST /alarms/group   {"ids": [...], "name": "work"}    "" for none
+      GET  /events         newline-delimited JSON, one line per fired alarm
+      GET  /metrics        latency, tick jitter, redraw and wakeup summary
+
+    Instead of "ids", the bulk endpoints accept {"group": name} to act on
+    every alarm in a group, resolved and changed as one batch.
+    """
+
+    def __init__(self, app, host="127.0.0.1", port=None, unix_path=None,
+                 poll_ms=DEFAULT_POLL_MS):
+        self.app = app
+        self.host = host
+        self.port = port or 0
+        self.unix_path = unix_path
+        self.poll_ms = poll_ms
+        self.address = None
+
+        self._calls = queue.Queue()
+        self._poll_id = None
+        self._loop = None
+        self._stopping = None
+        self._thread = None
+        self._ready = threading.Event()
+        self._start_error = None
+        self._connections = set()
+        self._subscribers = set()
+        self._routes = {
+            ('GET', '/alarms'): self._list_alarms,
+            ('POST', '/alarms'): self._add_alarms,
+            ('POST', '/alarms/delete'): self._remove_alarms,
+            ('POST', '/alarms/snooze'): self._snooze_alarms,
+            ('POST', '/alarms/enable'): self._enable_alarms,
+            ('POST', '/alarms/disable'): self._disable_alarms,
+            ('POST', '/alarms/group'): self._group_alarms,
+            ('GET', '/metrics'): self._metrics,
+        }
+
+    def start(self):
+        """Start serving; call from the Tk thread. Raises OSError on failure."""
+        self._thread = threading.Thread(target=asyncio.run, args=(self._serve(),), daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._start_error:
+            raise self._start_error
+        self.app.fire_listeners.append(self._on_fire)
+        self._poll_id = self.app.root.after(self.poll_ms, self._poll)
+        print(f"Control API listening on {self.address}")
+
+    def stop(self):
+        """Stop serving and fail any calls still waiting for the Tk thread."""
+        if self._poll_id:
+            self.app.root.after_cancel(self._poll_id)
+            self._poll_id = None
+        if self._on_fire in self.app.fire_listeners:
+            self.app.fire_listeners.remove(self._on_fire)
+        if self._loop and self._thread.is_alive():
+            self._loop.call_soon_threadsafe(self._stopping.set)
+            self._thread.join(timeout=2)
+        while True:
+            try:
+                _, _, future = self._calls.get_nowait()
+            except queue.Empty:
+                break
+            future.cancel()
+
+    def call(self, fn, *args):
+        """Run fn(*args) on the Tk thread; returns a concurrent Future."""
+        future = Future()
+        self._calls.put((fn, args, future))
+        return future
+
+    def _poll(self):
+        deadline = time.monotonic() + CALL_BUDGET
+        while time.monotonic() < deadline:
+            try:
+                fn, args, future = self._calls.get_nowait()
+            except queue.Empty:
+                break
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args))
+            except Exception as e:
+                future.set_exception(e)
+
+        # Come straight back if the budget ran out with calls still queued
+        delay = 1 if not self._calls.empty() else self.poll_ms
+        self._poll_id = self.app.root.after(delay, self._poll)
+
+    def _on_fire(self, event):
+        """Fire listener, called on the Tk thread by trigger_alarm."""
+        if self._loop and self._subscribers:
+            self._loop.call_soon_threadsafe(self._publish, event)
+
+    def _publish(self, event):
+        for subscriber in self._subscribers:
+            if not subscriber.full():
+                subscriber.put_nowait(event)
+
+    async def _on_tk(self, fn, *args):
+        return await asyncio.wrap_future(self.call(fn, *args))
+
+    async def _serve(self):
+        self._loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+        try:
+            if self.unix_path:
+                # A socket file left behind by a previous run blocks bind()
+                if os.path.exists(self.unix_path):
+                    os.unlink(self.unix_path)
+                server = await asyncio.start_unix_server(self._handle, path=self.unix_path)
+                self.address = self.unix_path
+            else:
+                server = await asyncio.start_server(self._handle, self.host, self.port)
+                self.address = "http://%s:%d" % server.sockets[0].getsockname()[:2]
+        except OSError as e:
+            self._start_error = e
+            self._ready.set()
+            return
+        self._ready.set()
+
+        await self._stopping.wait()
+        server.close()
+        for writer in list(self._connections):
+            writer.close()
+        await server.wait_closed()
+        if self.unix_path and os.path.exists(self.unix_path):
+            os.unlink(self.unix_path)
+
+    async def _handle(self, reader, writer):
+        self._connections.add(writer)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    await self._respond(writer, 400, {'error': "Malformed request line"}, False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                keep_alive = (version == 'HTTP/1.1'
+                              and headers.get('connection', '').lower() != 'close')
+
+                try:
+                    length = int(headers.get('content-length') or 0)
+                    if length < 0:
+                        raise ValueError(length)
+                except ValueError:
+                    await self._respond(writer, 400, {'error': "Invalid Content-Length"}, False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, 413, {'error': "Request body too large"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+
+                url = urlsplit(target)
+                if method == 'GET' and url.path == '/events':
+                    await self._stream_events(writer)
+                    break
+                status, payload = await self._dispatch(method, url, body)
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        except asyncio.CancelledError:
+            # The loop is shutting down; /events streams only end this way
+            pass
+        finally:
+            self._connections.discard(writer)
+            writer.close()
+
+    async def _dispatch(self, method, url, body):
+        route = self._routes.get((method, url.path))
+        if route is None:
+            if any(path == url.path for _, path in self._routes):
+                return 405, {'error': f"{method} not allowed on {url.path}"}
+            return 404, {'error': f"No such endpoint: {url.path}"}
+        try:
+            data = json.loads(body) if body else {}
+            if not isinstance(data, dict):
+                raise ValueError("Request body must be a JSON object")
+            return 200, await route(parse_qs(url.query), data)
+        except ValueError as e:
+            return 400, {'error': str(e)}
+        except Exception as e:
+            print(f"Error handling control request: {e}")
+            return 500, {'error': str(e)}
+
+    async def _respond(self, writer, status, payload, keep_alive):
+        body = json.dumps(payload).encode()
+        writer.write(
+            f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1')
+            + body)
+        await writer.drain()
+
+    async def _stream_events(self, writer):
+        writer.write(b"HTTP/1.1 200 OK\r\n"
+                     b"Content-Type: application/x-ndjson\r\n"
+                     b"Cache-Control: no-cache\r\n"
+                     b"Connection: close\r\n\r\n")
+        await writer.drain()
+        subscriber = asyncio.Queue(EVENT_QUEUE_SIZE)
+        self._subscribers.add(subscriber)
+        try:
+            while True:
+                event = await subscriber.get()
+                writer.write(json.dumps(event).encode() + b"\n")
+                await writer.drain()
+        finally:
+            self._subscribers.discard(subscriber)
+
+    @staticmethod
+    def _ids(data):
+        ids = data.get('ids')
+        # bool is an int subclass, but true is not an alarm ID
+        if not isinstance(ids, list) or not all(type(i) is int for i in ids):
+            raise ValueError("'ids' must be a list of integers")
+        return ids
+
+    async def _bulk(self, fn, data, *args):
+        """
+        Run fn(ids, *args) on the Tk thread for the alarms a bulk request
+        names, per BATCH_CHUNK IDs; returns the IDs it touched. A group is
+        resolved and acted on in a single call, so no alarm can join or
+        leave it partway through.
+        """
+        if 'group' in data:
+            name = parse_group(data['group'])
+            def run_on_group():
+                return [alarm.id for alarm in fn(self.app.groups.members(name), *args)]
+            return await self._on_tk(run_on_group)
+        ids = self._ids(data)
+        done = []
+        for start in range(0, len(ids), BATCH_CHUNK):
+            alarms = await self._on_tk(fn, ids[start:start + BATCH_CHUNK], *args)
+            done.extend(alarm.id for alarm in alarms)
+        return done
+
+    async def _list_alarms(self, query, data):
+        offset = max(0, int(query.get('offset', ['0'])[0]))
+        limit = min(MAX_PAGE_SIZE, max(0, int(query.get('limit', ['100'])[0])))
+        total, alarms = await self._on_tk(self.app.list_alarms, offset, limit)
+        return {'total': total, 'offset': offset, 'alarms': alarms}
+
+    async def _add_alarms(self, query, data):
+        specs = data.get('alarms')
+        if not isinstance(specs, list):
+            raise ValueError("'alarms' must be a list of alarm specs")
+        added, errors = [], []
+        for start in range(0, len(specs), BATCH_CHUNK):
+            alarms, chunk_errors = await self._on_tk(
+                self.app.add_alarms, specs[start:start + BATCH_CHUNK])
+            added.extend(alarm.id for alarm in alarms)
+            errors.extend({'index': start + index, 'error': error}
+                          for index, error in chunk_errors)
+        return {'added': added, 'errors': errors}
+
+    async def _remove_alarms(self, query, data):
+        return {'removed': await self._bulk(self.app.remove_alarms, data)}
+
+    async def _snooze_alarms(self, query, data):
+        minutes = data.get('minutes', 5)
+        if (type(minutes) not in (int, float) or not math.isfinite(minutes)
+                or not 0 < minutes <= MAX_SNOOZE_MINUTES):
+            raise ValueError(f"'minutes' must be a number from 0 to {MAX_SNOOZE_MINUTES}")
+        return {'snoozed': await self._bulk(self.app.snooze_alarms, data, minutes)}
+
+    async def _enable_alarms(self, query, data):
+        return {'enabled': await self._bulk(self.app.enable_alarms, data)}
+
+    async def _disable_alarms(self, query, data):
+        return {'disabled': await self._bulk(self.app.disable_alarms, data)}
+
+    async def _group_alarms(self, query, data):
+        name = parse_group(data.get('name'))
+        return {'moved': await self._bulk(self.app.set_alarm_group, data, name)}
+
+    async def _metrics(self, query, data):
+        # AlarmMetrics is lock-protected, so only render stats need the Tk thread
+        return {
+            'metrics': self.app.metrics.summary(),
+            'wakeups_per_hour': self.app.metrics.wakeups_per_hour(),
+            'render': await self._on_tk(self.app.render.stats),
+            'pending_calls': self._calls.qsize(),
+        }
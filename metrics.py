@@ -0,0 +1,174 @@
+import csv
+import json
+import math
+import threading
+import time
+from collections import deque
+
+# Samples kept per histogram (and lifecycle records kept for export)
+DEFAULT_MAX_SAMPLES = 10000
+
+# Tk thread wakeups are counted over a sliding window this long
+WAKEUP_WINDOW_SECONDS = 3600
+
+class LatencyHistogram:
+    """
+    Latency samples in milliseconds.
+
+    The most recent max_samples values are kept for percentiles; the count
+    and maximum cover every sample ever recorded.
+    """
+
+    def __init__(self, max_samples=DEFAULT_MAX_SAMPLES):
+        self._samples = deque(maxlen=max_samples)
+        self.count = 0
+        self.max = None
+
+    def record(self, value_ms):
+        self._samples.append(value_ms)
+        self.count += 1
+        if self.max is None or value_ms > self.max:
+            self.max = value_ms
+
+    def percentile(self, p):
+        """Nearest-rank percentile over the retained samples, or None."""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        rank = max(1, math.ceil(p / 100 * len(ordered)))
+        return ordered[rank - 1]
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'p50': self.percentile(50),
+            'p99': self.percentile(99),
+            'max': self.max,
+        }
+
+class AlarmMetrics:
+    """
+    Trigger-latency and clock-tick jitter instrumentation.
+
+    Each alarm firing records four wall-clock timestamps: when it was
+    scheduled to ring, when the scheduler noticed it was due, when
+    trigger_alarm ran, and when the mixer started playing. The delay of
+    each stage relative to the scheduled time goes into a histogram, as does
+    the drift of every update_clock tick from its 1 s period.
+    """
+
+    HISTOGRAMS = (
+        ('detect_delay', "Scheduled → detected"),
+        ('trigger_delay', "Scheduled → triggered"),
+        ('audio_delay', "Scheduled → audio started"),
+        ('tick_jitter', "Clock tick jitter"),
+        ('redraw_time', "UI redraw time"),
+        ('audio_command', "Audio command latency"),
+    )
+
+    def __init__(self, max_samples=DEFAULT_MAX_SAMPLES, clock=time.time):
+        self.clock = clock  # Returns the current UTC timestamp
+        self.histograms = {name: LatencyHistogram(max_samples) for name, _ in self.HISTOGRAMS}
+        self.lifecycles = deque(maxlen=max_samples)
+        self._open = {}  # alarm ID -> lifecycle record awaiting later stages
+        self._lock = threading.Lock()
+        self._started = clock()
+        self.wakeups = 0
+        self._recent_wakeups = deque()  # Times of the last WAKEUP_WINDOW_SECONDS' wakeups
+
+    def alarm_detected(self, alarm_id, scheduled, detected=None):
+        """
+        Start a lifecycle record for an alarm the scheduler found due;
+        scheduled is its fire time as a UTC timestamp.
+        """
+        detected = self.clock() if detected is None else detected
+        record = {
+            'alarm_id': alarm_id,
+            'scheduled': scheduled,
+            'detected': detected,
+            'triggered': None,
+            'audio_started': None,
+        }
+        with self._lock:
+            self._open[alarm_id] = record
+            self.lifecycles.append(record)
+            self.histograms['detect_delay'].record((detected - scheduled) * 1000)
+
+    def alarm_triggered(self, alarm_id):
+        now = self.clock()
+        with self._lock:
+            record = self._open.get(alarm_id)
+            if record is not None:
+                record['triggered'] = now
+                self.histograms['trigger_delay'].record((now - record['scheduled']) * 1000)
+
+    def audio_started(self, alarm_id):
+        """Called from the audio thread once the mixer is playing."""
+        now = self.clock()
+        with self._lock:
+            record = self._open.pop(alarm_id, None)
+            if record is not None:
+                record['audio_started'] = now
+                self.histograms['audio_delay'].record((now - record['scheduled']) * 1000)
+
+    def record_tick(self, jitter_ms):
+        with self._lock:
+            self.histograms['tick_jitter'].record(jitter_ms)
+
+    def record_wakeup(self):
+        """Count a timer wakeup of the Tk thread (a clock tick or alarm check)."""
+        now = self.clock()
+        with self._lock:
+            self.wakeups += 1
+            self._recent_wakeups.append(now)
+            while self._recent_wakeups[0] <= now - WAKEUP_WINDOW_SECONDS:
+                self._recent_wakeups.popleft()
+
+    def wakeups_per_hour(self):
+        """Wakeups over the last hour, extrapolated if the app has run for less."""
+        now = self.clock()
+        with self._lock:
+            while self._recent_wakeups and self._recent_wakeups[0] <= now - WAKEUP_WINDOW_SECONDS:
+                self._recent_wakeups.popleft()
+            span = min(WAKEUP_WINDOW_SECONDS, now - self._started)
+            return len(self._recent_wakeups) * 3600 / span if span > 0 else 0.0
+
+    def record_redraw(self, duration_ms):
+        with self._lock:
+            self.histograms['redraw_time'].record(duration_ms)
+
+    def record_audio_command(self, latency_ms):
+        """Time from queueing an audio command to the worker finishing it."""
+        with self._lock:
+            self.histograms['audio_command'].record(latency_ms)
+
+    def summary(self):
+        """Return {histogram name: {'label', 'count', 'p50', 'p99', 'max'}}."""
+        with self._lock:
+            return {
+                name: dict(label=label, **self.histograms[name].summary())
+                for name, label in self.HISTOGRAMS
+            }
+
+    def export_json(self, path):
+        """Write the histogram summaries and lifecycle records as JSON."""
+        with self._lock:
+            lifecycles = [dict(record) for record in self.lifecycles]
+        with open(path, 'w') as f:
+            json.dump({'summary': self.summary(), 'lifecycles': lifecycles}, f, indent=2)
+
+    def export_csv(self, path):
+        """Write one row per alarm lifecycle, followed by the summaries."""
+        fields = ['alarm_id', 'scheduled', 'detected', 'triggered', 'audio_started']
+        with self._lock:
+            lifecycles = [dict(record) for record in self.lifecycles]
+        summary = self.summary()
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(fields)
+            for record in lifecycles:
+                writer.writerow([record[field] for field in fields])
+            writer.writerow([])
+            writer.writerow(['metric', 'count', 'p50_ms', 'p99_ms', 'max_ms'])
+            for name, stats in summary.items():
+                writer.writerow([name, stats['count'], stats['p50'], stats['p99'], stats['max']])
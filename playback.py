@@ -0,0 +1,145 @@
+import threading
+import time
+
+# Number of alarms that can sound at the same time
+MAX_ALARM_VOICES = 4
+
+class PlaybackManager:
+    """
+    Plays each ringing alarm on its own pygame mixer Channel.
+
+    Up to max_voices alarms sound at once. The channels are reserved so
+    other Sound.play() calls never take them. Each voice belongs to one alarm
+    ID, so stopping or snoozing an alarm silences only that alarm.
+
+    When every voice is busy, a new alarm steals the voice with the lowest
+    priority, taking the oldest one first among equal priorities. A voice
+    is only stolen if its priority is not higher than the new alarm's. If
+    nothing can be stolen, play() returns False and the caller falls back
+    to the system bell.
+
+    Files that pygame cannot decode into a Sound are streamed through the
+    single pygame.mixer.music stream. That stream is also owned by one alarm
+    at a time, and a newer stream replaces an older one.
+    """
+
+    def __init__(self, max_voices=MAX_ALARM_VOICES):
+        self.max_voices = max_voices
+        self._channels = None
+        self._voices = {}  # alarm ID -> (channel index, priority, start time)
+        self._stream_owner = None
+        self._lock = threading.Lock()
+
+    def _ensure_channels(self):
+        if self._channels is None:
+            import pygame
+            if pygame.mixer.get_num_channels() < self.max_voices:
+                pygame.mixer.set_num_channels(self.max_voices)
+            pygame.mixer.set_reserved(self.max_voices)
+            self._channels = [pygame.mixer.Channel(i) for i in range(self.max_voices)]
+        return self._channels
+
+    def _pick_channel(self, priority):
+        channels = self._ensure_channels()
+        in_use = {index for index, _, _ in self._voices.values()}
+        for index in range(len(channels)):
+            if index not in in_use:
+                return index
+
+        # Voice stealing: lowest priority first, then the oldest voice
+        victim_id, (index, victim_priority, _) = min(
+            self._voices.items(), key=lambda item: (item[1][1], item[1][2]))
+        if victim_priority > priority:
+            return None
+        del self._voices[victim_id]
+        channels[index].stop()
+        return index
+
+    def play(self, alarm_id, sound, priority=0, loops=-1, volume=1.0):
+        """Start sound for alarm_id on its own channel. Returns True if playing."""
+        with self._lock:
+            self._stop_locked(alarm_id)
+            index = self._pick_channel(priority)
+            if index is None:
+                return False
+            self._channels[index].set_volume(volume)
+            self._channels[index].play(sound, loops=loops)
+            self._voices[alarm_id] = (index, priority, time.monotonic())
+            return True
+
+    def play_stream(self, alarm_id, path, loops=-1, volume=1.0):
+        """Stream a file for alarm_id through pygame.mixer.music."""
+        import pygame
+        with self._lock:
+            self._stop_locked(alarm_id)
+            pygame.mixer.music.load(path)
+            pygame.mixer.music.set_volume(volume)
+            pygame.mixer.music.play(loops)
+            self._stream_owner = alarm_id
+            return True
+
+    def stop(self, alarm_id):
+        """Stop playback for a single alarm."""
+        with self._lock:
+            self._stop_locked(alarm_id)
+
+    def set_volume(self, alarm_id, volume):
+        """Set the volume of one alarm's sound. Returns False if it is not playing."""
+        import pygame
+        with self._lock:
+            voice = self._voices.get(alarm_id)
+            if voice is not None:
+                self._channels[voice[0]].set_volume(volume)
+            elif self._stream_owner == alarm_id:
+                pygame.mixer.music.set_volume(volume)
+            else:
+                return False
+            return True
+
+    def volume(self, alarm_id):
+        """Return the volume of one alarm's sound, or None if it is not playing."""
+        import pygame
+        with self._lock:
+            voice = self._voices.get(alarm_id)
+            if voice is not None:
+                return self._channels[voice[0]].get_volume()
+            if self._stream_owner == alarm_id:
+                return pygame.mixer.music.get_volume()
+            return None
+
+    def fadeout(self, alarm_id, fade_ms):
+        """Fade out a single alarm over fade_ms; its voice is free at once."""
+        import pygame
+        with self._lock:
+            voice = self._voices.pop(alarm_id, None)
+            if voice is not None:
+                self._channels[voice[0]].fadeout(fade_ms)
+            if self._stream_owner == alarm_id:
+                pygame.mixer.music.fadeout(fade_ms)
+                self._stream_owner = None
+
+    def _stop_locked(self, alarm_id):
+        import pygame
+        voice = self._voices.pop(alarm_id, None)
+        if voice is not None:
+            self._channels[voice[0]].stop()
+        if self._stream_owner == alarm_id:
+            pygame.mixer.music.stop()
+            pygame.mixer.music.unload()
+            self._stream_owner = None
+
+    def stop_all(self):
+        """Stop every alarm voice and the music stream."""
+        import pygame
+        with self._lock:
+            for index, _, _ in self._voices.values():
+                self._channels[index].stop()
+            self._voices.clear()
+            if self._stream_owner is not None:
+                pygame.mixer.music.stop()
+                pygame.mixer.music.unload()
+                self._stream_owner = None
+
+    def is_playing(self, alarm_id):
+        with self._lock:
+            return alarm_id in self._voices or alarm_id == self._stream_owner
@@ -0,0 +1,283 @@
+import functools
+import inspect
+import io
+import time
+import tkinter as tk
+from collections import defaultdict
+
+from metrics import LatencyHistogram
+
+# Started by --profile only: nothing here is imported or patched otherwise,
+# so the normal event loop runs without any of these hooks.
+#
+# Every Tcl callback Python registers, whether from after/after_idle,
+# widget command= options, event bindings, scrollbar and postcommand
+# callbacks or window protocols, goes through tkinter.Misc._register (after
+# through Misc.after). Patching those two methods on the class times every
+# handler of every widget created while the profiler is installed.
+
+# Collectors run alongside the handler timings, for a limited window
+TIMING = "timing"
+CPROFILE = "cprofile"
+TRACEMALLOC = "tracemalloc"
+MODES = (TIMING, CPROFILE, TRACEMALLOC)
+
+DEFAULT_WINDOW_SECONDS = 60
+
+# Methods whose allocations are reported. update_alarms_display only marks
+# the list dirty; the work happens in the render functions after it.
+HOTSPOTS = ("update_alarms_display", "_draw_alarms", "_render_alarm_list",
+            "check_alarms", "trigger_alarm")
+
+# Rows per report table, and stack frames kept per traced allocation
+REPORT_ROWS = 15
+TRACEMALLOC_FRAMES = 10
+
+def handler_name(func):
+    """A readable name for a callback: Class.method, or its qualified name."""
+    owner = getattr(func, '__self__', None)
+    name = getattr(func, '__name__', None) or type(func).__name__
+    if owner is not None and not isinstance(owner, type):
+        return f"{type(owner).__name__}.{name}"
+    qualname = getattr(func, '__qualname__', name)
+    code = getattr(func, '__code__', None)
+    if name == "<lambda>" and code is not None:
+        return f"{qualname} (line {code.co_firstlineno})"
+    return qualname
+
+class TkProfiler:
+    """
+    Times every Tk callback and measures event loop lag.
+
+    Each handler's run time goes into a per-handler histogram. Loop lag is
+    how late each after() callback started relative to when it was due,
+    i.e. how long the loop was busy with other work. In cprofile mode the
+    Tk thread is also profiled, and in tracemalloc mode allocations are
+    traced, for window_seconds from start(); the HOTSPOTS methods of a
+    watched class additionally record the memory each call allocated.
+    """
+
+    def __init__(self, mode=TIMING, window_seconds=DEFAULT_WINDOW_SECONDS):
+        if mode not in MODES:
+            raise ValueError(f"Unknown profile mode: {mode}")
+        self.mode = mode
+        self.window_seconds = window_seconds
+        self.handlers = defaultdict(LatencyHistogram)  # Name -> run times in ms
+        self.handler_totals = defaultdict(float)  # Name -> total run time in ms
+        self.loop_lag = LatencyHistogram()
+        self.allocations = {}  # Hotspot name -> [calls, net bytes, max peak bytes]
+        self.started = None
+        self.collecting = False
+        self._patched = []  # (owner, attribute, original value)
+        self._in_after = False
+        self._profile = None
+        self._snapshot = None
+        self._hotspot_code = {}
+        self._allocation_stack = []  # [memory at call, peak seen] per running hotspot
+
+    def timed(self, func, name=None, due=None):
+        """Wrap func to record its run time, and its lag if due is given."""
+        name = name or handler_name(func)
+        histogram = self.handlers[name]
+
+        @functools.wraps(func)
+        def wrapper(*args):
+            start = time.perf_counter()
+            if due is not None:
+                self.loop_lag.record(max(0.0, (start - due) * 1000))
+            try:
+                return func(*args)
+            finally:
+                elapsed = (time.perf_counter() - start) * 1000
+                histogram.record(elapsed)
+                self.handler_totals[name] += elapsed
+        return wrapper
+
+    def _patch(self, owner, attribute, value):
+        self._patched.append((owner, attribute, owner.__dict__[attribute]))
+        setattr(owner, attribute, value)
+
+    def install(self):
+        """Start timing callbacks registered from now on. Call before creating widgets."""
+        profiler = self
+        original_after = tk.Misc.after
+        original_register = tk.Misc._register
+
+        def after(widget, ms, func=None, *args):
+            if func is None:
+                return original_after(widget, ms)
+            delay = 0 if ms == 'idle' else ms
+            timed = profiler.timed(func, due=time.perf_counter() + delay / 1000)
+            # The Tcl command after() registers only calls the timed wrapper
+            profiler._in_after = True
+            try:
+                return original_after(widget, ms, timed, *args)
+            finally:
+                profiler._in_after = False
+
+        def register(widget, func, subst=None, needcleanup=1):
+            if not profiler._in_after:
+                func = profiler.timed(func)
+            return original_register(widget, func, subst, needcleanup)
+
+        self._patch(tk.Misc, 'after', after)
+        self._patch(tk.Misc, '_register', register)
+        self.started = time.monotonic()
+
+    def watch(self, cls, names=HOTSPOTS):
+        """Record per-call allocations of cls's hotspot methods while tracing."""
+        import tracemalloc
+        profiler = self
+
+        def measured(name, method):
+            @functools.wraps(method)
+            def wrapper(*args, **kwargs):
+                if not profiler.collecting or profiler.mode != TRACEMALLOC:
+                    return method(*args, **kwargs)
+                # Hotspots call each other; a nested call resets the peak,
+                # so the caller's peak so far is kept on the stack
+                stack = profiler._allocation_stack
+                current, peak = tracemalloc.get_traced_memory()
+                if stack:
+                    stack[-1][1] = max(stack[-1][1], peak)
+                tracemalloc.reset_peak()
+                stack.append([current, current])
+                try:
+                    return method(*args, **kwargs)
+                finally:
+                    current, peak = tracemalloc.get_traced_memory()
+                    before, seen = stack.pop()
+                    peak = max(peak, seen)
+                    if stack:
+                        stack[-1][1] = max(stack[-1][1], peak)
+                    record = profiler.allocations.setdefault(name, [0, 0, 0])
+                    record[0] += 1
+                    record[1] += current - before
+                    record[2] = max(record[2], peak - before)
+            return wrapper
+
+        for name in names:
+            method = getattr(cls, name, None)
+            if method is None:
+                continue
+            self._hotspot_code[name] = method.__code__
+            self._patch(cls, name, measured(name, method))
+
+    def start(self, root):
+        """Start the mode's collector and stop it after window_seconds."""
+        if self.mode == CPROFILE:
+            import cProfile
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        elif self.mode == TRACEMALLOC:
+            import tracemalloc
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        self.collecting = self.mode != TIMING
+        if self.collecting:
+            root.after(int(self.window_seconds * 1000), self.stop_collecting)
+
+    def stop_collecting(self):
+        """End the collector's window, keeping what it gathered for the report."""
+        if not self.collecting:
+            return
+        self.collecting = False
+        if self.mode == CPROFILE:
+            self._profile.disable()
+        elif self.mode == TRACEMALLOC:
+            import tracemalloc
+            self._snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+
+    def uninstall(self):
+        """Stop collecting and restore every patched method."""
+        self.stop_collecting()
+        for owner, attribute, original in reversed(self._patched):
+            setattr(owner, attribute, original)
+        self._patched = []
+
+    def _hotspot_lines(self):
+        """Allocation sites still holding memory whose stack passes through a hotspot."""
+        import tracemalloc
+        snapshot = self._snapshot
+        if snapshot is None and self.collecting:
+            snapshot = tracemalloc.take_snapshot()
+        if snapshot is None:
+            return []
+        ranges = {}
+        for name, code in self._hotspot_code.items():
+            try:
+                lines = len(inspect.getsourcelines(code)[0])
+            except OSError:
+                lines = 1
+            ranges[name] = (code.co_filename, code.co_firstlineno, code.co_firstlineno + lines - 1)
+        sites = defaultdict(lambda: [0, 0])  # (hotspot, allocating frame) -> [count, bytes]
+        for trace in snapshot.traces:
+            # Frames run oldest first; credit the innermost hotspot
+            allocated = trace.traceback[-1]
+            for frame in reversed(trace.traceback):
+                hotspot = next((name for name, (filename, first, last) in ranges.items()
+                                if frame.filename == filename and first <= frame.lineno <= last), None)
+                if hotspot is not None:
+                    site = sites[(hotspot, f"{allocated.filename}:{allocated.lineno}")]
+                    site[0] += 1
+                    site[1] += trace.size
+                    break
+        # The wrappers' own allocations are not the hotspots'
+        return sorted(((size, count, hotspot, where) for (hotspot, where), (count, size) in sites.items()
+                       if not where.startswith(__file__)), reverse=True)[:REPORT_ROWS]
+
+    def report(self):
+        """Return the profile as text."""
+        elapsed = time.monotonic() - self.started if self.started is not None else 0
+        out = io.StringIO()
+        out.write(f"Tk profile ({self.mode}), {elapsed:.1f} s\n\n")
+
+        out.write("Slowest handlers (by longest run)\n")
+        out.write(f"{'calls':>8} {'total ms':>10} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}  handler\n")
+        ranked = sorted(self.handlers.items(), key=lambda item: item[1].max or 0, reverse=True)
+        for name, histogram in ranked[:REPORT_ROWS]:
+            if not histogram.count:
+                continue
+            out.write(f"{histogram.count:8d} {self.handler_totals[name]:10.1f} "
+                      f"{histogram.percentile(50):8.2f} {histogram.percentile(99):8.2f} "
+                      f"{histogram.max:8.2f}  {name}\n")
+
+        lag = self.loop_lag.summary()
+        out.write("\nTk loop lag (after callbacks started past their due time)\n")
+        if lag['count']:
+            out.write(f"  {lag['count']} callbacks   p50 {lag['p50']:.2f} ms   "
+                      f"p99 {lag['p99']:.2f} ms   max {lag['max']:.2f} ms\n")
+        else:
+            out.write("  no after callbacks ran\n")
+
+        if self.mode == TRACEMALLOC:
+            out.write("\nAllocations per call (while tracing)\n")
+            out.write(f"{'calls':>8} {'net KiB':>10} {'max peak KiB':>13}  method\n")
+            for name, (calls, net, peak) in sorted(self.allocations.items(),
+                                                   key=lambda item: item[1][2], reverse=True):
+                out.write(f"{calls:8d} {net / 1024:10.1f} {peak / 1024:13.1f}  {name}\n")
+            out.write("\nLive allocations made under the hotspots\n")
+            for size, count, hotspot, where in self._hotspot_lines():
+                out.write(f"{size / 1024:10.1f} KiB {count:7d} blocks  {hotspot}  {where}\n")
+
+        if self.mode == CPROFILE and self._profile is not None:
+            import pstats
+            out.write("\ncProfile, by cumulative time\n")
+            if self.collecting:
+                self._profile.disable()
+            pstats.Stats(self._profile, stream=out).sort_stats('cumulative').print_stats(REPORT_ROWS)
+            if self.collecting:
+                self._profile.enable()
+        return out.getvalue()
+
+    def write_report(self, path=None):
+        """Write the report to path, or print it if path is None."""
+        text = self.report()
+        if path is None:
+            print(text)
+            return
+        try:
+            with open(path, 'w') as f:
+                f.write(text)
+        except OSError as e:
+            print(f"Error writing profile report: {e}")
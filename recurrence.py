@@ -0,0 +1,190 @@
+import bisect
+import datetime
+import functools
+
+WEEKDAY_NAMES = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+def _is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+def _check_time(hour, minute, what):
+    """Raise ValueError unless hour:minute is a valid time of day."""
+    if not (_is_int(hour) and _is_int(minute) and 0 <= hour <= 23 and 0 <= minute <= 59):
+        raise ValueError(f"Invalid {what}: {hour!r}:{minute!r}")
+
+class RecurrenceRule:
+    """
+    Repeat rule for an alarm.
+
+    A rule is never expanded into a list of occurrences. next_after()
+    computes just the next fire time, and the alarm is rescheduled with it
+    each time it is stopped. Kinds:
+      daily:    at hour:minute on every day, or only on the given weekdays
+      dates:    at hour:minute on each of a fixed set of dates
+      interval: every `interval` minutes from hour:minute to window_end,
+                on every day or only on the given weekdays
+    Dates listed in exceptions are skipped by every kind. Rules are
+    validated when built and never modified afterwards.
+    """
+
+    __slots__ = ('kind', 'hour', 'minute', 'weekdays', 'dates', 'interval',
+                 'window_end', 'exceptions')
+
+    def __init__(self, kind, hour, minute, weekdays=None, dates=(), interval=None,
+                 window_end=None, exceptions=()):
+        if kind not in ('daily', 'dates', 'interval'):
+            raise ValueError(f"Unknown recurrence kind: {kind}")
+        _check_time(hour, minute, "rule time")
+        if kind == 'interval':
+            if not (_is_int(interval) and interval > 0):
+                raise ValueError("Interval rules need a positive whole number of minutes")
+            if not (isinstance(window_end, (list, tuple)) and len(window_end) == 2):
+                raise ValueError("Interval rules need a window end of [hour, minute]")
+            _check_time(*window_end, "window end")
+            if tuple(window_end) <= (hour, minute):
+                raise ValueError("Interval window must end after it starts")
+        weekdays = frozenset(weekdays) if weekdays is not None else None
+        if weekdays is not None and not all(_is_int(d) and 0 <= d <= 6 for d in weekdays):
+            raise ValueError("Weekdays must be numbers from 0 (Monday) to 6 (Sunday)")
+        dates = set(dates)
+        exceptions = frozenset(exceptions)
+        for day in dates | exceptions:
+            if not isinstance(day, datetime.date) or isinstance(day, datetime.datetime):
+                raise ValueError(f"Invalid date: {day!r}")
+        self.kind = kind
+        self.hour = hour
+        self.minute = minute
+        self.weekdays = weekdays
+        self.dates = sorted(dates)
+        self.interval = interval if kind == 'interval' else None
+        self.window_end = tuple(window_end) if kind == 'interval' else None
+        self.exceptions = exceptions
+
+    @classmethod
+    def daily(cls, hour, minute, weekdays=None, exceptions=()):
+        return cls('daily', hour, minute, weekdays=weekdays, exceptions=exceptions)
+
+    @classmethod
+    def on_dates(cls, hour, minute, dates, exceptions=()):
+        return cls('dates', hour, minute, dates=dates, exceptions=exceptions)
+
+    @classmethod
+    def every(cls, interval, start, end, weekdays=None, exceptions=()):
+        return cls('interval', start[0], start[1], weekdays=weekdays, interval=interval,
+                   window_end=end, exceptions=exceptions)
+
+    def with_time(self, hour, minute):
+        """Return a copy of this rule starting at a different time of day."""
+        return RecurrenceRule(self.kind, hour, minute, self.weekdays, self.dates,
+                              self.interval, self.window_end, self.exceptions)
+
+    def next_after(self, after):
+        """Return the first occurrence strictly after `after`, or None."""
+        if self.kind == 'dates':
+            start = bisect.bisect_left(self.dates, after.date())
+            fire_time = datetime.time(self.hour, self.minute)
+            for day in self.dates[start:]:
+                candidate = datetime.datetime.combine(day, fire_time)
+                if candidate > after and day not in self.exceptions:
+                    return candidate
+            return None
+
+        # Each exception can block at most one day, and an allowed weekday
+        # comes round at least once a week, so this bound always suffices.
+        day = after.date()
+        for _ in range(7 * (len(self.exceptions) + 1) + 1):
+            if ((self.weekdays is None or day.weekday() in self.weekdays)
+                    and day not in self.exceptions):
+                candidate = self._first_on(day, after)
+                if candidate is not None:
+                    return candidate
+            day += datetime.timedelta(days=1)
+        return None
+
+    def _first_on(self, day, after):
+        start = datetime.datetime.combine(day, datetime.time(self.hour, self.minute))
+        if after < start:
+            return start
+        if self.kind == 'daily':
+            return None
+        step = datetime.timedelta(minutes=self.interval)
+        candidate = start + ((after - start) // step + 1) * step
+        end = datetime.datetime.combine(day, datetime.time(*self.window_end))
+        return candidate if candidate <= end else None
+
+    def describe(self):
+        """Short human-readable summary for the alarms list."""
+        if self.kind == 'dates':
+            return f"{len(self.dates)} dates" if len(self.dates) != 1 else self.dates[0].isoformat()
+        if self.weekdays is None:
+            days = "Daily"
+        elif self.weekdays == frozenset(range(5)):
+            days = "Weekdays"
+        elif self.weekdays == frozenset((5, 6)):
+            days = "Weekends"
+        else:
+            days = ", ".join(WEEKDAY_NAMES[d] for d in sorted(self.weekdays))
+        if self.kind == 'interval':
+            end_hour, end_minute = self.window_end
+            return (f"Every {self.interval} min {self.hour:02d}:{self.minute:02d}-"
+                    f"{end_hour:02d}:{end_minute:02d}" + ("" if days == "Daily" else f" ({days})"))
+        return days
+
+    def to_dict(self):
+        return {
+            'kind': self.kind,
+            'hour': self.hour,
+            'minute': self.minute,
+            'weekdays': sorted(self.weekdays) if self.weekdays is not None else None,
+            'dates': [day.isoformat() for day in self.dates],
+            'interval': self.interval,
+            'window_end': list(self.window_end) if self.window_end else None,
+            'exceptions': sorted(day.isoformat() for day in self.exceptions),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a rule from to_dict() output. Raises ValueError."""
+        try:
+            return cls(
+                data['kind'], data['hour'], data['minute'],
+                weekdays=data.get('weekdays'),
+                dates=[datetime.date.fromisoformat(day) for day in data.get('dates') or ()],
+                interval=data.get('interval'),
+                window_end=data.get('window_end'),
+                exceptions=[datetime.date.fromisoformat(day) for day in data.get('exceptions') or ()],
+            )
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"Invalid repeat rule: {e}") from None
+
+    def _fields(self):
+        return (self.kind, self.hour, self.minute, self.weekdays, tuple(self.dates),
+                self.interval, self.window_end, self.exceptions)
+
+    def __eq__(self, other):
+        return isinstance(other, RecurrenceRule) and self._fields() == other._fields()
+
+    def __hash__(self):
+        return hash(self._fields())
+
+    def __repr__(self):
+        return f"RecurrenceRule({self.describe()!r} at {self.hour:02d}:{self.minute:02d})"
+
+# Repeat choices offered when adding an alarm from the GUI
+REPEAT_PRESETS = {
+    "Once": None,
+    "Daily": None,
+    "Weekdays": frozenset(range(5)),
+    "Weekends": frozenset((5, 6)),
+}
+
+@functools.lru_cache(maxsize=None)
+def preset_rule(name, hour, minute):
+    """
+    Return the rule for a GUI repeat preset, or None for one-shot alarms.
+    Rules are never modified, so alarms with the same preset and time of
+    day share one rule.
+    """
+    if name == "Once":
+        return None
+    return RecurrenceRule.daily(hour, minute, weekdays=REPEAT_PRESETS[name])
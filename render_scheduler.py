@@ -0,0 +1,88 @@
+import time
+from collections import Counter, deque
+
+class RenderScheduler:
+    """
+    Coalesces UI updates into one redraw per frame.
+
+    Each part of the window registers a render function. Mutations mark
+    parts dirty instead of touching widgets, and the first mark schedules a
+    flush with after_idle, so everything changed while handling an event is
+    drawn once, after the handler returns. Keyed parts (lists) are marked
+    with the keys that changed, which are merged until the flush; marking
+    without keys redraws the whole part.
+    """
+
+    def __init__(self, root, on_redraw=None):
+        self.root = root
+        self.on_redraw = on_redraw  # Called with each redraw's duration in ms
+        self._renders = {}  # Part name -> (render function, keyed)
+        self._dirty = {}  # Part name -> set of keys, or None for everything
+        self._idle_id = None
+
+        self.redraws = 0
+        self.part_renders = Counter()
+        self.peak_rate = 0
+        self._recent = deque()  # Monotonic times of the last second's redraws
+
+    def register(self, name, render, keyed=False):
+        """Register a part; parts are drawn in registration order."""
+        self._renders[name] = (render, keyed)
+
+    def mark(self, name, keys=None):
+        """Mark a part dirty, optionally only for the given keys."""
+        if name in self._dirty:
+            pending = self._dirty[name]
+            if pending is not None:
+                if keys is None:
+                    self._dirty[name] = None
+                else:
+                    pending.update(keys)
+        else:
+            self._dirty[name] = None if keys is None else set(keys)
+        if self._idle_id is None:
+            self._idle_id = self.root.after_idle(self.flush)
+
+    def flush(self):
+        """Draw every dirty part now, as one redraw."""
+        if self._idle_id is not None:
+            self.root.after_cancel(self._idle_id)
+            self._idle_id = None
+        if not self._dirty:
+            return
+
+        start = time.perf_counter()
+        # A part may mark a later part while drawing (the alarm index marks
+        # the visible window); those are drawn in the same pass
+        for name, (render, keyed) in self._renders.items():
+            if name not in self._dirty:
+                continue
+            keys = self._dirty.pop(name)
+            if keyed:
+                render(keys)
+            else:
+                render()
+            self.part_renders[name] += 1
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        self.redraws += 1
+        self.peak_rate = max(self.peak_rate, self.redraws_per_second(record=True))
+        if self.on_redraw:
+            self.on_redraw(elapsed_ms)
+
+    def redraws_per_second(self, record=False):
+        """Number of redraws in the last second."""
+        now = time.monotonic()
+        if record:
+            self._recent.append(now)
+        while self._recent and self._recent[0] <= now - 1:
+            self._recent.popleft()
+        return len(self._recent)
+
+    def stats(self):
+        return {
+            'redraws': self.redraws,
+            'redraws_per_sec': self.redraws_per_second(),
+            'peak_redraws_per_sec': self.peak_rate,
+            'parts': dict(self.part_renders),
+        }
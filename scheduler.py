@@ -0,0 +1,112 @@
+import heapq
+import itertools
+
+class AlarmScheduler:
+    """
+    Min-heap of absolute alarm fire times.
+
+    Entries are keyed by alarm ID. Rescheduling or cancelling an alarm marks
+    its old heap entry as stale instead of searching for it, so schedule,
+    cancel and pop are all O(log n) (amortized, stale entries are compacted
+    once they outnumber the live ones).
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._entries = {}
+        self._counter = itertools.count()
+        self._stale = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def schedule(self, key, fire_time):
+        """Schedule (or reschedule) the alarm with the given key."""
+        self.cancel(key)
+        entry = [fire_time, next(self._counter), key, True]
+        self._entries[key] = entry
+        heapq.heappush(self._heap, entry)
+
+    def schedule_many(self, items):
+        """
+        Schedule many (key, fire_time) pairs at once. Large batches are
+        appended and the heap rebuilt in a single O(n) pass; batches that
+        are small next to the heap are pushed one by one.
+        """
+        items = list(items)
+        if len(items) * 4 < len(self._heap):
+            for key, fire_time in items:
+                self.schedule(key, fire_time)
+            return
+        for key, fire_time in items:
+            self.cancel(key)
+            entry = [fire_time, next(self._counter), key, True]
+            self._entries[key] = entry
+            self._heap.append(entry)
+        heapq.heapify(self._heap)
+
+    def cancel(self, key):
+        """Remove the alarm with the given key, if it is scheduled."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        entry[3] = False
+        self._stale += 1
+        if self._stale > 64 and self._stale > len(self._entries):
+            self._compact()
+
+    def cancel_many(self, keys):
+        """Remove many alarms at once, compacting the heap at most once."""
+        for key in keys:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                entry[3] = False
+                self._stale += 1
+        if self._stale > 64 and self._stale > len(self._entries):
+            self._compact()
+
+    def clear(self):
+        self._heap.clear()
+        self._entries.clear()
+        self._stale = 0
+
+    def fire_time(self, key):
+        """Return the scheduled fire time for key, or None."""
+        entry = self._entries.get(key)
+        return entry[0] if entry else None
+
+    def next_deadline(self):
+        """Return the earliest scheduled fire time, or None if empty."""
+        self._drop_stale_head()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now):
+        """
+        Remove and return the keys of all alarms due at or before now,
+        earliest first. Alarms whose deadline passed while the event loop
+        was busy are included, so a late check never skips an alarm.
+        """
+        due = []
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            fire_time, _, key, valid = heapq.heappop(heap)
+            if valid:
+                del self._entries[key]
+                due.append(key)
+            else:
+                self._stale -= 1
+        return due
+
+    def _drop_stale_head(self):
+        heap = self._heap
+        while heap and not heap[0][3]:
+            heapq.heappop(heap)
+            self._stale -= 1
+
+    def _compact(self):
+        self._heap = [entry for entry in self._heap if entry[3]]
+        heapq.heapify(self._heap)
+        self._stale = 0
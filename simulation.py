@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Fast-forward simulation of the alarm engine, for soak tests.
+Runs a real AlarmClock (withdrawn window, SDL dummy audio, a scratch store)
+on a VirtualClock and replays --days of simulated time as fast as the engine
+allows. Every time an alarm rings, a simulated user snoozes it (with
+probability --snooze, for 1 to 15 minutes) or stops it, up to two minutes
+later. The simulation works out independently, with the tz database, when
+each alarm should ring next and reports every alarm that rang late, early,
+unexpectedly or not at all, with the throughput in simulated events per
+second. Tk needs a display; use xvfb-run on servers.
+"""
+
+import argparse
+import datetime
+import os
+import random
+import sys
+import tempfile
+import time
+import zoneinfo
+
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from alarm_clock import AlarmClock
+from alarm_store import AlarmStore
+from clock import VirtualClock
+from recurrence import REPEAT_PRESETS
+
+# Simulated time advances in chunks of this length; in between, the Tk loop
+# is run so pending redraws and alarm notifications are processed
+PUMP_INTERVAL_SECONDS = 3600
+
+# How late after its scheduled time an alarm may ring and still be on time
+FIRE_TOLERANCE_SECONDS = 1.0
+
+# Time zones the simulated alarms are spread over; "" is the system zone
+ZONES = ("", "Europe/Berlin", "America/New_York", "Asia/Tokyo", "Australia/Sydney")
+
+# A simulated user reacts to a ringing alarm within this many seconds
+MAX_REACTION_SECONDS = 120
+
+def wall_to_timestamp(wall, zone):
+    """UTC timestamp of a wall-clock time in zone, straight from the tz database."""
+    if not zone:
+        return wall.timestamp()
+    return wall.replace(tzinfo=zoneinfo.ZoneInfo(zone)).timestamp()
+
+def timestamp_to_wall(timestamp, zone):
+    """Wall-clock time in zone at a UTC timestamp, straight from the tz database."""
+    if not zone:
+        return datetime.datetime.fromtimestamp(timestamp)
+    return datetime.datetime.fromtimestamp(timestamp, zoneinfo.ZoneInfo(zone)).replace(tzinfo=None)
+
+class Simulation:
+    """
+    An AlarmClock on a VirtualClock, with simulated users and a check of
+    every fire against when the simulation expects each alarm to ring.
+    """
+
+    def __init__(self, root, store_path, alarms=1000, snooze_probability=0.3, seed=0):
+        self.root = root
+        self.random = random.Random(seed)
+        self.snooze_probability = snooze_probability
+        self.clock = VirtualClock()
+        self.app = AlarmClock(root, store=AlarmStore(store_path), clock=self.clock)
+        self.app.fire_listeners.append(self._on_fire)
+
+        self.expected = {}  # Alarm ID -> timestamp it should ring at next
+        self.fires = 0
+        self.snoozes = 0
+        self.stops = 0
+        self.errors = []
+
+        specs = [{'time': f"{self.random.randrange(24):02d}:{self.random.randrange(60):02d}",
+                  'repeat': self.random.choice(list(REPEAT_PRESETS)),
+                  'timezone': self.random.choice(ZONES)}
+                 for _ in range(alarms)]
+        added, errors = self.app.add_alarms(specs)
+        self.errors.extend(f"spec {index} rejected: {message}" for index, message in errors)
+        for alarm, spec in zip(added, specs):
+            ring_at = wall_to_timestamp(alarm.time, alarm.timezone)
+            if alarm.time.strftime('%H:%M') != spec['time'] or \
+                    not 0 < ring_at - self.clock.time() <= 8 * 86400:
+                self.errors.append(f"alarm {alarm.id} for {spec} set to {alarm.time}")
+            self.expected[alarm.id] = ring_at
+
+    def _on_fire(self, event):
+        """Fire listener: check the fire, then have the user react to it."""
+        alarm_id = event['id']
+        now = self.clock.time()
+        self.fires += 1
+        expected = self.expected.pop(alarm_id, None)
+        if expected is None:
+            self.errors.append(f"alarm {alarm_id} rang unexpectedly at {now}")
+        elif not expected - 0.001 <= now <= expected + FIRE_TOLERANCE_SECONDS:
+            self.errors.append(f"alarm {alarm_id} rang at {now}, expected {expected}")
+        # Reacting from inside trigger_alarm would re-enter it
+        delay_ms = self.random.randint(0, MAX_REACTION_SECONDS * 1000)
+        self.clock.after(self.root, delay_ms, self._react, alarm_id)
+
+    def _react(self, alarm_id):
+        """Snooze or stop a ringing alarm, and expect its next ring."""
+        alarm = self.app.alarms.get(alarm_id)
+        if alarm is None or alarm_id not in self.app.ringing_alarms:
+            return
+        now = self.clock.time()
+        if self.random.random() < self.snooze_probability:
+            minutes = self.random.randint(1, 15)
+            self.app.snooze_alarms([alarm_id], minutes)
+            self.snoozes += 1
+            self.expected[alarm_id] = now + minutes * 60
+            return
+
+        # The next occurrence later on the wall clock, skipping any whose
+        # instant has passed: when clocks fall back, wall times repeat
+        rule = alarm.recurrence
+        next_time = rule.next_after(max(timestamp_to_wall(now, alarm.timezone), alarm.time)) \
+            if rule else None
+        while next_time is not None and wall_to_timestamp(next_time, alarm.timezone) <= now:
+            next_time = rule.next_after(next_time)
+        self.app.stop_alarm(alarm)
+        self.stops += 1
+        if next_time is None:
+            if alarm_id in self.app.alarms:
+                self.errors.append(f"one-shot alarm {alarm_id} kept after stopping")
+        elif alarm.time != next_time:
+            self.errors.append(f"alarm {alarm_id} moved to {alarm.time}, expected {next_time}")
+        else:
+            self.expected[alarm_id] = wall_to_timestamp(next_time, alarm.timezone)
+
+    def run(self, seconds):
+        """
+        Simulate seconds of time. Returns a summary dict; 'errors' lists
+        every wrong fire and 'missed' every alarm that should have rung.
+        """
+        end = self.clock.time() + seconds
+        timers = self.clock.timers_run
+        started = time.perf_counter()
+        while self.clock.time() < end:
+            self.clock.advance_to(min(end, self.clock.time() + PUMP_INTERVAL_SECONDS))
+            self.root.update()
+        elapsed = time.perf_counter() - started
+
+        missed = sorted(alarm_id for alarm_id, ring_at in self.expected.items()
+                        if ring_at < end - FIRE_TOLERANCE_SECONDS)
+        events = self.fires + self.snoozes + self.stops
+        return {
+            'simulated_seconds': seconds,
+            'elapsed': elapsed,
+            'fires': self.fires,
+            'snoozes': self.snoozes,
+            'stops': self.stops,
+            'timers': self.clock.timers_run - timers,
+            'events_per_second': events / elapsed if elapsed else 0,
+            'errors': self.errors,
+            'missed': missed,
+        }
+
+    def close(self):
+        self.app.close_audio()
+        self.app.store.close()
+        self.app.sound_cache.shutdown()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--days", type=float, default=1)
+    parser.add_argument("--alarms", type=int, default=1000)
+    parser.add_argument("--snooze", type=float, default=0.3,
+                        help="probability that a ringing alarm is snoozed rather than stopped")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    import tkinter as tk
+    from tkinter import messagebox
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        sys.exit(f"Tk needs a display, run under xvfb-run: {e}")
+    root.withdraw()
+    # Nobody is there to dismiss the alarm dialogs
+    messagebox.showinfo = lambda title, message, **options: None
+
+    with tempfile.TemporaryDirectory() as tmp:
+        simulation = Simulation(root, os.path.join(tmp, "alarms.db"), args.alarms,
+                                args.snooze, args.seed)
+        try:
+            result = simulation.run(args.days * 86400)
+        finally:
+            simulation.close()
+            root.destroy()
+
+    print(f"Simulated {args.days:g} days with {args.alarms} alarms in {result['elapsed']:.1f} s "
+          f"({result['simulated_seconds'] / result['elapsed']:.0f}x real time)")
+    print(f"  {result['fires']} rang, {result['snoozes']} snoozed, {result['stops']} stopped: "
+          f"{result['events_per_second']:.0f} alarm events/s; {result['timers']} timer callbacks "
+          f"({result['timers'] / result['elapsed']:.0f}/s)")
+    for error in result['errors'][:20]:
+        print(f"  ✗ {error}")
+    if result['missed']:
+        print(f"  ✗ {len(result['missed'])} alarms never rang, e.g. {result['missed'][:10]}")
+    if result['errors'] or result['missed']:
+        sys.exit(1)
+    print("  ✓ Every alarm rang on time")
+
+if __name__ == "__main__":
+    main()
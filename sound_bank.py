@@ -0,0 +1,219 @@
+import functools
+import mmap
+import os
+import struct
+import threading
+
+# Rendered tones and transcoded custom sounds are packed into one file of
+# raw 16-bit PCM in the mixer's format:
+#   header:  magic, format version
+#   records: per entry its 16-byte key, data length, sample rate and
+#            channel count, then its samples, in the order they were added
+# The index is rebuilt by walking the records when the file is mapped. The
+# file is memory-mapped read-only, so every running instance shares the
+# same page-cache pages, and Sounds are built straight from the mapping.
+SOUND_BANK_FILE = "sounds.bank"
+SOUND_BANK_PATH = os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser("~"), ".cache"),
+    "alarm_clock", "sounds", SOUND_BANK_FILE)
+
+SOUND_BANK_MAGIC = b"ALSB"
+SOUND_BANK_VERSION = 2
+HEADER = struct.Struct("<4sI")
+ENTRY = struct.Struct("<16sQIH2x")
+
+# Once the bank outgrows this, the oldest entries are dropped when adding
+DEFAULT_SOUND_BANK_BYTES = 256 * 1024 * 1024
+
+class SoundBank:
+    """
+    Persistent, memory-mapped store of PCM sounds keyed by content hash.
+
+    Keys are the 32-digit hex digests used by the tone and transcode caches.
+    Adding a sound appends one record to the file, in a single write, so
+    entries already mapped never move. Only when the file would outgrow
+    max_bytes is it rewritten beside the old one, keeping the newest
+    entries, and renamed into place, so instances that still map the old
+    file keep a consistent view. A lookup that misses checks whether
+    another instance changed the file and remaps it. A record being
+    appended by another instance is skipped until it is complete. An entry
+    added while another instance rewrites the file may be lost, and is
+    simply added again the next time it misses.
+    """
+
+    def __init__(self, path=SOUND_BANK_PATH, max_bytes=DEFAULT_SOUND_BANK_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._map = None
+        self._stat = None
+        self._end = 0  # Offset just past the last complete record
+        self._index = {}  # key -> (offset, length, sample rate, channels)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._remap()
+
+    def __contains__(self, key):
+        return self._lookup(key) is not None
+
+    def __len__(self):
+        return len(self._index)
+
+    def _file_stat(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+    def _remap(self):
+        """Map the file on disk afresh; a missing or damaged file maps as empty."""
+        self._stat = self._file_stat()
+        self._map = None
+        self._end = 0
+        self._index = {}
+        if self._stat is None:
+            return
+        try:
+            with open(self.path, 'rb') as f:
+                mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version = HEADER.unpack_from(mapping, 0)
+            if magic != SOUND_BANK_MAGIC or version != SOUND_BANK_VERSION:
+                raise ValueError("not a sound bank")
+            index = {}
+            end = HEADER.size
+            while end + ENTRY.size <= len(mapping):
+                key, length, sample_rate, channels = ENTRY.unpack_from(mapping, end)
+                offset = end + ENTRY.size
+                if offset + length > len(mapping):
+                    # Still being written, or cut short by a crash
+                    break
+                # A key added again moves to the end, as the newest entry
+                index.pop(key.hex(), None)
+                index[key.hex()] = (offset, length, sample_rate, channels)
+                end = offset + length
+        except (OSError, ValueError, struct.error) as e:
+            print(f"Error reading sound bank {self.path}: {e}")
+            return
+        self._map = mapping
+        self._end = end
+        self._index = index
+
+    def _lookup(self, key):
+        """Return (mapping, index entry) for key, remapping once on a miss."""
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is None and self._file_stat() != self._stat:
+                self._remap()
+                entry = self._index.get(key)
+            return None if entry is None else (self._map, entry)
+
+    def get(self, key, sample_rate, channels):
+        """
+        Return a read-only memoryview of key's samples in the mapped file,
+        or None if the bank has no such sound in that format.
+        """
+        found = self._lookup(key)
+        if found is None:
+            return None
+        mapping, (offset, length, entry_rate, entry_channels) = found
+        if (entry_rate, entry_channels) != (sample_rate, channels):
+            return None
+        return memoryview(mapping)[offset:offset + length]
+
+    def sound(self, key):
+        """
+        Return key's sound as a pygame Sound for the current mixer format,
+        or None if it is not in the bank. The mixer is handed the mapped
+        samples directly; pygame copies them once, into its own buffer.
+        """
+        import pygame
+        mixer_format = pygame.mixer.get_init()
+        if mixer_format is None:
+            return None
+        samples = self.get(key, mixer_format[0], mixer_format[2])
+        if samples is None:
+            return None
+        with samples:
+            return pygame.mixer.Sound(buffer=samples)
+
+    def add(self, key, samples, sample_rate, channels):
+        """
+        Add 16-bit interleaved samples (any bytes-like object) under key.
+        Returns False if the bank file could not be written.
+        """
+        data = memoryview(samples).cast('B')
+        with self._lock:
+            # Start from the file on disk, which may hold other instances' sounds
+            if self._file_stat() != self._stat:
+                self._remap()
+            size = len(self._map) if self._map is not None else 0
+            try:
+                # A missing, damaged or partly written file is started afresh
+                if (self._map is None or self._end != size
+                        or size + ENTRY.size + len(data) > self.max_bytes):
+                    self._rewrite(key, data, sample_rate, channels)
+                else:
+                    self._append(key, data, sample_rate, channels)
+            except OSError as e:
+                print(f"Error writing sound bank {self.path}: {e}")
+                return False
+            # The old mapping stays valid for views still using it
+            self._remap()
+            return True
+
+    def _append(self, key, data, sample_rate, channels):
+        record = memoryview(ENTRY.pack(bytes.fromhex(key), len(data), sample_rate, channels)
+                            + data)
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | getattr(os, 'O_BINARY', 0))
+        try:
+            written = 0
+            while written < len(record):
+                written += os.write(fd, record[written:])
+        finally:
+            os.close(fd)
+
+    def _rewrite(self, key, data, sample_rate, channels):
+        """Write a new file with key and the newest entries that fit max_bytes."""
+        total = len(data)
+        kept = []
+        for k, entry in reversed([(k, v) for k, v in self._index.items() if k != key]):
+            if total + entry[1] > self.max_bytes:
+                break
+            total += entry[1]
+            kept.append((k, entry))
+        kept.reverse()
+
+        temp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(temp_path, 'wb') as f:
+                f.write(HEADER.pack(SOUND_BANK_MAGIC, SOUND_BANK_VERSION))
+                for k, (offset, length, entry_rate, entry_channels) in kept:
+                    f.write(ENTRY.pack(bytes.fromhex(k), length, entry_rate, entry_channels))
+                    with memoryview(self._map)[offset:offset + length] as view:
+                        f.write(view)
+                f.write(ENTRY.pack(bytes.fromhex(key), len(data), sample_rate, channels))
+                f.write(data)
+            os.replace(temp_path, self.path)
+        except OSError:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+
+    def size(self):
+        """Size of the mapped bank file in bytes."""
+        with self._lock:
+            return len(self._map) if self._map is not None else 0
+
+def open_bank(path=None):
+    """
+    Return the process-wide SoundBank for path, SOUND_BANK_PATH by default,
+    opening it on first use. Paths naming the same file share one bank.
+    """
+    return _open_bank(os.path.realpath(path or SOUND_BANK_PATH))
+
+@functools.lru_cache(maxsize=None)
+def _open_bank(path):
+    return SoundBank(path)
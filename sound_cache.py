@@ -0,0 +1,178 @@
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from sound_bank import SOUND_BANK_FILE, open_bank
+from transcoder import (TRANSCODE_CACHE_DIR, init_worker, load_transcoded, transcode,
+                        transcode_key)
+
+# Default memory budget for decoded custom sounds
+DEFAULT_SOUND_CACHE_BYTES = 64 * 1024 * 1024
+
+class SoundCache:
+    """
+    LRU cache of decoded custom alarm sounds.
+
+    Files are decoded on a small worker pool as soon as an alarm that uses
+    them is added, edited or loaded, so the samples are ready when the
+    alarm fires. Decoding itself is done by transcoder in a separate
+    process, which converts the file to the mixer's format at a common
+    loudness. The result is packed into the sound bank in cache_dir, so
+    files seen before, by this or any other instance, are never decoded
+    again. Entries hold views of the samples in the mapped bank, which
+    cost no memory of their own beyond shared page cache, and a pygame
+    Sound is only built, as a private copy, when one is played. Entries
+    are keyed by absolute path and modification time, which lets alarms
+    that share a file share one entry. The least recently used are
+    evicted once their samples exceed max_bytes.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_SOUND_CACHE_BYTES, workers=2,
+                 cache_dir=TRANSCODE_CACHE_DIR):
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        self.bank = open_bank(os.path.join(cache_dir, SOUND_BANK_FILE))
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._samples = OrderedDict()  # key -> (samples, size in bytes)
+        self._pending = {}  # key -> Future of an in-flight decode
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers,
+                                            thread_name_prefix="sound-preload")
+        self._transcoder = None  # Process pool, started by the first decode
+        self._workers = workers
+
+    @staticmethod
+    def _key(path):
+        path = os.path.abspath(path)
+        return (path, os.stat(path).st_mtime_ns)
+
+    def preload(self, path):
+        """
+        Start decoding path in the background unless it is already cached
+        or being decoded. Returns the pending Future, or None.
+        """
+        try:
+            key = self._key(path)
+        except OSError:
+            return None
+        with self._lock:
+            if key in self._samples:
+                return None
+            future = self._pending.get(key)
+            if future is None:
+                future = self._executor.submit(self._decode, key)
+                self._pending[key] = future
+            return future
+
+    def get(self, path, wait=True):
+        """
+        Return a new pygame Sound for path, built from its decoded samples,
+        or None if it cannot be decoded. Waits for an in-flight preload
+        rather than decoding twice. With wait=False a miss only starts the
+        decode and returns None at once, so the Sound is there next time.
+        """
+        import pygame
+        try:
+            key = self._key(path)
+        except OSError:
+            return None
+        with self._lock:
+            entry = self._samples.get(key)
+            if entry is not None:
+                self._samples.move_to_end(key)
+                self.hits += 1
+                samples = entry[0]
+            else:
+                self.misses += 1
+                future = self._pending.get(key)
+                if future is None:
+                    future = self._executor.submit(self._decode, key)
+                    self._pending[key] = future
+        if entry is None:
+            if not wait:
+                return None
+            samples = future.result()
+            if samples is None:
+                return None
+        return pygame.mixer.Sound(buffer=samples)
+
+    def _transcoder_pool(self):
+        with self._lock:
+            if self._transcoder is None:
+                # spawn, not fork: this process has Tk and mixer threads
+                self._transcoder = ProcessPoolExecutor(
+                    max_workers=self._workers, mp_context=multiprocessing.get_context("spawn"),
+                    initializer=init_worker)
+            return self._transcoder
+
+    def _transcode(self, path, sample_rate, channels):
+        pool = self._transcoder_pool()
+        try:
+            return pool.submit(transcode, path, sample_rate, channels, self.cache_dir).result()
+        except BrokenProcessPool:
+            # A worker died (e.g. a decoder crashed); start a fresh pool next time
+            with self._lock:
+                if self._transcoder is pool:
+                    self._transcoder = None
+            raise
+
+    def _decode(self, key):
+        import pygame
+        try:
+            sample_rate, _, channels = pygame.mixer.get_init()
+            # Files transcoded before skip the worker process entirely
+            bank_key = transcode_key(key[0], sample_rate, channels)
+            samples = self.bank.get(bank_key, sample_rate, channels)
+            if samples is None:
+                cache_path = self._transcode(key[0], sample_rate, channels)
+                samples = load_transcoded(cache_path)
+                # Once banked, the transcoder's copy is no longer needed, and
+                # the samples are read from the mapping rather than kept
+                if self.bank.add(bank_key, samples, sample_rate, channels):
+                    os.unlink(cache_path)
+                    samples = self.bank.get(bank_key, sample_rate, channels) or samples
+        except Exception as e:
+            print(f"Error decoding sound {key[0]}: {e}")
+            samples = None
+
+        with self._lock:
+            self._pending.pop(key, None)
+            if samples is not None:
+                size = len(samples)
+                self._samples[key] = (samples, size)
+                self.current_bytes += size
+                self._evict()
+        return samples
+
+    def _evict(self):
+        # Always keep the most recent entry, even if it alone exceeds the budget
+        while self.current_bytes > self.max_bytes and len(self._samples) > 1:
+            _, (_, size) = self._samples.popitem(last=False)
+            self.current_bytes -= size
+            self.evictions += 1
+
+    def stats(self):
+        """Return the cache counters as a dict."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._samples),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+            }
+
+    def shutdown(self):
+        """Stop the worker pools, abandoning queued decodes."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        with self._lock:
+            if self._transcoder is not None:
+                self._transcoder.shutdown(wait=False, cancel_futures=True)
+                self._transcoder = None
@@ -1,80 +1,173 @@
-import pygame
-import numpy as np
-import os
-import tempfile
+import hashlib
+import json
 
-def generate_default_alarm_sound():
+from sound_bank import open_bank
+
+# pygame and NumPy are imported inside the functions that use them, so the
+# pattern table can be read at startup without loading either library.
+
+# Built-in tone patterns. A pattern is a list of segments rendered back to
+# back, optionally repeated. Segment types:
+#   tone:    'frequencies' (one for a beep, several for a chord), 'duration'
+#   chirp:   linear sweep from 'start' to 'end' Hz over 'duration'
+#   silence: 'duration'
+# tone and chirp segments accept an 'envelope' dict of ADSR parameters.
+TONE_PATTERNS = {
+    "Default": {
+        'segments': [{'type': 'tone', 'frequencies': [800], 'duration': 0.5}],
+    },
+    "Beeps": {
+        'segments': [
+            {'type': 'tone', 'frequencies': [1000], 'duration': 0.12,
+             'envelope': {'attack': 0.005, 'decay': 0.02, 'sustain': 0.8, 'release': 0.02}},
+            {'type': 'silence', 'duration': 0.08},
+        ],
+        'repeat': 4,
+        'gap': 0.6,
+    },
+    "Chirp": {
+        'segments': [
+            {'type': 'chirp', 'start': 600, 'end': 1400, 'duration': 0.4,
+             'envelope': {'attack': 0.01, 'decay': 0.05, 'sustain': 0.9, 'release': 0.05}},
+            {'type': 'silence', 'duration': 0.2},
+        ],
+    },
+    "Chord": {
+        'segments': [
+            {'type': 'tone', 'frequencies': [523.25, 659.25, 783.99], 'duration': 1.0,
+             'envelope': {'attack': 0.05, 'decay': 0.2, 'sustain': 0.6, 'release': 0.3}},
+            {'type': 'silence', 'duration': 0.3},
+        ],
+    },
+}
+
+# In-memory cache of ready-to-play pygame Sounds, keyed like the sound bank
+_loaded_sounds = {}
+
+def adsr_envelope(n, sample_rate, attack=0.0, decay=0.0, sustain=1.0, release=0.0):
     """
-    Generate a simple beeping alarm sound using pygame.
-    Returns the path to the generated sound file.
+    Return an n-sample attack/decay/sustain/release gain curve.
+    Stage lengths are in seconds and are clipped to fit inside n samples.
     """
-    try:
-        # Initialize pygame mixer
-        pygame.mixer.init(frequency=44100, size=-16, channels=1, buffer=512)
-        
-        # Generate a simple beeping sound
-        sample_rate = 44100
-        duration = 0.5  # 0.5 seconds per beep
-        frequency = 800  # 800 Hz tone
-        
-        # Generate sine wave
-        t = np.linspace(0, duration, int(sample_rate * duration), False)
-        tone = np.sin(2 * np.pi * frequency * t)
+    import numpy as np
+    
+    a = min(int(attack * sample_rate), n)
+    d = min(int(decay * sample_rate), n - a)
+    r = min(int(release * sample_rate), n - a - d)
+    breakpoints = [0, a, a + d, n - r, n]
+    gains = [0.0, 1.0, sustain, sustain, 0.0]
+    return np.interp(np.arange(n, dtype=np.float32), breakpoints, gains).astype(np.float32)
+
+def _render_segment(segment, out, sample_rate):
+    """Render one segment into the float32 slice out."""
+    import numpy as np
+    
+    n = len(out)
+    kind = segment['type']
+    if kind == 'silence' or n == 0:
+        return
         
-        # Convert to 16-bit integer
-        tone = (tone * 32767).astype(np.int16)
+    t = np.arange(n, dtype=np.float64) / sample_rate
+    if kind == 'tone':
+        freqs = np.asarray(segment['frequencies'], dtype=np.float64)
+        # One row per frequency, mixed down with equal weight
+        np.sin(2 * np.pi * freqs[:, None] * t).mean(axis=0, out=out)
+    elif kind == 'chirp':
+        f0, f1 = segment['start'], segment['end']
+        phase = 2 * np.pi * (f0 * t + (f1 - f0) * t * t / (2 * segment['duration']))
+        np.sin(phase, out=out)
+    else:
+        raise ValueError(f"Unknown segment type: {kind}")
         
-        # Create temporary file
-        temp_file = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
-        temp_path = temp_file.name
-        temp_file.close()
+    envelope = segment.get('envelope')
+    if envelope:
+        out *= adsr_envelope(n, sample_rate, **envelope)
+
+def render_pattern(pattern, sample_rate, duration=None, volume=1.0):
+    """
+    Render a tone pattern to mono 16-bit samples.
+    
+    Each segment is written into one preallocated buffer with whole-array
+    NumPy operations; repeats and looping up to duration seconds are done
+    with np.tile/np.resize rather than re-rendering.
+    """
+    import numpy as np
+    
+    lengths = [int(seg['duration'] * sample_rate) for seg in pattern['segments']]
+    cycle = np.zeros(sum(lengths), dtype=np.float32)
+    offset = 0
+    for segment, length in zip(pattern['segments'], lengths):
+        _render_segment(segment, cycle[offset:offset + length], sample_rate)
+        offset += length
         
-        # Save as WAV file using scipy
-        try:
-            import scipy.io.wavfile as wavfile
-            wavfile.write(temp_path, sample_rate, tone)
-        except ImportError:
-            # Fallback: create a simple beep using pygame
-            import wave
-            import struct
-            
-            with wave.open(temp_path, 'w') as wav_file:
-                wav_file.setnchannels(1)
-                wav_file.setsampwidth(2)
-                wav_file.setframerate(sample_rate)
-                wav_file.writeframes(tone.tobytes())
+    repeat = pattern.get('repeat', 1)
+    gap = int(pattern.get('gap', 0) * sample_rate)
+    if repeat > 1 or gap:
+        cycle = np.concatenate((np.tile(cycle, repeat), np.zeros(gap, dtype=np.float32)))
         
-        return temp_path
+    if duration is not None:
+        cycle = np.resize(cycle, int(duration * sample_rate))
         
-    except Exception as e:
-        print(f"Error generating default sound: {e}")
-        return None
+    cycle *= 32767 * volume
+    return cycle.astype(np.int16)
 
-def cleanup_temp_sound(sound_path):
+def tone_cache_key(params):
     """
-    Clean up temporary sound file.
+    Return a content address for a tone from its synthesis parameters.
     """
-    try:
-        if sound_path and os.path.exists(sound_path):
-            os.unlink(sound_path)
-    except Exception as e:
-        print(f"Error cleaning up sound file: {e}")
+    encoded = json.dumps(params, sort_keys=True).encode()
+    return hashlib.sha256(encoded).hexdigest()[:32]
 
-if __name__ == "__main__":
-    # Test sound generation
-    sound_path = generate_default_alarm_sound()
-    if sound_path:
-        print(f"Generated sound file: {sound_path}")
-        
-        # Play the sound
-        pygame.mixer.music.load(sound_path)
-        pygame.mixer.music.play()
-        
-        # Wait for playback to finish
-        pygame.time.wait(2000)
+def mixer_frames(samples, channels):
+    """
+    Return mono 16-bit samples as frames for a mixer with the given
+    channel count: as-is for mono, broadcast into one frame array otherwise.
+    """
+    import numpy as np
+    
+    if channels == 1:
+        return samples
+    frames = np.empty((len(samples), channels), dtype=np.int16)
+    frames[:] = samples[:, None]
+    return frames
+
+def load_pattern_sound(name):
+    """
+    Return the named tone pattern as a pygame Sound.
+    Each pattern is rendered once per mixer format, kept in memory, and
+    stored in the sound bank so later sessions (and other instances) build
+    it straight from the mapped bank without synthesis or NumPy.
+    Returns None if the mixer is not initialized.
+    """
+    import pygame
+    
+    mixer_format = pygame.mixer.get_init()
+    if mixer_format is None:
+        return None
         
-        # Clean up
-        cleanup_temp_sound(sound_path)
-        print("Sound test completed.")
-    else:
-        print("Failed to generate sound.") 
\ No newline at end of file
+    sample_rate, _, channels = mixer_format
+    pattern = TONE_PATTERNS[name]
+    key = tone_cache_key({'pattern': pattern, 'sample_rate': sample_rate, 'channels': channels})
+    sound = _loaded_sounds.get(key)
+    if sound is None:
+        bank = open_bank()
+        sound = bank.sound(key)
+        if sound is None:
+            frames = mixer_frames(render_pattern(pattern, sample_rate), channels)
+            bank.add(key, frames, sample_rate, channels)
+            sound = pygame.mixer.Sound(buffer=frames)
+        _loaded_sounds[key] = sound
+    return sound
+
+if __name__ == "__main__":
+    import pygame
+    
+    # Play each tone pattern in turn
+    pygame.mixer.init()
+    for name in TONE_PATTERNS:
+        sound = load_pattern_sound(name)
+        print(f"Playing {name} ({sound.get_length():.2f} s)")
+        sound.play()
+        pygame.time.wait(int(sound.get_length() * 1000) + 500)
+    pygame.mixer.quit()
+    print("Sound test completed.")
@@ -0,0 +1,345 @@
+import datetime
+import zoneinfo
+
+import pytest
+
+from alarm_model import fire_timestamp
+from alarm_store import AlarmStore
+
+def add(app, *times, **spec):
+    alarms, errors = app.add_alarms([dict(spec, time=t) for t in times])
+    assert not errors
+    app.render.flush()
+    return alarms
+
+def shown_rows(app):
+    tree = app.alarms_tree
+    return [tuple(tree.item(iid, 'values')) for iid in tree.get_children()]
+
+def test_add_alarms_validates_stores_and_schedules(app, tmp_path):
+    alarms, errors = app.add_alarms([{'time': "07:30"}, {'time': "25:00"}])
+    app.render.flush()
+
+    assert [index for index, _ in errors] == [1]
+    assert len(alarms) == 1 and alarms[0].id in app.scheduler
+    assert shown_rows(app) == [("07:30", "Default", "Once", "Active", "")]
+    assert app.list_count_var.get() == "1 alarms"
+    assert [a.id for a in app.store.load_all()] == [alarms[0].id]
+
+def test_remove_alarms_updates_store_scheduler_and_list(app):
+    alarms = add(app, "06:00", "07:00", "08:00")
+    removed = app.remove_alarms([alarms[0].id, alarms[2].id, 999])
+
+    app.render.flush()
+    assert [a.id for a in removed] == [alarms[0].id, alarms[2].id]
+    assert list(app.alarms) == [alarms[1].id]
+    assert len(app.scheduler) == 1
+    assert [row[0] for row in shown_rows(app)] == ["07:00"]
+    assert len(app.store.load_all()) == 1
+
+def test_due_alarm_fires_and_stop_removes_one_shot(app, tk_root):
+    alarm = add(app, "07:00")[0]
+    alarm.time = datetime.datetime.now() - datetime.timedelta(seconds=1)
+    app.schedule_alarm(alarm)
+    app.check_alarms()
+    # Runs the (patched) alarm dialog, which enables the controls
+    tk_root.update()
+    app.render.flush()
+
+    assert alarm.id in app.ringing_alarms and alarm.status == 'Ringing'
+    assert str(app.stop_btn['state']) == "normal"
+    assert app.dialogs == [("showinfo", "Alarm!")]
+    assert shown_rows(app)[0][3] == "Ringing"
+
+    app.stop_alarm()
+    app.render.flush()
+    assert not app.ringing_alarms and alarm.id not in app.alarms
+    assert str(app.stop_btn['state']) == "disabled"
+    assert app.store.load_all() == []
+
+def test_stop_moves_repeating_alarm_to_next_occurrence(app):
+    alarm = add(app, "07:00", repeat="Daily")[0]
+    first = alarm.time
+    app.trigger_alarm(alarm)
+    app.stop_alarm()
+
+    assert alarm.status == 'Active' and alarm.id in app.alarms
+    assert alarm.time == first + datetime.timedelta(days=1)
+    assert app.scheduler.fire_time(alarm.id) == fire_timestamp(alarm)
+
+def test_snooze_silences_and_reschedules(app):
+    alarm = add(app, "07:00")[0]
+    app.trigger_alarm(alarm)
+    before = datetime.datetime.now()
+    app.snooze_alarms([alarm.id], 5)
+
+    assert not app.ringing_alarms and alarm.status == 'Active'
+    assert before + datetime.timedelta(minutes=5) <= alarm.time
+    assert app.scheduler.fire_time(alarm.id) == fire_timestamp(alarm)
+
+def test_failed_snooze_leaves_alarm_ringing(app):
+    alarm = add(app, "07:00")[0]
+    app.trigger_alarm(alarm)
+    with pytest.raises(OverflowError):
+        app.snooze_alarms([alarm.id], float('inf'))
+    assert alarm.id in app.ringing_alarms and alarm.status == 'Ringing'
+
+def test_trigger_plays_on_audio_worker(app, pump):
+    assert pump(app.audio_ready.is_set)
+    alarm = add(app, "07:00")[0]
+    app.trigger_alarm(alarm)
+
+    assert pump(lambda: app.audio.playback.is_playing(alarm.id))
+    app.stop_alarm()
+    assert pump(lambda: not app.audio.playback.is_playing(alarm.id))
+    assert app.metrics.summary()['audio_command']['count'] >= 2
+
+def test_list_shows_only_visible_window(app):
+    app.add_alarms([{'time': "%02d:%02d" % divmod(i % 1440, 60)} for i in range(1000)])
+    app.render.flush()
+
+    by_time = sorted(app.alarms.values(), key=lambda alarm: alarm.time)
+    assert len(app.alarms_tree.get_children()) == app._list_rows
+    assert shown_rows(app)[0][0] == by_time[0].time.strftime('%H:%M')
+
+    # Sorting by the current column reverses it
+    app.sort_alarms_by("Time")
+    app.render.flush()
+    assert shown_rows(app)[0][0] == by_time[-1].time.strftime('%H:%M')
+
+def test_filter_by_time_range(app):
+    add(app, "06:00", "07:15", "08:30", "23:30")
+    app.filter_from_var.set("07:00")
+    app.filter_to_var.set("08:59")
+    app.apply_alarm_filter()
+    app.render.flush()
+
+    assert [row[0] for row in shown_rows(app)] == ["07:15", "08:30"]
+    assert app.list_count_var.get() == "2 of 4 alarms"
+
+def test_zoned_alarm_scheduled_at_zone_time(app):
+    alarm = add(app, "07:00", timezone="Asia/Tokyo")[0]
+    tokyo = zoneinfo.ZoneInfo("Asia/Tokyo")
+
+    assert alarm.time > datetime.datetime.now(tokyo).replace(tzinfo=None)
+    assert app.scheduler.fire_time(alarm.id) == alarm.time.replace(tzinfo=tokyo).timestamp()
+    assert shown_rows(app)[0][0] == "07:00 JST"
+
+def test_alarms_restored_by_next_session(app, tmp_path):
+    alarm = add(app, "07:00", repeat="Weekdays")[0]
+
+    store = AlarmStore(str(tmp_path / "alarms.db"))
+    restored = store.load_all()
+    store.close()
+    assert [(a.id, a.time, a.recurrence.describe()) for a in restored] == \
+        [(alarm.id, alarm.time, alarm.recurrence.describe())]
+
+def test_import_export_round_trip(app, tmp_path):
+    alarms = add(app, "06:00", "07:00", repeat="Weekends")
+    app.disable_alarms([alarms[1].id])
+    path = str(tmp_path / "alarms.csv")
+    assert app.export_alarms(path) == 2
+
+    app.remove_alarms(list(app.alarms))
+    count, rejected, errors = app.import_alarms(path)
+    app.render.flush()
+    assert (count, rejected, errors) == (2, 0, [])
+    assert sorted(row[:4] for row in shown_rows(app)) == [
+        ("06:00", "Default", "Weekends", "Active"), ("07:00", "Default", "Weekends", "Disabled")]
+    # Disabled alarms come back disabled, and are not scheduled
+    assert len(app.scheduler) == 1
+
+def test_group_bulk_operations_touch_members_only(app, monkeypatch):
+    from tkinter import messagebox
+    monkeypatch.setattr(messagebox, "askyesno", lambda title, message, **kw: True)
+    work = add(app, "06:00", "06:30", "07:00", group="work")
+    other = add(app, "08:00")[0]
+    app.trigger_alarm(work[0])
+
+    disabled = app.disable_alarms(app.groups.members("work"))
+    app.render.flush()
+    assert sorted(a.id for a in disabled) == [a.id for a in work]
+    assert not app.ringing_alarms and len(app.scheduler) == 1 and other.id in app.scheduler
+    assert sorted(row[3] for row in shown_rows(app)) == ["Active", "Disabled", "Disabled", "Disabled"]
+    assert {a.status for a in app.store.load_all() if a.group == "work"} == {'Disabled'}
+
+    # Disabled alarms are not snoozed; enabling moves past times forward
+    assert app.snooze_alarms(app.groups.members("work"), 5) == []
+    work[0].time -= datetime.timedelta(days=2)
+    enabled = app.enable_alarms(app.groups.members("work"))
+    assert len(enabled) == 3 and all(a.id in app.scheduler for a in work)
+    assert work[0].time > datetime.datetime.now()
+
+    app.set_alarm_group([work[0].id], "")
+    app.run_group_action("work", "Delete")
+    assert list(app.alarms) == [work[0].id, other.id]
+    assert app.groups.names() == [] and len(app.scheduler) == 2
+
+def post(server, pump, path, payload):
+    """POST payload to the control API, running the Tk loop while it is handled."""
+    import json
+    import threading
+    from urllib.error import HTTPError
+    from urllib.request import Request, urlopen
+
+    response = {}
+    def send():
+        request = Request(server.address + path, json.dumps(payload).encode(), method='POST')
+        try:
+            with urlopen(request, timeout=5) as reply:
+                response.update(status=reply.status, body=json.loads(reply.read()))
+        except HTTPError as e:
+            response.update(status=e.code, body=json.loads(e.read()))
+    thread = threading.Thread(target=send, daemon=True)
+    thread.start()
+    assert pump(lambda: not thread.is_alive())
+    return response['status'], response['body']
+
+def test_control_api_rejects_wrongly_typed_rows_only(app, pump):
+    from control_server import ControlServer
+
+    server = ControlServer(app)
+    server.start()
+    try:
+        status, body = post(server, pump, "/alarms", {'alarms': [
+            {'time': "07:00"}, {'time': "07:30", 'timezone': 5}, {'time': "08:00", 'sound': ["x"]},
+            {'time': "08:30", 'sound_path': 5}, {'time': 730}, {'time': "09:00", 'repeat': 1}]})
+    finally:
+        server.stop()
+
+    assert status == 200
+    assert [error['index'] for error in body['errors']] == [1, 2, 3, 4, 5]
+    assert body['added'] == list(app.alarms) and len(body['added']) == 1
+
+def test_control_api_group_action_is_one_batch(app, pump, monkeypatch):
+    from control_server import BATCH_CHUNK, ControlServer
+
+    work = add(app, *["%02d:%02d" % divmod(minute, 60) for minute in range(BATCH_CHUNK + 1)],
+               group="work")
+    batches = []
+    disable_alarms = app.disable_alarms
+    monkeypatch.setattr(app, "disable_alarms",
+                        lambda ids: batches.append(len(ids)) or disable_alarms(ids))
+    server = ControlServer(app)
+    server.start()
+    try:
+        status, body = post(server, pump, "/alarms/disable", {'group': "work"})
+    finally:
+        server.stop()
+
+    assert status == 200 and sorted(body['disabled']) == [alarm.id for alarm in work]
+    assert batches == [len(work)] and len(app.scheduler) == 0
+
+def test_multi_selection_survives_scrolling(app):
+    add(app, *["%02d:00" % hour for hour in range(20)])
+    app._select_all_alarms()
+    app._scroll_alarm_list('moveto', 0.5)
+    app.render.flush()
+    app._on_alarm_select()
+    assert len(app.selected_alarm_ids) == 20
+
+    app.snooze_selected_alarm()
+    assert app.dialogs == [] and all(alarm.id in app.scheduler for alarm in app.alarms.values())
+
+def test_profiler_times_callbacks_and_lag(tk_root, pump):
+    from profiler import TkProfiler
+    import tkinter as tk
+
+    profiler = TkProfiler()
+    profiler.install()
+    try:
+        button = tk.Button(tk_root, command=lambda: None)
+        fired = []
+        tk_root.after(10, lambda: fired.append(1))
+        button.invoke()
+        assert pump(lambda: fired)
+    finally:
+        profiler.uninstall()
+
+    assert profiler.loop_lag.count == 1
+    assert sum(h.count for h in profiler.handlers.values()) == 2
+    assert "Slowest handlers" in profiler.report()
+
+def test_virtual_clock_rings_and_snoozes_without_waiting(virtual_app):
+    app, clock = virtual_app, virtual_app.clock
+    alarm = add(app, "07:00")[0]
+    clock.advance_to(fire_timestamp(alarm) - 1)
+    assert not app.ringing_alarms
+
+    clock.advance(2)
+    assert alarm.id in app.ringing_alarms
+    app.snooze_alarms([alarm.id], 5)
+    clock.advance(5 * 60 + 1)
+    assert alarm.id in app.ringing_alarms
+
+def test_idle_window_stops_ticking_until_shown(virtual_app):
+    app, clock = virtual_app, virtual_app.clock
+    add(app, "07:00")
+    clock.advance(3600)
+    awake = app.metrics.wakeups
+
+    app.set_idle(True)
+    clock.advance(3600)
+    # Only the alarm check wakes, at most every IDLE_MAX_CHECK_INTERVAL_MS
+    assert app.metrics.wakeups - awake <= 13
+
+    app.set_idle(False)
+    assert clock.next_deadline() - clock.time() <= 1.0
+    before = app.metrics.wakeups
+    clock.advance(10)
+    assert app.metrics.wakeups - before >= 10
+
+def test_simulated_day_rings_every_alarm(tk_root, tmp_path, monkeypatch):
+    from tkinter import messagebox
+    from simulation import Simulation
+
+    monkeypatch.setattr(messagebox, "showinfo", lambda title, message, **kw: None)
+    simulation = Simulation(tk_root, str(tmp_path / "alarms.db"), alarms=50)
+    try:
+        result = simulation.run(86400)
+    finally:
+        simulation.close()
+
+    assert result['fires'] >= 50
+    assert result['errors'] == [] and result['missed'] == []
+
+@pytest.mark.parametrize("path, payload", [
+    ("/alarms/snooze", {'ids': [1], 'minutes': True}),
+    ("/alarms/snooze", {'ids': [1], 'minutes': float('inf')}),
+    ("/alarms/snooze", {'ids': [1], 'minutes': float('nan')}),
+    ("/alarms/snooze", {'ids': [1], 'minutes': 0}),
+    ("/alarms/snooze", {'ids': [1], 'minutes': 10 ** 9}),
+    ("/alarms/delete", {'ids': [True]}),
+])
+def test_control_api_rejects_bad_values(app, pump, path, payload):
+    from control_server import ControlServer
+
+    alarm = add(app, "07:00")[0]
+    app.trigger_alarm(alarm)
+    server = ControlServer(app)
+    server.start()
+    try:
+        status, body = post(server, pump, path, payload)
+    finally:
+        server.stop()
+
+    assert status == 400 and 'error' in body
+    assert alarm.id in app.alarms and alarm.id in app.ringing_alarms
+
+def test_control_api_rejects_bad_content_length(app):
+    import socket
+    from urllib.parse import urlsplit
+
+    from control_server import ControlServer
+
+    server = ControlServer(app)
+    server.start()
+    try:
+        url = urlsplit(server.address)
+        with socket.create_connection((url.hostname, url.port), timeout=5) as connection:
+            connection.sendall(b"POST /alarms HTTP/1.1\r\nContent-Length: lots\r\n\r\n")
+            reply = connection.makefile('rb').read()
+    finally:
+        server.stop()
+
+    assert reply.startswith(b"HTTP/1.1 400 ")
@@ -0,0 +1,130 @@
+import datetime
+import itertools
+
+import pytest
+
+from alarm_groups import AlarmGroups
+from alarm_model import (Alarm, alarm_from_spec, alarm_to_dict, alarms_from_specs,
+                         next_alarm_time, parse_alarm_time, parse_group)
+from recurrence import RecurrenceRule
+
+FRIDAY = datetime.datetime(2024, 1, 5, 8, 0)
+
+@pytest.mark.parametrize("text, expected", [
+    ("00:00", (0, 0)), ("12:30", (12, 30)), ("23:59", (23, 59)), (" 07:00 ", (7, 0))])
+def test_parse_alarm_time(text, expected):
+    assert parse_alarm_time(text) == expected
+
+@pytest.mark.parametrize("text", ["24:00", "12:60", "25:30", "abc", "12:30:45", None])
+def test_parse_alarm_time_rejects(text):
+    with pytest.raises(ValueError):
+        parse_alarm_time(text)
+
+def test_next_alarm_time_rolls_over_to_tomorrow():
+    assert next_alarm_time(10, 30, FRIDAY) == datetime.datetime(2024, 1, 5, 10, 30)
+    assert next_alarm_time(7, 30, FRIDAY) == datetime.datetime(2024, 1, 6, 7, 30)
+    assert next_alarm_time(8, 0, FRIDAY) == datetime.datetime(2024, 1, 6, 8, 0)
+
+def test_alarm_from_spec():
+    alarm = alarm_from_spec(1, {'time': "07:30", 'repeat': "Weekdays"}, FRIDAY)
+    assert alarm.time == datetime.datetime(2024, 1, 8, 7, 30) and alarm.sound == "Default"
+    assert alarm_to_dict(alarm)['time'] == "2024-01-08T07:30:00"
+
+@pytest.mark.parametrize("spec", [
+    {'time': "24:00"},
+    {'time': "07:30", 'sound': "Klaxon"},
+    {'time': "07:30", 'sound': "Custom File"},
+    {'time': "07:30", 'repeat': "Hourly"},
+    {'time': "07:30", 'status': "Ringing"},
+    "07:30",
+    # Wrong field types, e.g. from JSON Lines
+    {'time': 730},
+    {'time': "07:05", 'timezone': 5},
+    {'time': "07:05", 'sound': ["x"]},
+    {'time': "07:05", 'sound': "Custom File", 'sound_path': 5},
+    {'time': "07:05", 'group': 5},
+    {'time': "07:05", 'repeat': ["Daily"]},
+    {'time': "07:05", 'date': 20240201},
+])
+def test_alarm_from_spec_rejects(spec):
+    with pytest.raises(ValueError):
+        alarm_from_spec(2, spec, FRIDAY)
+
+def test_bad_spec_rejected_without_losing_the_batch():
+    records = enumerate([{'time': "07:05"}, {'time': "07:05", 'sound': ["x"]}, {'time': "08:00"}])
+    alarms, errors = alarms_from_specs(records, itertools.count(1), FRIDAY)
+    assert [alarm.id for alarm in alarms] == [1, 2]
+    assert [row for row, _ in errors] == [1]
+
+def test_alarm_records_are_slotted_and_share_fields():
+    path = "".join(["/tmp/", "wake.ogg"])
+    first = alarm_from_spec(1, {'time': "07:30", 'sound': "Custom File", 'sound_path': path,
+                                'repeat': "Daily"}, FRIDAY)
+    second = alarm_from_spec(2, {'time': "07:30", 'sound': "Custom File",
+                                 'sound_path': "/tmp/" + "wake.ogg", 'repeat': "Daily"}, FRIDAY)
+    assert not hasattr(first, '__dict__')
+    # Sound paths are interned and preset rules shared
+    assert first.sound_path is second.sound_path and first.recurrence is second.recurrence
+
+    # Identical alarms stay distinct by ID
+    twin = Alarm(3, first.time, first.sound, first.sound_path, recurrence=first.recurrence)
+    alarms = {alarm.id: alarm for alarm in (first, second, twin)}
+    del alarms[twin.id]
+    assert first != twin and list(alarms) == [1, 2]
+
+@pytest.mark.parametrize("rule, after, expected", [
+    (RecurrenceRule.daily(7, 0), FRIDAY, datetime.datetime(2024, 1, 6, 7, 0)),
+    (RecurrenceRule.daily(7, 0, weekdays=range(5)), FRIDAY, datetime.datetime(2024, 1, 8, 7, 0)),
+    (RecurrenceRule.daily(9, 0, exceptions=[datetime.date(2024, 1, 5)]), FRIDAY,
+     datetime.datetime(2024, 1, 6, 9, 0)),
+    (RecurrenceRule.on_dates(7, 0, [datetime.date(2024, 2, 1)]), FRIDAY,
+     datetime.datetime(2024, 2, 1, 7, 0)),
+    (RecurrenceRule.every(15, (9, 0), (17, 0)), datetime.datetime(2024, 1, 5, 9, 7),
+     datetime.datetime(2024, 1, 5, 9, 15)),
+    # Past the window end, the next window
+    (RecurrenceRule.every(15, (9, 0), (17, 0)), datetime.datetime(2024, 1, 5, 17, 0),
+     datetime.datetime(2024, 1, 6, 9, 0)),
+], ids=["daily", "weekdays", "exception", "dates", "interval", "interval window end"])
+def test_recurrence_next_after(rule, after, expected):
+    assert rule.next_after(after) == expected
+    assert RecurrenceRule.from_dict(rule.to_dict()) == rule
+
+def test_exhausted_rule_has_no_next_occurrence():
+    assert RecurrenceRule.on_dates(7, 0, [datetime.date(2024, 1, 1)]).next_after(FRIDAY) is None
+
+@pytest.mark.parametrize("data", [
+    {'kind': 'interval', 'hour': 9, 'minute': 0, 'interval': 5, 'window_end': [9]},
+    {'kind': 'interval', 'hour': 9, 'minute': 0, 'interval': 5, 'window_end': "0900"},
+    {'kind': 'interval', 'hour': 9, 'minute': 0, 'interval': 5, 'window_end': [8, 0]},
+    {'kind': 'interval', 'hour': 9, 'minute': 0, 'interval': 5, 'window_end': [24, 0]},
+    {'kind': 'interval', 'hour': 9, 'minute': 0, 'interval': "5", 'window_end': [17, 0]},
+    {'kind': 'daily', 'hour': 25, 'minute': 0},
+    {'kind': 'daily', 'hour': 7, 'minute': "00"},
+    {'kind': 'daily', 'hour': 7, 'minute': 0, 'weekdays': [7]},
+    {'kind': 'dates', 'hour': 7, 'minute': 0, 'dates': [20240201]},
+    {'kind': 'daily', 'hour': 7},
+])
+def test_recurrence_rejects_invalid_rules(data):
+    with pytest.raises(ValueError):
+        RecurrenceRule.from_dict(data)
+
+def test_equal_rules_hash_alike():
+    assert len({RecurrenceRule.daily(7, 0), RecurrenceRule.daily(7, 0)}) == 1
+
+def test_alarm_groups_index():
+    alarms = [Alarm(i, FRIDAY, group="work" if i % 2 else "") for i in range(1, 7)]
+    groups = AlarmGroups()
+    for alarm in alarms:
+        groups.add(alarm)
+    # Ungrouped alarms are left out
+    assert groups.names() == ["work"] and sorted(groups.members("work")) == [1, 3, 5]
+
+    # Moved alarms change group, emptied groups disappear
+    groups.move(alarms[0], "home")
+    groups.discard(alarms[2])
+    groups.discard(alarms[4])
+    assert groups.names() == ["home"] and "work" not in groups and groups.count("home") == 1
+
+def test_long_group_name_rejected():
+    with pytest.raises(ValueError):
+        parse_group("x" * 65)
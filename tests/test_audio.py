@@ -0,0 +1,223 @@
+import datetime
+import os
+import threading
+import time
+import wave
+
+import numpy as np
+import pytest
+
+from sound_generator import TONE_PATTERNS, adsr_envelope, render_pattern
+
+@pytest.fixture
+def mixer():
+    """The mixer's (sample rate, size, channels), opened on the dummy driver."""
+    import pygame
+    pygame.mixer.init()
+    return pygame.mixer.get_init()
+
+def write_wav(path, samples, sample_rate=44100):
+    with wave.open(str(path), 'w') as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(samples)
+    return str(path)
+
+def test_default_tone_loads_once(mixer):
+    from sound_generator import load_pattern_sound
+
+    sound = load_pattern_sound("Default")
+    assert sound is not None and sound.get_length() == pytest.approx(0.5, abs=0.01)
+    assert load_pattern_sound("Default") is sound
+
+@pytest.mark.parametrize("name", list(TONE_PATTERNS))
+def test_tone_pattern_renders_16_bit_samples(name):
+    samples = render_pattern(TONE_PATTERNS[name], 44100, duration=2.0)
+    assert samples.dtype.name == 'int16' and len(samples) == 88200
+
+def test_adsr_envelope_shape():
+    envelope = adsr_envelope(1000, 1000, attack=0.1, decay=0.1, sustain=0.5, release=0.1)
+    assert (envelope[0], envelope[100], envelope[500]) == (0.0, 1.0, 0.5)
+
+def test_sound_cache_evicts_least_recently_used(mixer, tmp_path):
+    from sound_cache import SoundCache
+
+    paths = [write_wav(tmp_path / f"tone_{i}.wav", bytes(44100 * 2)) for i in range(3)]
+    bytes_per_second = 44100 * 2 * mixer[2]
+    # Room for two decoded one-second sounds
+    cache = SoundCache(max_bytes=int(bytes_per_second * 2.5), cache_dir=str(tmp_path / "cache"))
+    try:
+        for path in paths:
+            cache.preload(path).result()
+        stats = cache.stats()
+        assert (stats['entries'], stats['evictions']) == (2, 1)
+
+        first, second = cache.get(paths[2]), cache.get(paths[2])
+        assert first is not None and first.get_raw() == second.get_raw()
+        assert cache.stats()['hits'] == 2
+        # Entries are views of the mapped bank, not private copies
+        assert all(isinstance(samples, memoryview) for samples, _ in cache._samples.values())
+    finally:
+        cache.shutdown()
+
+def test_sound_bank_shared_between_instances(mixer, tmp_path):
+    from sound_bank import SoundBank
+
+    sample_rate, _, channels = mixer
+    path = str(tmp_path / "sounds.bank")
+    bank = SoundBank(path, max_bytes=3000)
+    other = SoundBank(path, max_bytes=3000)
+    samples = bytes(range(256)) * 4
+    assert bank.add("a" * 32, samples, sample_rate, channels)
+    assert bytes(bank.get("a" * 32, sample_rate, channels)) == samples
+
+    # Another instance sees it, and only in its own format
+    assert "a" * 32 in other
+    assert bank.get("a" * 32, sample_rate + 1, channels) is None
+    sound = other.sound("a" * 32)
+    assert sound is not None and sound.get_raw() == samples
+
+    # Within budget a sound is appended, leaving mapped entries in place
+    inode = os.stat(path).st_ino
+    bank.add("b" * 32, samples, sample_rate, channels)
+    assert os.stat(path).st_ino == inode and "a" * 32 in other
+
+    # Over budget the oldest is dropped
+    other.add("c" * 32, samples, sample_rate, channels)
+    assert "a" * 32 not in SoundBank(path) and len(SoundBank(path)) == 2
+
+def test_damaged_sound_bank_reads_as_empty(tmp_path):
+    from sound_bank import SoundBank
+
+    path = tmp_path / "sounds.bank"
+    path.write_bytes(b"junk")
+    assert len(SoundBank(str(path))) == 0
+
+def test_one_bank_per_file(tmp_path):
+    from sound_bank import SOUND_BANK_PATH, open_bank
+
+    path = str(tmp_path / "sounds.bank")
+    assert open_bank(os.path.join(str(tmp_path), ".", "sounds.bank")) is open_bank(path)
+    assert open_bank() is open_bank(SOUND_BANK_PATH)
+
+def test_transcoder_normalizes_loudness_and_caches(mixer, tmp_path):
+    from transcoder import TARGET_LOUDNESS_DBFS, load_transcoded, transcode
+
+    sample_rate, _, channels = mixer
+    cache_dir = str(tmp_path / "cache")
+    t = np.arange(sample_rate) / sample_rate
+    levels = []
+    for amplitude in (0.02, 0.9):
+        path = write_wav(tmp_path / f"tone_{amplitude}.wav",
+                         (np.sin(2 * np.pi * 440 * t) * amplitude * 32767).astype(np.int16).tobytes(),
+                         sample_rate)
+        cache_path = transcode(path, sample_rate, channels, cache_dir)
+        samples = np.frombuffer(load_transcoded(cache_path), dtype=np.int16) / 32768
+        levels.append(10 * np.log10(np.mean(np.square(samples))))
+    assert levels == pytest.approx([TARGET_LOUDNESS_DBFS] * 2, abs=0.5)
+
+    # An unchanged file is served from the transcode cache
+    stamp = os.stat(cache_path).st_mtime_ns
+    assert transcode(path, sample_rate, channels, cache_dir) == cache_path
+    assert os.stat(cache_path).st_mtime_ns == stamp
+
+def test_transcoder_rejects_undecodable_file(mixer, tmp_path):
+    from transcoder import transcode
+
+    bad_path = tmp_path / "broken.ogg"
+    bad_path.write_bytes(b"not audio")
+    with pytest.raises(ValueError):
+        transcode(str(bad_path), mixer[0], mixer[2], str(tmp_path / "cache"))
+
+def test_playback_voices(mixer):
+    from playback import PlaybackManager
+    from sound_generator import load_pattern_sound
+
+    sound = load_pattern_sound("Default")
+    manager = PlaybackManager(max_voices=2)
+    try:
+        manager.play(1, sound)
+        manager.play(2, sound, priority=1)
+        manager.stop(1)
+        assert not manager.is_playing(1) and manager.is_playing(2)
+
+        # Both voices busy: alarm 4 steals the lower-priority voice of alarm 3
+        manager.play(3, sound)
+        manager.play(4, sound)
+        assert not manager.is_playing(3)
+        assert manager.is_playing(2) and manager.is_playing(4)
+
+        # A lower-priority alarm does not steal
+        assert not manager.play(5, sound, priority=-1)
+    finally:
+        manager.stop_all()
+
+def test_audio_worker_commands():
+    from alarm_model import Alarm
+    from audio_worker import AudioWorker
+    from metrics import AlarmMetrics
+    from sound_cache import SoundCache
+
+    cache = SoundCache()
+    metrics = AlarmMetrics()
+    woken = threading.Event()
+    worker = AudioWorker(cache, metrics, notify=woken.set)
+    try:
+        # Commands queued before start wait for the device to open
+        worker.play(Alarm(1, datetime.datetime.now()))
+        worker.start()
+        assert woken.wait(5) and worker.ready.is_set()
+        assert worker.results.get_nowait() == ('play', 1, True)
+        assert worker.playback.is_playing(1)
+
+        # A fade releases the alarm's voice
+        woken.clear()
+        worker.fade(1, 50)
+        assert woken.wait(5) and worker.results.get_nowait() == ('fade', 1, True)
+        assert not worker.playback.is_playing(1)
+        assert metrics.summary()['audio_command']['count'] == 2
+
+        # A ramp starts quietly and reaches full volume in a few steps
+        woken.clear()
+        worker.play(Alarm(2, datetime.datetime.now()), ramp_ms=500)
+        assert woken.wait(5) and worker.playback.volume(2) <= 0.1
+        time.sleep(0.8)
+        assert worker.playback.volume(2) == 1.0 and worker.ramp_wakeups <= 3
+    finally:
+        worker.close()
+        cache.shutdown()
+
+def test_audio_worker_streams_custom_sound_until_decoded(tmp_path):
+    from alarm_model import Alarm
+    from audio_worker import AudioWorker
+    from metrics import AlarmMetrics
+    from sound_cache import SoundCache
+
+    path = write_wav(tmp_path / "wake.wav", bytes(44100 * 2))
+    cache = SoundCache(cache_dir=str(tmp_path / "cache"))
+    woken = threading.Event()
+    worker = AudioWorker(cache, AlarmMetrics(), notify=woken.set)
+    try:
+        worker.start()
+        # A cold file streams at once while it decodes in the background
+        worker.play(Alarm(1, datetime.datetime.now(), "Custom File", path))
+        assert woken.wait(5) and worker.results.get_nowait() == ('play', 1, True)
+        assert worker.playback.is_playing(1) and cache.stats()['misses'] == 1
+        cache.preload(path).result()
+
+        # The next trigger plays the decoded Sound on a channel
+        woken.clear()
+        worker.play(Alarm(2, datetime.datetime.now(), "Custom File", path))
+        assert woken.wait(5) and worker.results.get_nowait() == ('play', 2, True)
+        assert worker.playback.is_playing(1) and worker.playback.is_playing(2)
+        assert cache.stats()['hits'] == 1
+
+        # A missing file falls back to the default tone
+        woken.clear()
+        worker.play(Alarm(3, datetime.datetime.now(), "Custom File", str(tmp_path / "gone.wav")))
+        assert woken.wait(5) and worker.results.get_nowait() == ('play', 3, True)
+        assert worker.playback.is_playing(3)
+    finally:
+        worker.close()
+        cache.shutdown()
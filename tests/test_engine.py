@@ -0,0 +1,172 @@
+import datetime
+import time
+import tracemalloc
+
+from alarm_index import AlarmIndex
+from clock import VirtualClock
+from metrics import AlarmMetrics, LatencyHistogram
+from render_scheduler import RenderScheduler
+from scheduler import AlarmScheduler
+
+def test_scheduler_orders_deadlines():
+    now = time.time()
+    scheduler = AlarmScheduler()
+    for alarm_id, minutes in [(1, 30), (2, 10), (3, 20), (4, 5)]:
+        scheduler.schedule(alarm_id, now + minutes * 60)
+
+    # Reschedule and cancel without touching the other entries
+    scheduler.schedule(3, now + 60)
+    scheduler.cancel(4)
+    assert scheduler.next_deadline() == now + 60
+
+    # A late check still fires every alarm that came due, in order
+    assert scheduler.pop_due(now + 15 * 60) == [3, 2]
+    assert len(scheduler) == 1 and 1 in scheduler
+
+def test_scheduler_batched_cancel():
+    scheduler = AlarmScheduler()
+    scheduler.schedule_many((i, float(i)) for i in range(1000))
+    scheduler.cancel_many(range(0, 1000, 2))
+    assert len(scheduler) == 500 and scheduler.next_deadline() == 1.0
+    assert scheduler.pop_due(5.0) == [1, 3, 5]
+
+def test_alarm_index_filters_and_sorts():
+    base = datetime.datetime(2024, 1, 1)
+    sounds = ["Default", "Beeps", "wake.mp3"]
+    rows = []
+    for alarm_id in range(1, 3001):
+        fire_time = base + datetime.timedelta(minutes=alarm_id * 7)
+        status = "Ringing" if alarm_id % 10 == 0 else "Active"
+        rows.append((alarm_id, (fire_time.strftime('%H:%M'), sounds[alarm_id % 3], "Once", status),
+                     fire_time))
+    index = AlarmIndex()
+    index.update(rows)
+    assert index.window(0, 3) == [1, 2, 3]
+
+    # A filter wrapping past midnight must match a brute-force scan
+    index.set_filter(((22, 0), (1, 30)), "Beeps", "Active")
+    expected = {alarm_id for alarm_id, values, fire_time in rows
+                if values[1] == "Beeps" and values[3] == "Active"
+                and (fire_time.hour >= 22 or fire_time.hour * 60 + fire_time.minute <= 90)}
+    assert expected and set(index.window(0, len(index))) == expected
+
+    # Single updates move into or out of the filtered rows
+    alarm_id = rows[0][0]
+    index.update([(alarm_id, ("23:00", "Beeps", "Once", "Active"), base.replace(hour=23))])
+    assert index.position(alarm_id) is not None
+    index.update([(alarm_id, None, None)])
+    assert alarm_id not in index and len(index) == len(expected - {alarm_id})
+
+    # Sorting by the same column again reverses it
+    index.set_filter()
+    index.set_sort("Time")
+    assert index.window(0, 1) == [3000] and index.position(3000) == 0
+
+def test_latency_histogram_percentiles():
+    histogram = LatencyHistogram()
+    for value in range(1, 101):
+        histogram.record(float(value))
+    assert histogram.summary() == {'count': 100, 'p50': 50.0, 'p99': 99.0, 'max': 100.0}
+
+def test_alarm_lifecycle_recorded():
+    metrics = AlarmMetrics()
+    metrics.alarm_detected(1, time.time() - 2)
+    metrics.alarm_triggered(1)
+    metrics.audio_started(1)
+    summary = metrics.summary()
+    assert summary['audio_delay']['count'] == 1 and summary['audio_delay']['p50'] >= 2000
+    assert None not in metrics.lifecycles[0].values()
+
+def test_wakeups_per_hour_over_a_sliding_hour():
+    now = [0.0]
+    metrics = AlarmMetrics(clock=lambda: now[0])
+    for second in range(1, 7201):
+        now[0] = second
+        if second % 60 == 0:
+            metrics.record_wakeup()
+    now[0] = 7200.5
+    assert metrics.wakeups == 120 and metrics.wakeups_per_hour() == 60
+
+class IdleRoot:
+    """Runs after_idle callbacks when run() is called, like Tk's idle queue"""
+    def __init__(self):
+        self.callbacks = {}
+    def after_idle(self, callback):
+        after_id = len(self.callbacks) + 1
+        self.callbacks[after_id] = callback
+        return after_id
+    def after_cancel(self, after_id):
+        self.callbacks.pop(after_id, None)
+    def run(self):
+        while self.callbacks:
+            self.callbacks.pop(min(self.callbacks))()
+
+def test_render_scheduler_coalesces_marks():
+    drawn = []
+    root = IdleRoot()
+    render = RenderScheduler(root)
+    render.register('rows', lambda keys: drawn.append(('rows', keys)), keyed=True)
+    render.register('status', lambda: drawn.append(('status', None)))
+
+    for alarm_id in range(100):
+        render.mark('rows', [alarm_id])
+        render.mark('status')
+    root.run()
+    assert drawn == [('rows', set(range(100))), ('status', None)] and render.redraws == 1
+
+    # A full mark overrides keyed marks
+    drawn.clear()
+    render.mark('rows', [1])
+    render.mark('rows')
+    render.flush()
+    assert drawn == [('rows', None)] and render.redraws == 2
+
+def test_profiler_times_handlers_and_allocations():
+    import tkinter as tk
+    from profiler import TRACEMALLOC, TkProfiler
+
+    class Engine:
+        def check_alarms(self):
+            self.trigger_alarm()
+        def trigger_alarm(self):
+            self.rows = [str(i) for i in range(10000)]
+
+    original = (tk.Misc.after, tk.Misc._register, Engine.check_alarms)
+    profiler = TkProfiler(TRACEMALLOC)
+    profiler.install()
+    profiler.watch(Engine)
+    try:
+        engine = Engine()
+        profiler.collecting = True
+        tracemalloc.start(10)
+        handler = profiler.timed(engine.check_alarms, due=0)
+        for _ in range(3):
+            handler()
+        profiler.stop_collecting()
+
+        assert profiler.handlers['Engine.check_alarms'].count == 3
+        assert profiler.loop_lag.count == 3
+        # Allocations are measured across nested hotspots
+        calls, net, peak = profiler.allocations['check_alarms']
+        assert calls == 3 and peak >= profiler.allocations['trigger_alarm'][2] and peak >= 100000
+        report = profiler.report()
+        assert "Engine.check_alarms" in report and "Tk loop lag" in report
+    finally:
+        profiler.uninstall()
+    assert (tk.Misc.after, tk.Misc._register, Engine.check_alarms) == original
+
+def test_virtual_clock_runs_timers_in_deadline_order():
+    clock = VirtualClock(start=1_000_000.0)
+    ran = []
+    clock.after(None, 2000, lambda: ran.append(('b', clock.time())))
+    cancelled = clock.after(None, 1500, lambda: ran.append(('x', clock.time())))
+    clock.after(None, 1000, lambda: clock.after(None, 500, lambda: ran.append(('a', clock.time()))))
+    clock.after_cancel(None, cancelled)
+
+    assert clock.advance(1.9) == 2
+    assert ran == [('a', 1_000_001.5)] and clock.time() == 1_000_001.9
+
+    # A simulated day passes instantly
+    clock.advance(3600 * 24)
+    assert ran[-1] == ('b', 1_000_002.0)
+    assert abs(clock.monotonic() - 86401.9) <= 1e-6 and clock.next_deadline() is None
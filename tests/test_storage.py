@@ -0,0 +1,70 @@
+import datetime
+import itertools
+
+import pytest
+
+from alarm_io import FORMATS, read_alarm_specs, write_alarms
+from alarm_model import Alarm, alarm_from_spec, alarms_from_specs
+from alarm_store import AlarmStore
+from recurrence import RecurrenceRule
+
+ALARM_TIME = datetime.datetime(2024, 1, 1, 7, 30)
+FRIDAY = datetime.datetime(2024, 1, 5, 8, 0)
+
+def reload(path):
+    store = AlarmStore(str(path))
+    try:
+        return store.load_all()
+    finally:
+        store.close()
+
+def test_alarms_survive_a_store_round_trip(tmp_path):
+    store = AlarmStore(str(tmp_path / "alarms.db"))
+    store.save(Alarm(1, ALARM_TIME))
+    store.save(Alarm(2, ALARM_TIME, status='Ringing'))
+    store.save(Alarm(3, ALARM_TIME))
+    store.save(Alarm(4, ALARM_TIME, status='Disabled', group="work"))
+    store.delete(3)
+    store.close()
+
+    alarms = reload(tmp_path / "alarms.db")
+    assert [alarm.id for alarm in alarms] == [1, 2, 4]
+    assert alarms[0].time == ALARM_TIME
+    # Ringing alarms are re-armed on reload
+    assert alarms[1].status == 'Active'
+    assert (alarms[2].status, alarms[2].group) == ('Disabled', "work")
+
+def test_invalid_stored_rule_dropped_alarm_kept(tmp_path):
+    # Rules saved before they were validated must not stop the app loading
+    store = AlarmStore(str(tmp_path / "alarms.db"))
+    store.save(Alarm(1, ALARM_TIME))
+    store._conn.execute("UPDATE alarms SET recurrence = ?",
+                        ('{"kind": "interval", "hour": 9, "minute": 0, "interval": 5, "window_end": [9]}',))
+    alarms = store.load_all()
+    store.close()
+    assert len(alarms) == 1 and alarms[0].recurrence is None
+
+@pytest.mark.parametrize("extension", list(FORMATS))
+def test_export_import_round_trip(tmp_path, extension):
+    interval = RecurrenceRule.every(15, (9, 0), (17, 0), exceptions=[datetime.date(2024, 1, 8)])
+    alarms = [
+        alarm_from_spec(1, {'time': "07:30", 'repeat': "Weekdays"}, FRIDAY),
+        alarm_from_spec(2, {'time': "09:00", 'date': "2024-02-01", 'sound': "Chirp",
+                            'group': "work", 'status': "Disabled"}, FRIDAY),
+        alarm_from_spec(3, {'time': "09:00", 'repeat': interval.to_dict()}, FRIDAY),
+        alarm_from_spec(4, {'time': "06:45", 'repeat': "Daily", 'timezone': "America/New_York"}, FRIDAY),
+    ]
+    path = str(tmp_path / ("alarms" + extension))
+    write_alarms(path, alarms)
+    imported, errors = alarms_from_specs(read_alarm_specs(path), itertools.count(1), FRIDAY)
+
+    fields = ('time', 'sound', 'recurrence', 'timezone', 'group', 'status')
+    assert errors == []
+    assert [[getattr(a, f) for f in fields] for a in imported] == \
+        [[getattr(a, f) for f in fields] for a in alarms]
+
+def test_invalid_rows_reported_by_row_number(tmp_path):
+    path = tmp_path / "bad.jsonl"
+    path.write_text('{"time": "07:30"}\nnot json\n{"time": "99:00"}\n')
+    imported, errors = alarms_from_specs(read_alarm_specs(str(path)), itertools.count(1), FRIDAY)
+    assert len(imported) == 1 and [row for row, _ in errors] == [2, 3]
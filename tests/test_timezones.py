@@ -0,0 +1,59 @@
+import datetime
+import zoneinfo
+
+import pytest
+
+from alarm_model import Alarm, alarm_from_spec, fire_timestamp, next_occurrence
+from alarm_store import AlarmStore
+from recurrence import preset_rule
+from timezones import to_timestamp, to_wall, transitions
+
+@pytest.mark.parametrize("name", ["Europe/Berlin", "America/New_York", "Australia/Lord_Howe"])
+def test_conversions_match_zoneinfo_around_dst_changes(name):
+    zone = zoneinfo.ZoneInfo(name)
+    instants = transitions(name).instants
+    assert instants, "no DST transitions found within the horizon"
+    for instant in instants:
+        # Every minute of the two hours either side, including the skipped
+        # or repeated wall times
+        for offset in range(-7200, 7200, 60):
+            timestamp = instant + offset
+            wall = to_wall(timestamp, name)
+            expected = datetime.datetime.fromtimestamp(timestamp, zone).replace(tzinfo=None)
+            assert (wall, wall.fold) == (expected, expected.fold)
+            assert to_timestamp(wall, name) == timestamp
+            gap_wall = expected + datetime.timedelta(seconds=1800)
+            assert to_timestamp(gap_wall, name) == gap_wall.replace(tzinfo=zone).timestamp()
+
+def test_zoned_alarm_set_for_next_time_in_its_zone():
+    alarm = alarm_from_spec(1, {'time': "07:00", 'timezone': "Asia/Tokyo"}, datetime.datetime.now())
+    tokyo_now = datetime.datetime.now(zoneinfo.ZoneInfo("Asia/Tokyo")).replace(tzinfo=None)
+    assert tokyo_now < alarm.time <= tokyo_now + datetime.timedelta(days=1)
+    assert alarm.time.hour == 7
+
+def test_unknown_zone_rejected():
+    with pytest.raises(ValueError):
+        alarm_from_spec(2, {'time': "07:00", 'timezone': "Mars/Olympus_Mons"}, datetime.datetime.now())
+
+def test_alarm_in_repeated_hour_keeps_its_place_on_reload(tmp_path):
+    # E.g. a snooze ending in the hour repeated when clocks fall back
+    instant = transitions("America/New_York").instants[0]
+    repeated = Alarm(3, to_wall(instant + 1800, "America/New_York"), timezone="America/New_York")
+    store = AlarmStore(str(tmp_path / "alarms.db"))
+    store.save(repeated)
+    reloaded = store.load_all()[0]
+    store.close()
+    assert fire_timestamp(reloaded) == fire_timestamp(repeated)
+    assert reloaded.timezone == "America/New_York"
+
+def test_stopped_in_repeated_hour_moves_to_next_day():
+    # Stopped in the repeated hour after ringing in the first pass, a daily
+    # alarm inside that hour moves on to the next day, not back in time
+    table = transitions("Europe/Berlin")
+    fall_back = next(instant for instant, before, after
+                     in zip(table.instants, table.offsets, table.offsets[1:]) if after < before)
+    rang = to_wall(fall_back - 600, "Europe/Berlin")
+    rule = preset_rule("Daily", rang.hour, rang.minute)
+    stopped = fall_back + 1800
+    next_time = next_occurrence(rule, to_wall(stopped, "Europe/Berlin"), "Europe/Berlin", stopped)
+    assert next_time.date() == rang.date() + datetime.timedelta(days=1)
@@ -0,0 +1,162 @@
+import bisect
+import datetime
+import functools
+import time
+import zoneinfo
+
+# Alarm times are kept as wall-clock times in the alarm's time zone, which is
+# what the user set and what the list shows, while the scheduler runs on UTC
+# timestamps. Converting between the two needs the zone's UTC offset, which
+# only changes at DST (and other rule) transitions. Each zone's transitions
+# over the coming TRANSITION_HORIZON_DAYS are found once and cached, so a
+# conversion is a bisect and an addition rather than a tz database lookup.
+
+# Zone name of alarms that follow the system time zone
+LOCAL_ZONE = ""
+
+TRANSITION_HORIZON_DAYS = 400
+
+# Offsets are sampled this far apart and transitions bisected down to the
+# second; no zone changes its offset twice within a day
+SCAN_STEP_SECONDS = 86400
+
+EPOCH = datetime.datetime(1970, 1, 1)
+
+@functools.lru_cache(maxsize=None)
+def get_zone(name):
+    """Return the ZoneInfo for an IANA zone name. Raises ValueError."""
+    try:
+        return zoneinfo.ZoneInfo(name)
+    except (zoneinfo.ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Unknown time zone: {name}") from None
+
+@functools.lru_cache(maxsize=1)
+def zone_names():
+    """Every IANA zone name known to this system, sorted."""
+    return sorted(zoneinfo.available_timezones())
+
+def utc_offset(name, timestamp):
+    """Return the UTC offset of zone name at timestamp, in seconds."""
+    if name == LOCAL_ZONE:
+        return time.localtime(timestamp).tm_gmtoff
+    moment = datetime.datetime.fromtimestamp(timestamp, get_zone(name))
+    return int(moment.utcoffset().total_seconds())
+
+class ZoneTransitions:
+    """
+    A zone's UTC offset changes between start and end, as POSIX timestamps.
+
+    offsets[i] applies before instants[i] (and from instants[i - 1]).
+    wall_instants holds the same changes on the zone's wall clock, at the
+    later of the wall times either side of each change, so wall times in a
+    DST gap or overlap resolve like fold=0: times skipped by a gap move
+    forward by its length, repeated times take their first occurrence.
+    fold_instants, at the earlier wall times, resolve like fold=1.
+    """
+
+    __slots__ = ('name', 'start', 'end', 'instants', 'wall_instants', 'fold_instants', 'offsets')
+
+    def __init__(self, name, start, days=TRANSITION_HORIZON_DAYS):
+        self.name = name
+        self.start = start
+        self.end = start + days * 86400
+        self.instants = []
+        self.offsets = [utc_offset(name, start)]
+        sample = start
+        while sample < self.end:
+            low, sample = sample, min(sample + SCAN_STEP_SECONDS, self.end)
+            offset = utc_offset(name, sample)
+            if offset == self.offsets[-1]:
+                continue
+            # Bisect to the first second with the new offset
+            high = sample
+            while high - low > 1:
+                middle = (low + high) // 2
+                if utc_offset(name, middle) == offset:
+                    high = middle
+                else:
+                    low = middle
+            self.instants.append(high)
+            self.offsets.append(offset)
+        changes = list(zip(self.instants, self.offsets, self.offsets[1:]))
+        self.wall_instants = [instant + max(before, after) for instant, before, after in changes]
+        self.fold_instants = [instant + min(before, after) for instant, before, after in changes]
+
+    def offset_at(self, timestamp):
+        """UTC offset at a timestamp between start and end."""
+        return self.offsets[bisect.bisect_right(self.instants, timestamp)]
+
+    def wall_offset(self, wall_seconds, fold=0):
+        """
+        UTC offset of a wall time, given as seconds since the epoch on the
+        zone's clock, or None if it is outside the precomputed range.
+        """
+        if not self.start + SCAN_STEP_SECONDS <= wall_seconds < self.end - SCAN_STEP_SECONDS:
+            return None
+        instants = self.fold_instants if fold else self.wall_instants
+        return self.offsets[bisect.bisect_right(instants, wall_seconds)]
+
+    def fold_at(self, timestamp):
+        """1 if the wall time at timestamp is the repeat of an earlier one, else 0."""
+        index = bisect.bisect_right(self.instants, timestamp) - 1
+        if index < 0:
+            return 0
+        before, after = self.offsets[index], self.offsets[index + 1]
+        return int(timestamp < self.instants[index] + before - after)
+
+_transitions = {}
+
+def transitions(name):
+    """
+    Return the cached ZoneTransitions for zone name, starting a day ago.
+    It is recomputed once half its horizon has passed, so it always covers
+    at least the next TRANSITION_HORIZON_DAYS / 2 days.
+    """
+    now = time.time()
+    table = _transitions.get(name)
+    if table is None or now > table.start + TRANSITION_HORIZON_DAYS * 86400 / 2:
+        start = int(now) // SCAN_STEP_SECONDS * SCAN_STEP_SECONDS - SCAN_STEP_SECONDS
+        table = _transitions[name] = ZoneTransitions(name, start)
+    return table
+
+def clear_cache():
+    """Forget every precomputed zone, e.g. after the system zone changed."""
+    _transitions.clear()
+
+def to_timestamp(wall, name=LOCAL_ZONE):
+    """
+    Return the UTC timestamp of a naive wall-clock time in zone name.
+    Times in a DST gap move forward by the gap; times repeated in an
+    overlap take their first occurrence, or their second if wall.fold is 1.
+    """
+    wall_seconds = (wall - EPOCH).total_seconds()
+    offset = transitions(name).wall_offset(wall_seconds, wall.fold)
+    if offset is not None:
+        return wall_seconds - offset
+    # Far past or future: ask the tz database directly
+    if name == LOCAL_ZONE:
+        return wall.timestamp()
+    return wall.replace(tzinfo=get_zone(name)).timestamp()
+
+def to_wall(timestamp, name=LOCAL_ZONE):
+    """
+    Return the naive wall-clock time in zone name at a UTC timestamp, with
+    fold set on the second occurrence of a repeated time.
+    """
+    table = transitions(name)
+    if table.start <= timestamp < table.end:
+        wall = EPOCH + datetime.timedelta(seconds=timestamp + table.offset_at(timestamp))
+        return wall.replace(fold=table.fold_at(timestamp)) if table.fold_instants else wall
+    if name == LOCAL_ZONE:
+        return datetime.datetime.fromtimestamp(timestamp)
+    return datetime.datetime.fromtimestamp(timestamp, get_zone(name)).replace(tzinfo=None)
+
+def now(name=LOCAL_ZONE):
+    """Return the current wall-clock time in zone name."""
+    if name == LOCAL_ZONE:
+        return datetime.datetime.now()
+    return to_wall(time.time(), name)
+
+def zone_abbreviation(wall, name):
+    """Return the zone's abbreviation at a wall-clock time, e.g. 'CEST'."""
+    return wall.replace(tzinfo=get_zone(name)).tzname()
@@ -0,0 +1,141 @@
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+
+# Custom sound files are decoded, resampled to the mixer's format and
+# loudness-normalized once, in a worker process, and the result is written as
+# raw 16-bit PCM to the cache directory, from where SoundCache packs it into
+# the sound bank. Later decodes of an unchanged file, in this session or the
+# next, come straight from the bank.
+TRANSCODE_CACHE_DIR = os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser("~"), ".cache"),
+    "alarm_clock", "sounds")
+
+# Bumped whenever the output of transcode() changes, to orphan old entries
+TRANSCODE_VERSION = 1
+
+# Target loudness as gated RMS level, and the peak level it may not exceed
+TARGET_LOUDNESS_DBFS = -18.0
+PEAK_CEILING_DBFS = -1.0
+
+# Loudness is measured over blocks of this length; blocks quieter than the
+# gate (silence between rings) do not count towards it
+LOUDNESS_BLOCK_SECONDS = 0.4
+LOUDNESS_GATE_DBFS = -60.0
+
+HASH_CHUNK_BYTES = 1024 * 1024
+
+def init_worker():
+    """Process pool initializer: decoding needs a mixer, never a sound card."""
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+def transcode_key(path, sample_rate, channels):
+    """Return the cache key for a file: its content hash, mtime and output format."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b''):
+            digest.update(chunk)
+    params = {
+        'content': digest.hexdigest(),
+        'mtime_ns': os.stat(path).st_mtime_ns,
+        'sample_rate': sample_rate,
+        'channels': channels,
+        'loudness': TARGET_LOUDNESS_DBFS,
+        'version': TRANSCODE_VERSION,
+    }
+    return hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()[:32]
+
+def _decode_pygame(path, sample_rate, channels):
+    """Decode with pygame (WAV, OGG, MP3, FLAC) into (frames, channels) int16."""
+    import pygame
+    if pygame.mixer.get_init() != (sample_rate, -16, channels):
+        pygame.mixer.quit()
+        pygame.mixer.init(frequency=sample_rate, size=-16, channels=channels)
+    samples = pygame.sndarray.array(pygame.mixer.Sound(path))
+    return samples.reshape(len(samples), channels)
+
+def _decode_ffmpeg(path, sample_rate, channels):
+    """Decode anything ffmpeg reads (e.g. M4A/AAC) into (frames, channels) int16."""
+    import numpy as np
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        raise ValueError("ffmpeg is not installed")
+    result = subprocess.run(
+        [ffmpeg, "-v", "error", "-i", path, "-f", "s16le", "-acodec", "pcm_s16le",
+         "-ar", str(sample_rate), "-ac", str(channels), "-"],
+        capture_output=True, check=True)
+    return np.frombuffer(result.stdout, dtype=np.int16).reshape(-1, channels)
+
+def normalize_loudness(samples, sample_rate, target_dbfs=TARGET_LOUDNESS_DBFS,
+                       ceiling_dbfs=PEAK_CEILING_DBFS):
+    """
+    Scale int16 samples to target_dbfs gated RMS loudness, without letting
+    peaks pass ceiling_dbfs. Silent input is returned unchanged.
+    """
+    import numpy as np
+
+    if not len(samples):
+        return samples
+    audio = samples.astype(np.float32) / 32768
+    channels = audio.shape[1]
+
+    # Mean power of each whole block; a sound shorter than one block is
+    # measured as a single block
+    block = int(LOUDNESS_BLOCK_SECONDS * sample_rate)
+    frames = len(audio) // block * block
+    if frames:
+        power = np.mean(np.square(audio[:frames].reshape(-1, block * channels)), axis=1)
+    else:
+        power = np.mean(np.square(audio), keepdims=True).ravel()
+    gated = power[power > 10 ** (LOUDNESS_GATE_DBFS / 10)]
+    peak = float(np.max(np.abs(audio)))
+    if not len(gated) or peak == 0:
+        return samples
+
+    loudness_db = 10 * np.log10(np.mean(gated))
+    gain = 10 ** ((target_dbfs - loudness_db) / 20)
+    gain = min(gain, 10 ** (ceiling_dbfs / 20) / peak)
+    audio *= gain * 32767
+    return np.clip(audio, -32768, 32767).astype(np.int16)
+
+def transcoded_path(path, sample_rate, channels, cache_dir=TRANSCODE_CACHE_DIR):
+    """Return where transcode() caches path, whether or not it exists yet."""
+    return os.path.join(cache_dir, transcode_key(path, sample_rate, channels) + ".pcm")
+
+def transcode(path, sample_rate, channels, cache_dir=TRANSCODE_CACHE_DIR):
+    """
+    Return the path of path's audio as normalized raw int16 PCM at
+    sample_rate with channels interleaved, transcoding it unless it is
+    already cached. Runs in a worker process. Raises ValueError if no
+    decoder can read the file.
+    """
+    cache_path = transcoded_path(path, sample_rate, channels, cache_dir)
+    if os.path.exists(cache_path):
+        return cache_path
+
+    try:
+        samples = _decode_pygame(path, sample_rate, channels)
+    except Exception as pygame_error:
+        try:
+            samples = _decode_ffmpeg(path, sample_rate, channels)
+        except (OSError, ValueError, subprocess.CalledProcessError):
+            raise ValueError(f"Cannot decode {path}: {pygame_error}") from None
+    samples = normalize_loudness(samples, sample_rate)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(samples.tobytes())
+    os.replace(temp_path, cache_path)
+    return cache_path
+
+def load_transcoded(cache_path):
+    """
+    Read transcoded PCM back as bytes of interleaved int16 frames, ready
+    for pygame.mixer.Sound(buffer=...).
+    """
+    with open(cache_path, 'rb') as f:
+        return f.read()